@@ -0,0 +1,40 @@
+import numpy as np
+
+from neuroconv.tools.hdmf import GenericDataChunkIterator
+
+from .common import (
+    IMAGING_NUMBER_OF_COLUMNS,
+    IMAGING_NUMBER_OF_FRAMES,
+    IMAGING_NUMBER_OF_ROWS,
+    RECORDING_DURATION,
+    RECORDING_NUMBER_OF_CHANNELS,
+    RECORDING_SAMPLING_FREQUENCY,
+)
+
+
+class EstimateDefaultShapes:
+    """Time the estimation of the default chunk and buffer shapes of realistically sized datasets."""
+
+    params = (
+        ["recording", "imaging"],
+        ["int16", "uint16", "float32"],
+    )
+    param_names = ["dataset", "dtype"]
+
+    def setup(self, dataset: str, dtype: str):
+        if dataset == "recording":
+            self.maxshape = (int(RECORDING_DURATION * RECORDING_SAMPLING_FREQUENCY), RECORDING_NUMBER_OF_CHANNELS)
+        else:
+            self.maxshape = (IMAGING_NUMBER_OF_FRAMES, IMAGING_NUMBER_OF_ROWS, IMAGING_NUMBER_OF_COLUMNS)
+        self.dtype = np.dtype(dtype)
+        self.chunk_shape = GenericDataChunkIterator.estimate_default_chunk_shape(
+            chunk_mb=10.0, maxshape=self.maxshape, dtype=self.dtype
+        )
+
+    def time_estimate_default_chunk_shape(self, dataset: str, dtype: str):
+        GenericDataChunkIterator.estimate_default_chunk_shape(chunk_mb=10.0, maxshape=self.maxshape, dtype=self.dtype)
+
+    def time_estimate_default_buffer_shape(self, dataset: str, dtype: str):
+        GenericDataChunkIterator.estimate_default_buffer_shape(
+            buffer_gb=1.0, chunk_shape=self.chunk_shape, maxshape=self.maxshape, dtype=self.dtype
+        )
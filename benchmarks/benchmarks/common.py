@@ -0,0 +1,99 @@
+"""Synthetic data sources shared by the benchmarks; none of them read or download any file."""
+
+from typing import Optional
+
+import numpy as np
+from roiextractors import ImagingExtractor
+
+from neuroconv.tools.testing.mock_interfaces import (
+    MockImagingInterface,
+    MockRecordingInterface,
+    MockSortingInterface,
+)
+
+# A Neuropixels 1.0 probe recorded for an hour
+RECORDING_NUMBER_OF_CHANNELS = 384
+RECORDING_SAMPLING_FREQUENCY = 30_000.0
+RECORDING_DURATION = 3_600.0
+
+# A 512 x 512 two-photon field of view recorded for almost half an hour at 30 Hz
+IMAGING_NUMBER_OF_FRAMES = 50_000
+IMAGING_NUMBER_OF_ROWS = 512
+IMAGING_NUMBER_OF_COLUMNS = 512
+
+SORTING_NUMBER_OF_UNITS = 2_000
+
+
+class _LazyImagingExtractor(ImagingExtractor):
+    """
+    An imaging extractor that generates its frames on request.
+
+    The `generate_dummy_imaging_extractor` behind the `MockImagingInterface` holds the whole video in memory, which is
+    not possible for tens of thousands of full frames.
+    """
+
+    extractor_name = "LazyImagingExtractor"
+
+    def __init__(
+        self,
+        num_frames: int = IMAGING_NUMBER_OF_FRAMES,
+        num_rows: int = IMAGING_NUMBER_OF_ROWS,
+        num_columns: int = IMAGING_NUMBER_OF_COLUMNS,
+        sampling_frequency: float = 30.0,
+        dtype: str = "uint16",
+    ):
+        super().__init__()
+        self._num_frames = num_frames
+        self._image_size = (num_rows, num_columns)
+        self._sampling_frequency = sampling_frequency
+        self._dtype = np.dtype(dtype)
+
+        self._frame = np.random.default_rng(seed=0).integers(low=0, high=1_000, size=self._image_size, dtype=dtype)
+
+    def get_video(self, start_frame: Optional[int] = None, end_frame: Optional[int] = None, channel: int = 0):
+        start_frame = start_frame or 0
+        end_frame = self._num_frames if end_frame is None else min(end_frame, self._num_frames)
+        return np.broadcast_to(self._frame, shape=(end_frame - start_frame, *self._image_size)).copy()
+
+    def get_image_size(self) -> tuple[int, int]:
+        return self._image_size
+
+    def get_num_frames(self) -> int:
+        return self._num_frames
+
+    def get_sampling_frequency(self) -> float:
+        return self._sampling_frequency
+
+    def get_channel_names(self) -> list[str]:
+        return ["channel_0"]
+
+    def get_num_channels(self) -> int:
+        return 1
+
+    def get_dtype(self) -> np.dtype:
+        return self._dtype
+
+
+def get_mock_interface(modality: str):
+    """
+    Return the mock interface of a modality, at the size used by the end-to-end conversion benchmarks.
+
+    The recording is lazy, so its size is only limited by the time it takes to write; the imaging is held in memory,
+    so it is kept to about a quarter of a gigabyte.
+    """
+    if modality == "recording":
+        return MockRecordingInterface(
+            num_channels=RECORDING_NUMBER_OF_CHANNELS,
+            sampling_frequency=RECORDING_SAMPLING_FREQUENCY,
+            durations=(10.0,),
+        )
+    if modality == "imaging":
+        return MockImagingInterface(
+            num_frames=500, num_rows=IMAGING_NUMBER_OF_ROWS, num_columns=IMAGING_NUMBER_OF_COLUMNS
+        )
+    if modality == "sorting":
+        return MockSortingInterface(
+            num_units=SORTING_NUMBER_OF_UNITS, sampling_frequency=RECORDING_SAMPLING_FREQUENCY, durations=(600.0,)
+        )
+
+    raise ValueError(f"Unknown modality '{modality}'.")
@@ -0,0 +1,123 @@
+"""
+End-to-end conversions of the mock interfaces, timed stage by stage.
+
+Each stage is its own class so that its `setup` runs every preceding stage outside of the measurement. The peak memory
+measured by asv is that of the whole process, so the `peakmem_` benchmarks of a stage include its setup.
+"""
+
+import math
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from pynwb import NWBHDF5IO, NWBFile
+
+from neuroconv.tools.nwb_helpers import (
+    configure_backend,
+    get_default_backend_configuration,
+)
+
+from .common import get_mock_interface
+
+
+class _ConversionStage:
+    params = ["recording", "imaging", "sorting"]
+    param_names = ["modality"]
+    number = 1
+    repeat = 3
+    warmup_time = 0.0
+    timeout = 1800
+
+    def setup(self, modality: str):
+        self.interface = get_mock_interface(modality=modality)
+
+    def _create_nwbfile(self):
+        self.metadata = self.interface.get_metadata()
+        self.metadata["NWBFile"]["session_start_time"] = datetime.now().astimezone()
+        self.nwbfile = NWBFile(**self.metadata["NWBFile"])
+
+
+class GetMetadata(_ConversionStage):
+    """Time the metadata of a new interface, before any of it is memoized."""
+
+    def setup(self, modality: str):
+        super().setup(modality=modality)
+        # Repeats must not reuse the metadata memoized by a previous call
+        self.interface.__dict__.pop("_metadata_cache", None)
+
+    def time_get_metadata(self, modality: str):
+        self.interface.get_metadata()
+
+
+class AddToNWBFile(_ConversionStage):
+    """Time adding the data of the interface to an in-memory NWBFile."""
+
+    def setup(self, modality: str):
+        super().setup(modality=modality)
+        self._create_nwbfile()
+
+    def time_add_to_nwbfile(self, modality: str):
+        self.interface.add_to_nwbfile(nwbfile=self.nwbfile, metadata=self.metadata)
+
+    def peakmem_add_to_nwbfile(self, modality: str):
+        self.interface.add_to_nwbfile(nwbfile=self.nwbfile, metadata=self.metadata)
+
+
+class ConfigureBackend(_ConversionStage):
+    """Time the default backend configuration of the NWBFile and its application."""
+
+    params = (["recording", "imaging", "sorting"], ["hdf5", "zarr"])
+    param_names = ["modality", "backend"]
+
+    def setup(self, modality: str, backend: str):
+        super().setup(modality=modality)
+        self._create_nwbfile()
+        self.interface.add_to_nwbfile(nwbfile=self.nwbfile, metadata=self.metadata)
+        self.backend_configuration = get_default_backend_configuration(nwbfile=self.nwbfile, backend=backend)
+
+    def time_get_default_backend_configuration(self, modality: str, backend: str):
+        get_default_backend_configuration(nwbfile=self.nwbfile, backend=backend)
+
+    def time_configure_backend(self, modality: str, backend: str):
+        configure_backend(nwbfile=self.nwbfile, backend_configuration=self.backend_configuration)
+
+
+class Write(_ConversionStage):
+    """Time writing the configured NWBFile to an HDF5 file."""
+
+    def setup(self, modality: str):
+        super().setup(modality=modality)
+        self._create_nwbfile()
+        self.interface.add_to_nwbfile(nwbfile=self.nwbfile, metadata=self.metadata)
+        backend_configuration = get_default_backend_configuration(nwbfile=self.nwbfile, backend="hdf5")
+        configure_backend(nwbfile=self.nwbfile, backend_configuration=backend_configuration)
+
+        # The size of the datasets as they are held in memory, before compression
+        self.number_of_bytes = sum(
+            math.prod(dataset_configuration.full_shape) * dataset_configuration.dtype.itemsize
+            for dataset_configuration in backend_configuration.dataset_configurations.values()
+        )
+
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.nwbfile_path = Path(self.temporary_directory.name) / "benchmark.nwb"
+
+    def teardown(self, modality: str):
+        self.temporary_directory.cleanup()
+
+    def _write(self):
+        with NWBHDF5IO(path=self.nwbfile_path, mode="w") as io:
+            io.write(self.nwbfile)
+
+    def time_write(self, modality: str):
+        self._write()
+
+    def peakmem_write(self, modality: str):
+        self._write()
+
+    def track_write_throughput(self, modality: str) -> float:
+        start_time = time.perf_counter()
+        self._write()
+        return self.number_of_bytes / 1e6 / (time.perf_counter() - start_time)
+
+    track_write_throughput.unit = "MB/s"
@@ -0,0 +1,114 @@
+import time
+
+from neuroconv.tools.roiextractors.imagingextractordatachunkiterator import (
+    ImagingExtractorDataChunkIterator,
+)
+from neuroconv.tools.roiextractors.roiextractors import _imaging_frames_to_hdmf_iterator
+from neuroconv.tools.spikeinterface.spikeinterfacerecordingdatachunkiterator import (
+    SpikeInterfaceRecordingDataChunkIterator,
+)
+from neuroconv.tools.testing.mock_interfaces import MockRecordingInterface
+
+from .common import (
+    RECORDING_DURATION,
+    RECORDING_NUMBER_OF_CHANNELS,
+    RECORDING_SAMPLING_FREQUENCY,
+    _LazyImagingExtractor,
+)
+
+# Reading a whole hour of recording or every frame of the video would take minutes per sample, while the throughput
+# is reached after a few buffers; every benchmark thus iterates over the first buffers of the full-sized dataset
+NUMBER_OF_BUFFERS = 4
+BUFFER_GB = 0.25
+
+
+def _iterate_buffers(iterator) -> int:
+    """Iterate over the first buffers of an iterator and return the number of bytes that were read."""
+    number_of_bytes = 0
+    for _, buffer in zip(range(NUMBER_OF_BUFFERS), iterator):
+        number_of_bytes += buffer.data.nbytes
+    return number_of_bytes
+
+
+class _DataChunkIteratorBenchmark:
+    """Benchmarks shared by the data chunk iterators; subclasses build them in `_get_iterator`."""
+
+    params = [0, 1]
+    param_names = ["prefetch_buffers"]
+    number = 1
+    repeat = 3
+    warmup_time = 0.0
+    timeout = 600
+
+    def _get_iterator(self, prefetch_buffers: int):
+        raise NotImplementedError
+
+    def setup(self, prefetch_buffers: int):
+        self.iterator = self._get_iterator(prefetch_buffers=prefetch_buffers)
+
+    def teardown(self, prefetch_buffers: int):
+        # Stopping after the first buffers leaves the background reads of the prefetcher running
+        self.iterator.close()
+
+    def time_iterate(self, prefetch_buffers: int):
+        _iterate_buffers(iterator=self.iterator)
+
+    def peakmem_iterate(self, prefetch_buffers: int):
+        _iterate_buffers(iterator=self.iterator)
+
+    def track_throughput(self, prefetch_buffers: int) -> float:
+        start_time = time.perf_counter()
+        number_of_bytes = _iterate_buffers(iterator=self.iterator)
+        return number_of_bytes / 1e6 / (time.perf_counter() - start_time)
+
+    track_throughput.unit = "MB/s"
+
+
+class SpikeInterfaceRecordingDataChunkIteratorSuite(_DataChunkIteratorBenchmark):
+    """Iterate over a lazy 384-channel recording of an hour, generated on request by spikeinterface."""
+
+    def _get_iterator(self, prefetch_buffers: int):
+        interface = MockRecordingInterface(
+            num_channels=RECORDING_NUMBER_OF_CHANNELS,
+            sampling_frequency=RECORDING_SAMPLING_FREQUENCY,
+            durations=(RECORDING_DURATION,),
+        )
+        return SpikeInterfaceRecordingDataChunkIterator(
+            recording=interface.recording_extractor, buffer_gb=BUFFER_GB, prefetch_buffers=prefetch_buffers
+        )
+
+
+class ImagingExtractorDataChunkIteratorSuite(_DataChunkIteratorBenchmark):
+    """Iterate over a lazy 512 x 512 video of 50,000 frames."""
+
+    def _get_iterator(self, prefetch_buffers: int):
+        return ImagingExtractorDataChunkIterator(
+            imaging_extractor=_LazyImagingExtractor(), buffer_gb=BUFFER_GB, prefetch_buffers=prefetch_buffers
+        )
+
+
+class ImagingFramesIteratorTypeSuite:
+    """Compare the 'v1' and 'v2' iterators of imaging frames over every frame of videos of large and small frames."""
+
+    params = (["v1", "v2"], [(2_000, 512), (50_000, 64)])
+    param_names = ["iterator_type", "video_shape"]
+    number = 1
+    repeat = 3
+    warmup_time = 0.0
+    timeout = 600
+
+    def setup(self, iterator_type: str, video_shape: tuple[int, int]):
+        number_of_frames, image_size = video_shape
+        imaging = _LazyImagingExtractor(num_frames=number_of_frames, num_rows=image_size, num_columns=image_size)
+        self.iterator = _imaging_frames_to_hdmf_iterator(imaging=imaging, iterator_type=iterator_type)
+
+    def time_iterate(self, iterator_type: str, video_shape: tuple[int, int]):
+        for _ in self.iterator:
+            pass
+
+    def track_throughput(self, iterator_type: str, video_shape: tuple[int, int]) -> float:
+        start_time = time.perf_counter()
+        number_of_bytes = sum(buffer.data.nbytes for buffer in self.iterator)
+        return number_of_bytes / 1e6 / (time.perf_counter() - start_time)
+
+    track_throughput.unit = "MB/s"
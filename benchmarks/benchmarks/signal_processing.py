@@ -0,0 +1,20 @@
+from neuroconv.tools.signal_processing import get_rising_frames_from_ttl
+from neuroconv.tools.testing import generate_mock_ttl_signal
+
+
+class GetRisingFramesFromTTL:
+    """Detect the pulses of an hour-long TTL signal, sampled at 25 kHz as on a SpikeGLX NIDQ channel."""
+
+    params = [100_000, 1_000_000, 10_000_000]
+    param_names = ["chunk_size"]
+    timeout = 300
+
+    def setup_cache(self):
+        # A pulse every ten seconds, like the synchronization signal of a camera or behavioral rig
+        return generate_mock_ttl_signal(signal_duration=3_600.0, ttl_times=[float(t) for t in range(1, 3_600, 10)])
+
+    def time_get_rising_frames_from_ttl(self, trace, chunk_size: int):
+        get_rising_frames_from_ttl(trace=trace, chunk_size=chunk_size)
+
+    def peakmem_get_rising_frames_from_ttl(self, trace, chunk_size: int):
+        get_rising_frames_from_ttl(trace=trace, chunk_size=chunk_size)
@@ -1,7 +1,10 @@
+import functools
 import importlib
 import json
 import uuid
 from abc import ABC, abstractmethod
+from collections import Counter
+from copy import deepcopy
 from pathlib import Path
 from typing import Literal, Optional, Union
 
@@ -27,6 +30,47 @@ from .utils.dict import DeepDict
 from .utils.json_schema import _NWBSourceDataEncoder
 
 
+def _memoize_metadata(method):
+    """
+    Cache the return value of a metadata method on the interface and return a deep copy of it on later calls.
+
+    The cached value is kept until `BaseDataInterface._clear_metadata_cache` is called, which the methods that alter
+    the metadata of an interface (e.g., `set_probe`) do. Calls with arguments, and the `super()` calls made while the
+    value is being computed, bypass the cache. The identifier generated by `BaseDataInterface.get_metadata` is generated
+    anew on every call, so that files written from the same interface never share it.
+    """
+    cache_key = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        call_depths = self.__dict__.setdefault("_metadata_call_depths", Counter())
+        if args or kwargs or call_depths[method.__name__] > 0:
+            return method(self, *args, **kwargs)
+
+        metadata_cache = self.__dict__.setdefault("_metadata_cache", dict())
+        if cache_key in metadata_cache:
+            cached_value, generated_identifier = metadata_cache[cache_key]
+            value = deepcopy(cached_value)
+            nwbfile_metadata = value.get("NWBFile", dict()) if isinstance(value, dict) else dict()
+            if generated_identifier is not None and nwbfile_metadata.get("identifier") == generated_identifier:
+                nwbfile_metadata["identifier"] = str(uuid.uuid4())
+            return value
+
+        self.__dict__.pop("_generated_identifier", None)
+        call_depths[method.__name__] += 1
+        try:
+            value = method(self)
+        finally:
+            call_depths[method.__name__] -= 1
+        generated_identifier = self.__dict__.pop("_generated_identifier", None)
+
+        # The caller is free to modify the returned value
+        metadata_cache[cache_key] = (deepcopy(value), generated_identifier)
+        return value
+
+    return wrapper
+
+
 class BaseDataInterface(ABC):
     """Abstract class defining the structure of all DataInterfaces."""
 
@@ -34,6 +78,9 @@ class BaseDataInterface(ABC):
     keywords: tuple[str] = tuple()
     associated_suffixes: tuple[str] = tuple()
     info: Union[str, None] = None
+    # Whether values derived from the source files (e.g., original timestamps) are cached on disk across sessions, once
+    # caching is enabled through the NEUROCONV_CACHE_DIRECTORY environment variable
+    use_cache: bool = True
 
     @classmethod
     def get_source_schema(cls) -> dict:
@@ -64,16 +111,27 @@ class BaseDataInterface(ABC):
 
         self._validate_source_data(source_data=source_data, verbose=verbose)
 
+    def _clear_metadata_cache(self) -> None:
+        """
+        Clear the values cached by the metadata methods decorated with `_memoize_metadata`.
+
+        Should be called by any method that alters what the metadata of the interface describes.
+        """
+        self.__dict__.pop("_metadata_cache", None)
+
+    @_memoize_metadata
     def get_metadata_schema(self) -> dict:
         """Retrieve JSON schema for metadata."""
         metadata_schema = load_dict_from_file(Path(__file__).parent / "schemas" / "base_metadata_schema.json")
         return metadata_schema
 
+    @_memoize_metadata
     def get_metadata(self) -> DeepDict:
         """Child DataInterface classes should override this to match their metadata."""
         metadata = DeepDict()
         metadata["NWBFile"]["session_description"] = ""
         metadata["NWBFile"]["identifier"] = str(uuid.uuid4())
+        self._generated_identifier = metadata["NWBFile"]["identifier"]  # Generated anew when the metadata is memoized
 
         # Add NeuroConv watermark (overridden if going through the GUIDE)
         neuroconv_version = importlib.metadata.version("neuroconv")
@@ -206,9 +264,10 @@ class BaseDataInterface(ABC):
     @staticmethod
     def get_default_backend_configuration(
         nwbfile: NWBFile,
-        # TODO: when all H5DataIO prewraps are gone, introduce Zarr safely
-        # backend: Union[Literal["hdf5", "zarr"]],
-        backend: Literal["hdf5"] = "hdf5",
+        backend: Literal["hdf5", "zarr"] = "hdf5",
+        access_pattern: Union[Literal["time", "channel", "frame"], dict[str, str], None] = None,
+        storage_profile: Optional[Literal["local_ssd", "network_filesystem", "object_store"]] = None,
+        available_memory_gb: Optional[float] = None,
     ) -> Union[HDF5BackendConfiguration, ZarrBackendConfiguration]:
         """
         Fill and return a default backend configuration to serve as a starting point for further customization.
@@ -217,13 +276,26 @@ class BaseDataInterface(ABC):
         ----------
         nwbfile : pynwb.NWBFile
             The in-memory object with this interface's data already added to it.
-        backend : "hdf5", default: "hdf5"
+        backend : "hdf5" or "zarr", default: "hdf5"
             The type of backend to use when creating the file.
-            Additional backend types will be added soon.
+        access_pattern : "time", "channel" or "frame", or a dictionary of them, optional
+            How the datasets will most often be read, either for all datasets or by location in the file.
+            If specified, the chunk and buffer shapes of each dataset are planned for this access pattern.
+        storage_profile : "local_ssd", "network_filesystem" or "object_store", optional
+            Where the file will be read from. If specified, the chunk and buffer shapes of each dataset are planned
+            for this storage.
+        available_memory_gb : float, optional
+            The memory available to the conversion, which bounds the planned buffer shapes.
 
         Returns
         -------
         backend_configuration : HDF5BackendConfiguration or ZarrBackendConfiguration
             The default configuration for the specified backend type.
         """
-        return get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+        return get_default_backend_configuration(
+            nwbfile=nwbfile,
+            backend=backend,
+            access_pattern=access_pattern,
+            storage_profile=storage_profile,
+            available_memory_gb=available_memory_gb,
+        )
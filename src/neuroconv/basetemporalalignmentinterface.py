@@ -66,6 +66,7 @@ class BaseTemporalAlignmentInterface(BaseDataInterface):
         aligned_starting_time : float
             The starting time for all temporal data in this interface.
         """
+        self._clear_metadata_cache()
         self.set_aligned_timestamps(aligned_timestamps=self.get_timestamps() + aligned_starting_time)
 
     def align_by_interpolation(self, unaligned_timestamps: np.ndarray, aligned_timestamps: np.ndarray) -> None:
@@ -89,6 +90,7 @@ class BaseTemporalAlignmentInterface(BaseDataInterface):
         aligned_timestamps : numpy.ndarray
             The timestamps aligned to the primary time basis.
         """
+        self._clear_metadata_cache()
         self.set_aligned_timestamps(
             aligned_timestamps=np.interp(x=self.get_timestamps(), xp=unaligned_timestamps, fp=aligned_timestamps)
         )
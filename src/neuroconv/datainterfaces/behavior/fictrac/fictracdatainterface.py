@@ -13,6 +13,7 @@ from pynwb.file import NWBFile
 from ....basetemporalalignmentinterface import BaseTemporalAlignmentInterface
 from ....tools import get_module
 from ....utils import calculate_regular_series_rate
+from ....utils.cache import cache_on_disk
 
 
 class FicTracDataInterface(BaseTemporalAlignmentInterface):
@@ -287,6 +288,7 @@ class FicTracDataInterface(BaseTemporalAlignmentInterface):
         processing_module = get_module(nwbfile=nwbfile, name="behavior")
         processing_module.add_data_interface(position_container)
 
+    @cache_on_disk
     def get_original_timestamps(self):
         """
         Retrieve and correct timestamps from a FicTrac data file.
@@ -1,11 +1,15 @@
 from pydantic import FilePath
 
+from ..video.video_utils import get_container_timestamps
 from ....tools import get_package
 
 
 def extract_timestamps(video_file_path: FilePath) -> list:
     """Extract the timestamps using pyav
 
+    The timestamps are read from the packets of the container without decoding the video; if the container does not
+    store a timestamp for every packet, the frames are decoded instead.
+
     Parameters
     ----------
     video_file_path : FilePathType
@@ -18,6 +22,10 @@ def extract_timestamps(video_file_path: FilePath) -> list:
     """
     av = get_package(package_name="av")
 
+    timestamps = get_container_timestamps(file_path=video_file_path, relative_to_stream_start=False)
+    if timestamps is not None:
+        return timestamps.tolist()
+
     with av.open(str(video_file_path)) as container:
         stream = container.streams.video[0]
         timestamps = [frame.time for frame in container.decode(stream)]
@@ -7,31 +7,94 @@ from tqdm import tqdm
 
 from neuroconv.tools.hdmf import GenericDataChunkIterator
 
-from ....tools import get_package
+from ....tools import get_package, is_package_installed
 
+# Packets may be stored in decoding order, which can differ from presentation order by a few frames (e.g. B-frames)
+_MAXIMUM_FRAME_REORDERING = 16
 
-def get_video_timestamps(file_path: FilePath, max_frames: Optional[int] = None, display_progress: bool = True) -> list:
+
+def get_video_timestamps(
+    file_path: FilePath, max_frames: Optional[int] = None, display_progress: bool = True
+) -> np.ndarray:
     """Extract the timestamps of the video located in file_path
 
+    If PyAV is installed, the presentation timestamps are read from the packets of the container without decoding
+    any frames. Otherwise, or if the container does not store a timestamp for every packet, the video is decoded
+    with OpenCV instead, which is much slower for long videos.
+
     Parameters
     ----------
     file_path : Path or str
         The path to a multimedia video file
     max_frames : Optional[int], optional
         If provided, extract the timestamps of the video only up to max_frames.
+    display_progress : bool, default: True
+        Whether to display a progress bar when the video has to be decoded.
 
     Returns
     -------
-    list
-        The timestamps of the video.
+    numpy.ndarray
+        The timestamps of the video in seconds, relative to the start of the video stream.
     """
+    timestamps = None
+    if is_package_installed(package_name="av"):
+        timestamps = get_container_timestamps(file_path=file_path, max_frames=max_frames)
 
-    with VideoCaptureContext(str(file_path)) as video_context:
-        timestamps = video_context.get_video_timestamps(max_frames=max_frames, display_progress=display_progress)
+    if timestamps is None:
+        with VideoCaptureContext(str(file_path)) as video_context:
+            timestamps = video_context.get_video_timestamps(max_frames=max_frames, display_progress=display_progress)
 
     return timestamps
 
 
+def get_container_timestamps(
+    file_path: FilePath, max_frames: Optional[int] = None, relative_to_stream_start: bool = True
+) -> Optional[np.ndarray]:
+    """Read the presentation timestamps of the first video stream from the packets of the container using PyAV.
+
+    Only the container is demultiplexed; no frames are decoded.
+
+    Parameters
+    ----------
+    file_path : Path or str
+        The path to a multimedia video file
+    max_frames : Optional[int], optional
+        If provided, extract the timestamps of the video only up to max_frames.
+    relative_to_stream_start : bool, default: True
+        Whether to subtract the start time of the stream, as OpenCV does.
+        Otherwise, the timestamps match the `time` attribute of the frames decoded by PyAV.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The timestamps of the video in seconds, or None if any packet of the stream lacks a presentation timestamp.
+    """
+    av = get_package(package_name="av")
+
+    presentation_timestamps = []
+    with av.open(str(file_path)) as container:
+        stream = container.streams.video[0]
+        time_base = stream.time_base
+        start_time = stream.start_time or 0
+
+        for packet in container.demux(stream):
+            if packet.size == 0:  # Flushing packets do not hold a frame
+                continue
+            if packet.pts is None:
+                return None
+
+            presentation_timestamps.append(packet.pts)
+            if max_frames is not None and len(presentation_timestamps) >= max_frames + _MAXIMUM_FRAME_REORDERING:
+                break
+
+    presentation_timestamps = np.sort(np.array(presentation_timestamps, dtype="int64"))[:max_frames]
+    if relative_to_stream_start:
+        presentation_timestamps -= start_time
+
+    # Exact integer arithmetic up to the final division, equivalent to `float(pts * time_base)` as used by PyAV
+    return presentation_timestamps * time_base.numerator / time_base.denominator
+
+
 class VideoCaptureContext:
     """Retrieving video metadata and frames using a context manager."""
 
@@ -58,7 +121,8 @@ class VideoCaptureContext:
             else range(frames_to_extract)
         )
         for _ in iterator:
-            success, _ = self.vc.read()
+            # Grabbing decodes the frame without the conversion to BGR and copy to an array performed by `read`
+            success = self.vc.grab()
             if not success:
                 break
             timestamps.append(self.vc.get(cv2.CAP_PROP_POS_MSEC))
@@ -131,6 +195,33 @@ class VideoCaptureContext:
         self.current_frame = initial_frame_number
         return np.flip(frame, 2)  # np.flip to re-order color channels to RGB
 
+    def read_frame_into(self, frame: np.ndarray) -> bool:
+        """
+        Decode the next frame of the video directly into a preallocated array as an RGB colorspace.
+
+        The array must have the shape and dtype of the frames of the video. Both the decoding and the re-ordering of
+        the color channels happen in place, so no intermediate arrays are allocated.
+
+        Returns
+        -------
+        bool
+            Whether the frame was successfully read.
+        """
+        cv2 = get_package(package_name="cv2", installation_instructions="pip install opencv-python-headless")
+        assert self.isOpened(), self._video_open_msg
+
+        success, decoded_frame = self.vc.read(image=frame)
+        if not success:
+            return False
+        self._current_frame += 1
+
+        # OpenCV only allocates a new array if the provided one is not compatible with the decoded frame
+        if decoded_frame.ctypes.data != frame.ctypes.data:
+            frame[:] = decoded_frame
+        cv2.cvtColor(src=frame, code=cv2.COLOR_BGR2RGB, dst=frame)  # re-order color channels to RGB
+
+        return True
+
     def get_video_frame_dtype(self):
         """Return the dtype for frame in a video file."""
         frame = self.get_video_frame(0)
@@ -181,15 +272,18 @@ class VideoDataChunkIterator(GenericDataChunkIterator):
         buffer_gb: float = None,
         chunk_shape: tuple = None,
         stub_test: bool = False,
+        prefetch_buffers: int = 0,
     ):
         self.video_capture_ob = VideoCaptureContext(video_file)
         self._full_frame_size_mb, self._full_frame_shape = self._get_frame_details()
+        self._frame_buffer = None  # Allocated on first read and reused for every subsequent buffer
         if stub_test:
             self.video_capture_ob.frame_count = 10
         super().__init__(
             buffer_gb=buffer_gb,
             chunk_shape=chunk_shape,
             display_progress=True,
+            prefetch_buffers=prefetch_buffers,
         )
 
     def _get_default_chunk_shape(self, chunk_mb):
@@ -224,11 +318,20 @@ class VideoDataChunkIterator(GenericDataChunkIterator):
         return min_frame_size_mb, frame_shape
 
     def _get_data(self, selection: tuple[slice]) -> np.ndarray:
-        start_frame = selection[0].start
-        end_frame = selection[0].stop
-        frames = np.empty(shape=[end_frame - start_frame, *self._maxshape[1:]])
-        for frame_number in range(end_frame - start_frame):
-            frames[frame_number] = next(self.video_capture_ob)
+        number_of_frames = selection[0].stop - selection[0].start
+
+        # The writer consumes each buffer before requesting the next one, so a single buffer can be reused;
+        # except when prefetching, in which case several buffers are held in memory at once
+        if self._prefetcher is not None:
+            frames = np.empty(shape=(number_of_frames, *self._maxshape[1:]), dtype=self.dtype)
+        else:
+            if self._frame_buffer is None:
+                self._frame_buffer = np.empty(shape=(self.buffer_shape[0], *self._maxshape[1:]), dtype=self.dtype)
+            frames = self._frame_buffer[:number_of_frames]
+
+        for frame in frames:
+            if not self.video_capture_ob.read_frame_into(frame=frame):
+                raise StopIteration  # Consistent with iterating over the VideoCaptureContext directly
         return frames
 
     def _get_dtype(self):
@@ -11,11 +11,12 @@ from pynwb import NWBFile
 from pynwb.image import ImageSeries
 from tqdm import tqdm
 
-from .video_utils import VideoCaptureContext
+from .video_utils import VideoCaptureContext, get_video_timestamps
 from ....basedatainterface import BaseDataInterface
 from ....tools import get_package
 from ....tools.nwb_helpers import get_module
 from ....utils import get_base_schema, get_schema_from_hdmf_class
+from ....utils.cache import cache_on_disk
 from ....utils.str_utils import human_readable_size
 
 
@@ -105,6 +106,7 @@ class VideoInterface(BaseDataInterface):
 
         return metadata
 
+    @cache_on_disk
     def get_original_timestamps(self, stub_test: bool = False) -> list[np.ndarray]:
         """
         Retrieve the original unaltered timestamps for the data in this interface.
@@ -123,10 +125,9 @@ class VideoInterface(BaseDataInterface):
         max_frames = 10 if stub_test else None
         timestamps = list()
         for j, file_path in enumerate(self.source_data["file_paths"]):
-            with VideoCaptureContext(file_path=str(file_path)) as video:
-                # fps = video.get_video_fps()  # There is some debate about whether the OpenCV timestamp
-                # method is simply returning range(length) / fps 100% of the time for any given format
-                timestamps.append(video.get_video_timestamps(max_frames=max_frames))
+            # There is some debate about whether the OpenCV timestamp method is simply returning
+            # range(length) / fps 100% of the time for any given format
+            timestamps.append(get_video_timestamps(file_path=file_path, max_frames=max_frames))
         return timestamps
 
     def get_timing_type(self) -> Literal["starting_time and rate", "timestamps"]:
@@ -6,11 +6,34 @@ from pynwb.device import Device
 from pynwb.ecephys import ElectricalSeries, ElectrodeGroup
 
 from ...baseextractorinterface import BaseExtractorInterface
+from ...tools.signal_processing import get_rising_frames_from_ttl
 from ...utils import (
     DeepDict,
     get_base_schema,
     get_schema_from_hdmf_class,
 )
+from ...utils.cache import cache_on_disk
+
+
+class _RecordingChannelTrace:
+    """A lazily sliceable view of the traces of a single channel of a recording, read only when sliced."""
+
+    def __init__(self, recording, channel_id: Union[str, int], segment_index: int = 0):
+        self.recording = recording
+        self.channel_id = channel_id
+        self.segment_index = segment_index
+        self.shape = (recording.get_num_frames(segment_index=segment_index),)
+
+    def __getitem__(self, selection: Union[slice, tuple[slice]]) -> np.ndarray:
+        frame_slice = selection[0] if isinstance(selection, tuple) else selection
+        start_frame, end_frame, _ = frame_slice.indices(self.shape[0])
+        traces = self.recording.get_traces(
+            segment_index=self.segment_index,
+            start_frame=start_frame,
+            end_frame=end_frame,
+            channel_ids=[self.channel_id],
+        )
+        return traces[:, 0]
 
 
 class BaseRecordingExtractorInterface(BaseExtractorInterface):
@@ -107,6 +130,40 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
 
         return metadata
 
+    def _get_original_recording(self):
+        """Re-initialize the recording extractor from the source data, discarding any change made to it since."""
+        return self.get_extractor()(
+            **{
+                keyword: value
+                for keyword, value in self.extractor_kwargs.items()
+                if keyword not in ["verbose", "es_key"]
+            }
+        )
+
+    @cache_on_disk
+    def _get_original_times_kwargs(self) -> list[dict]:
+        """
+        Retrieve the timing of each segment of the original recording, from which its timestamps are generated.
+
+        Only the sampling frequency and start time of regular segments are kept (and cached), rather than their
+        timestamps, which for long recordings take several gigabytes.
+        """
+        new_recording = self._get_original_recording()
+        times_kwargs = []
+        for segment_index in range(self._number_of_segments):
+            segment_times_kwargs = new_recording._recording_segments[segment_index].get_times_kwargs()
+            time_vector = segment_times_kwargs["time_vector"]
+            times_kwargs.append(
+                dict(
+                    sampling_frequency=segment_times_kwargs["sampling_frequency"],
+                    t_start=segment_times_kwargs["t_start"],
+                    time_vector=np.asarray(time_vector) if time_vector is not None else None,
+                    num_samples=new_recording.get_num_samples(segment_index=segment_index),
+                )
+            )
+
+        return times_kwargs
+
     def get_original_timestamps(self) -> Union[np.ndarray, list[np.ndarray]]:
         """
         Retrieve the original unaltered timestamps for the data in this interface.
@@ -118,20 +175,20 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
         timestamps: numpy.ndarray or list of numpy.ndarray
             The timestamps for the data stream; if the recording has multiple segments, then a list of timestamps is returned.
         """
-        new_recording = self.get_extractor()(
-            **{
-                keyword: value
-                for keyword, value in self.extractor_kwargs.items()
-                if keyword not in ["verbose", "es_key"]
-            }
-        )
-        if self._number_of_segments == 1:
-            return new_recording.get_times()
-        else:
-            return [
-                new_recording.get_times(segment_index=segment_index)
-                for segment_index in range(self._number_of_segments)
-            ]
+        timestamps = []
+        for segment_times_kwargs in self._get_original_times_kwargs():
+            if segment_times_kwargs["time_vector"] is not None:
+                timestamps.append(segment_times_kwargs["time_vector"])
+                continue
+
+            # As in `BaseRecordingSegment.get_times`
+            segment_timestamps = np.arange(segment_times_kwargs["num_samples"], dtype="float64")
+            segment_timestamps /= segment_times_kwargs["sampling_frequency"]
+            if segment_times_kwargs["t_start"] is not None:
+                segment_timestamps += segment_times_kwargs["t_start"]
+            timestamps.append(segment_timestamps)
+
+        return timestamps[0] if self._number_of_segments == 1 else timestamps
 
     def get_timestamps(self) -> Union[np.ndarray, list[np.ndarray]]:
         """
@@ -155,6 +212,7 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
             self._number_of_segments == 1
         ), "This recording has multiple segments; please use 'align_segment_timestamps' instead."
 
+        self._clear_metadata_cache()
         self.recording_extractor.set_times(times=aligned_timestamps, with_warning=False)
 
     def set_aligned_segment_timestamps(self, aligned_segment_timestamps: list[np.ndarray]):
@@ -175,6 +233,7 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
             len(aligned_segment_timestamps) == self._number_of_segments
         ), f"The number of timestamp vectors ({len(aligned_segment_timestamps)}) does not match the number of segments ({self._number_of_segments})!"
 
+        self._clear_metadata_cache()
         for segment_index in range(self._number_of_segments):
             self.recording_extractor.set_times(
                 times=aligned_segment_timestamps[segment_index],
@@ -232,6 +291,9 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
             If 'by_probe', channels are grouped by the probe_id column.
             This is a required parameter to avoid the pitfall of using the wrong mode.
         """
+        # The electrode groups of the metadata are derived from the probe
+        self._clear_metadata_cache()
+
         # Set the probe to the recording extractor
         self.recording_extractor.set_probe(
             probe,
@@ -253,6 +315,37 @@ class BaseRecordingExtractorInterface(BaseExtractorInterface):
         """
         return self.recording_extractor.has_probe()
 
+    def get_event_times_from_ttl(
+        self, channel_name: str, threshold: Optional[float] = None, hysteresis: float = 0.0
+    ) -> np.ndarray:
+        """
+        Return the start of event times from the rising part of TTL pulses on one of the channels.
+
+        The channel is read one block of frames at a time, so that long recordings are scanned in constant memory.
+
+        Parameters
+        ----------
+        channel_name : str
+            Name of the channel, as returned by `recording_extractor.get_channel_ids()`.
+        threshold : float, optional
+            The threshold used to distinguish on/off states in the trace.
+            The mean of the trace is used by default.
+        hysteresis : float, default: 0.0
+            The width of a band centered on the threshold within which the trace keeps its previous on/off state.
+            Use it to debounce noisy analog channels.
+
+        Returns
+        -------
+        rising_times : numpy.ndarray
+            The times of the rising TTL pulses.
+        """
+        trace = _RecordingChannelTrace(recording=self.recording_extractor, channel_id=channel_name)
+        rising_frames = get_rising_frames_from_ttl(trace=trace, threshold=threshold, hysteresis=hysteresis)
+
+        rising_times = self.recording_extractor.sample_index_to_time(rising_frames)
+
+        return rising_times
+
     def align_by_interpolation(
         self,
         unaligned_timestamps: np.ndarray,
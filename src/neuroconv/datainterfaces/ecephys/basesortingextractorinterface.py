@@ -123,6 +123,7 @@ class BaseSortingExtractorInterface(BaseExtractorInterface):
             self._number_of_segments == 1
         ), "This recording has multiple segments; please use 'set_aligned_segment_timestamps' instead."
 
+        self._clear_metadata_cache()
         if self._number_of_segments == 1:
             self.sorting_extractor._recording.set_times(times=aligned_timestamps, with_warning=False)
         else:
@@ -164,6 +165,7 @@ class BaseSortingExtractorInterface(BaseExtractorInterface):
             len(aligned_segment_timestamps) == self._number_of_segments
         ), f"The number of timestamp vectors ({len(aligned_segment_timestamps)}) does not match the number of segments ({self._number_of_segments})!"
 
+        self._clear_metadata_cache()
         for segment_index in range(self._number_of_segments):
             self.sorting_extractor._recording.set_times(
                 times=aligned_segment_timestamps[segment_index],
@@ -172,6 +174,7 @@ class BaseSortingExtractorInterface(BaseExtractorInterface):
             )
 
     def set_aligned_starting_time(self, aligned_starting_time: float):
+        self._clear_metadata_cache()
         if self.sorting_extractor.has_recording():
             if self._number_of_segments == 1:
                 self.set_aligned_timestamps(aligned_timestamps=self.get_timestamps() + aligned_starting_time)
@@ -202,6 +205,7 @@ class BaseSortingExtractorInterface(BaseExtractorInterface):
             f"of segments ({self._number_of_segments})!"
         )
 
+        self._clear_metadata_cache()
         if self.sorting_extractor.has_recording():
             if self._number_of_segments == 1:
                 self.set_aligned_starting_time(aligned_starting_time=aligned_segment_starting_times[0])
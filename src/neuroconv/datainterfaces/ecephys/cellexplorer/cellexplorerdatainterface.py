@@ -8,6 +8,7 @@ from pynwb import NWBFile
 
 from ..baserecordingextractorinterface import BaseRecordingExtractorInterface
 from ..basesortingextractorinterface import BaseSortingExtractorInterface
+from ....basedatainterface import _memoize_metadata
 from ....tools import get_package
 
 
@@ -547,6 +548,7 @@ class CellExplorerSortingInterface(BaseSortingExtractorInterface):
 
         return dummy_recording_extractor
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
         session_path = Path(self.source_data["file_path"]).parent
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Optional
 
-import numpy as np
 from pydantic import DirectoryPath, FilePath
 
 from .neuroscope_utils import (
@@ -173,16 +172,9 @@ class NeuroScopeRecordingInterface(BaseRecordingExtractorInterface):
             metadata["NWBFile"]["session_start_time"] = session_start_time
         return metadata
 
-    def get_original_timestamps(self) -> np.ndarray:
+    def _get_original_recording(self):
         # TODO: add generic method for aliasing from NeuroConv signature to SI init
-        new_recording = self.get_extractor()(file_path=self.source_data["file_path"])
-        if self._number_of_segments == 1:
-            return new_recording.get_times()
-        else:
-            return [
-                new_recording.get_times(segment_index=segment_index)
-                for segment_index in range(self._number_of_segments)
-            ]
+        return self.get_extractor()(file_path=self.source_data["file_path"])
 
 
 class NeuroScopeLFPInterface(BaseLFPExtractorInterface):
@@ -3,7 +3,6 @@
 from pathlib import Path
 from typing import Optional
 
-import numpy as np
 from pydantic import FilePath, validate_call
 
 from .spikeglx_utils import (
@@ -13,6 +12,7 @@ from .spikeglx_utils import (
     get_session_start_time,
 )
 from ..baserecordingextractorinterface import BaseRecordingExtractorInterface
+from ....basedatainterface import _memoize_metadata
 from ....utils import get_json_schema_from_method_signature
 
 
@@ -90,6 +90,7 @@ class SpikeGLXRecordingInterface(BaseRecordingExtractorInterface):
         # Set electrodes properties
         add_recording_extractor_properties(self.recording_extractor)
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
         session_start_time = get_session_start_time(self.meta)
@@ -130,15 +131,8 @@ class SpikeGLXRecordingInterface(BaseRecordingExtractorInterface):
 
         return metadata
 
-    def get_original_timestamps(self) -> np.ndarray:
-        new_recording = self.get_extractor()(
+    def _get_original_recording(self):
+        return self.get_extractor()(
             folder_path=self.folder_path,
             stream_id=self.stream_id,
         )  # TODO: add generic method for aliasing from NeuroConv signature to SI init
-        if self._number_of_segments == 1:
-            return new_recording.get_times()
-        else:
-            return [
-                new_recording.get_times(segment_index=segment_index)
-                for segment_index in range(self._number_of_segments)
-            ]
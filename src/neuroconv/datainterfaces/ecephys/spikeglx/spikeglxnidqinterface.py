@@ -1,11 +1,10 @@
 from pathlib import Path
 
-import numpy as np
 from pydantic import ConfigDict, FilePath, validate_call
 
 from .spikeglx_utils import get_session_start_time
 from ..baserecordingextractorinterface import BaseRecordingExtractorInterface
-from ....tools.signal_processing import get_rising_frames_from_ttl
+from ....basedatainterface import _memoize_metadata
 from ....utils import get_schema_from_method_signature
 
 
@@ -74,6 +73,7 @@ class SpikeGLXNIDQInterface(BaseRecordingExtractorInterface):
         )
         self.meta = self.recording_extractor.neo_reader.signals_info_dict[(0, "nidq")]["meta"]
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
 
@@ -105,27 +105,3 @@ class SpikeGLXNIDQInterface(BaseRecordingExtractorInterface):
     def get_channel_names(self) -> list[str]:
         """Return a list of channel names as set in the recording extractor."""
         return list(self.recording_extractor.get_channel_ids())
-
-    def get_event_times_from_ttl(self, channel_name: str) -> np.ndarray:
-        """
-        Return the start of event times from the rising part of TTL pulses on one of the NIDQ channels.
-
-        Parameters
-        ----------
-        channel_name : str
-            Name of the channel in the .nidq.bin file.
-
-        Returns
-        -------
-        rising_times : numpy.ndarray
-            The times of the rising TTL pulses.
-        """
-        # TODO: consider RAM cost of these operations and implement safer buffering version
-        rising_frames = get_rising_frames_from_ttl(
-            trace=self.recording_extractor.get_traces(channel_ids=[channel_name])
-        )
-
-        nidq_timestamps = self.recording_extractor.get_times()
-        rising_times = nidq_timestamps[rising_frames]
-
-        return rising_times
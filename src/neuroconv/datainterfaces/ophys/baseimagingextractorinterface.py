@@ -135,6 +135,7 @@ class BaseImagingExtractorInterface(BaseExtractorInterface):
         return self.imaging_extractor.frame_to_time(frames=np.arange(stop=self.imaging_extractor.get_num_frames()))
 
     def set_aligned_timestamps(self, aligned_timestamps: np.ndarray):
+        self._clear_metadata_cache()
         self.imaging_extractor.set_times(times=aligned_timestamps)
 
     def add_to_nwbfile(
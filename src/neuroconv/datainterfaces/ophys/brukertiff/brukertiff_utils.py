@@ -0,0 +1,72 @@
+"""Index the frames of the XML configuration file of a Bruker session in a single pass."""
+
+import numpy as np
+
+# The types of Sequence elements of volumetric (multi-plane) imaging, as determined by roiextractors
+_VOLUMETRIC_SERIES_TYPES = ("TSeries ZSeries Element", "ZSeries")
+
+
+class BrukerXML:
+    """
+    An index of the frames of the parsed XML configuration file of a Bruker session.
+
+    The file names (and channel names) of each frame and the 'ZAxis' values of their 'positionCurrent' state are
+    gathered in a single pass over the tree, so that looking up the frames of a stream does not search the tree again.
+    Only the index is kept, so the tree itself can be released once the index is built.
+    """
+
+    def __init__(self, xml_root):
+        first_sequence_element = xml_root.find(".//Sequence")
+        series_type = first_sequence_element.attrib.get("type") if first_sequence_element is not None else None
+        self.is_volumetric = series_type in _VOLUMETRIC_SERIES_TYPES
+
+        default_position_element = xml_root.find(".//PVStateValue[@key='positionCurrent']")
+        self.default_position = self._get_position_values(position_element=default_position_element)
+
+        file_names = []
+        file_frame_indices = []
+        channel_names = dict()
+        frame_z_positions = []
+        for frame_index, frame_element in enumerate(xml_root.iter("Frame")):
+            for file_element in frame_element.iterfind("File"):
+                file_names.append(file_element.attrib["filename"])
+                file_frame_indices.append(frame_index)
+                channel_names[file_element.attrib["channelName"]] = None
+
+            position_element = frame_element.find(".//PVStateValue[@key='positionCurrent']")
+            frame_position = self._get_position_values(position_element=position_element)
+            frame_z_positions.append(frame_position.get("ZAxis", []))
+
+        self.channel_names = list(channel_names)
+        self.file_names = np.array(file_names, dtype=str)
+        self.file_frame_indices = np.array(file_frame_indices, dtype="int64")
+
+        # Frames without a 'positionCurrent' state (or with fewer Z devices) are padded with NaN
+        number_of_z_devices = max((len(z_positions) for z_positions in frame_z_positions), default=0)
+        self.frame_z_positions = np.full(shape=(len(frame_z_positions), number_of_z_devices), fill_value=np.nan)
+        for frame_index, z_positions in enumerate(frame_z_positions):
+            self.frame_z_positions[frame_index, : len(z_positions)] = z_positions
+
+    @staticmethod
+    def _get_position_values(position_element) -> dict[str, list[float]]:
+        """Return the values of each axis of a 'positionCurrent' element, keyed by the name of the axis."""
+        if position_element is None:
+            return dict()
+
+        return {
+            sub_indexed_values.attrib["index"]: [float(value.attrib["value"]) for value in sub_indexed_values]
+            for sub_indexed_values in position_element.iterfind("SubindexedValues")
+        }
+
+    def get_first_frame_index(self, stream_name: str) -> int:
+        """Return the index of the first frame with a file whose name contains the name of the stream."""
+        (file_indices,) = np.nonzero(np.char.find(self.file_names, stream_name) >= 0)
+        if len(file_indices) == 0:
+            raise ValueError(f"No frame of the stream '{stream_name}' was found in the XML configuration file.")
+
+        return int(self.file_frame_indices[file_indices[0]])
+
+    def get_frame_z_positions(self, frame_index: int) -> list[float]:
+        """Return the 'ZAxis' values of the 'positionCurrent' state of a frame (empty if the frame has none)."""
+        z_positions = self.frame_z_positions[frame_index]
+        return z_positions[~np.isnan(z_positions)].tolist()
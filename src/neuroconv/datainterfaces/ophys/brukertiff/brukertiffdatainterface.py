@@ -3,7 +3,9 @@ from typing import Literal, Optional
 from dateutil.parser import parse
 from pydantic import DirectoryPath
 
+from .brukertiff_utils import BrukerXML
 from ..baseimagingextractorinterface import BaseImagingExtractorInterface
+from ....basedatainterface import _memoize_metadata
 from ....utils.dict import DeepDict
 
 
@@ -63,49 +65,33 @@ class BrukerTiffMultiPlaneImagingInterface(BaseImagingExtractorInterface):
         )
         self._stream_name = self.imaging_extractor.stream_name.replace("_", "")
         self._image_size = self.imaging_extractor.get_image_size()
+        self._bruker_xml = None
+
+    def _get_bruker_xml(self) -> BrukerXML:
+        """Return the index of the frames of the XML file parsed by the extractors, built on the first call."""
+        if self._bruker_xml is None:
+            # The extractors of all planes hold the same tree
+            self._bruker_xml = BrukerXML(xml_root=self.imaging_extractor._imaging_extractors[0]._xml_root)
+
+        return self._bruker_xml
 
     def _determine_position_current(self) -> list[float]:
         """
         Returns y, x, and z position values. The unit of values is in the microscope reference frame.
         """
-        from roiextractors.extractors.tiffimagingextractors.brukertiffimagingextractor import (
-            _parse_xml,
-        )
-
-        streams = self.get_streams(folder_path=self.folder_path)
-        channel_stream_name = streams["channel_streams"][0]
-        plane_streams_per_channel = streams["plane_streams"][channel_stream_name]
+        plane_streams_per_channel = [extractor.stream_name for extractor in self.imaging_extractor._imaging_extractors]
 
         # general positionCurrent
-        position_values = []
-        xml_root_element = _parse_xml(folder_path=self.folder_path)
-        default_position_element = xml_root_element.find(".//PVStateValue[@key='positionCurrent']")
-
-        for index_value in ["YAxis", "XAxis"]:
-            position_sub_indexed_values = default_position_element.find(f"./SubindexedValues[@index='{index_value}']")
-            for position_sub_indexed_value in position_sub_indexed_values:
-                position_values.append(float(position_sub_indexed_value.attrib["value"]))
+        bruker_xml = self._get_bruker_xml()
+        position_values = bruker_xml.default_position["YAxis"] + bruker_xml.default_position["XAxis"]
 
+        z_positions = bruker_xml.default_position["ZAxis"]
         z_plane_values = []
         for plane_stream in plane_streams_per_channel:
-            frames_per_stream = [
-                frame
-                for frame in xml_root_element.findall(".//Frame")
-                for file in frame.findall("File")
-                if plane_stream in file.attrib["filename"]
-            ]
-
             # The frames for each plane will have the same positionCurrent values
-            position_element = frames_per_stream[0].find(".//PVStateValue[@key='positionCurrent']")
-            default_z_position_values = default_position_element.find("./SubindexedValues[@index='ZAxis']")
-            z_positions = []
-            for z_sub_indexed_value in default_z_position_values:
-                z_value = float(z_sub_indexed_value.attrib["value"])
-                z_positions.append(z_value)
-
-            z_position_values = position_element.find("./SubindexedValues[@index='ZAxis']")
-            for z_device_ind, z_position_value in enumerate(z_position_values):
-                z_value = float(z_position_value.attrib["value"])
+            frame_index = bruker_xml.get_first_frame_index(stream_name=plane_stream)
+            z_position_values = bruker_xml.get_frame_z_positions(frame_index=frame_index)
+            for z_device_ind, z_value in enumerate(z_position_values):
                 # find the changing z position value
                 if z_positions[z_device_ind] != z_value:
                     z_plane_values.append(z_value)
@@ -116,6 +102,7 @@ class BrukerTiffMultiPlaneImagingInterface(BaseImagingExtractorInterface):
         position_values.append(z_value)
         return position_values
 
+    @_memoize_metadata
     def get_metadata(self) -> DeepDict:
         metadata = super().get_metadata()
 
@@ -141,8 +128,7 @@ class BrukerTiffMultiPlaneImagingInterface(BaseImagingExtractorInterface):
             scan_line_rate=1 / float(xml_metadata["scanLinePeriod"]),
         )
 
-        streams = self.get_streams(folder_path=self.folder_path, plane_separation_type="contiguous")
-        if len(streams["channel_streams"]) > 1:
+        if len(self._get_bruker_xml().channel_names) > 1:
             imaging_plane_name = f"ImagingPlane{self._stream_name}"
             imaging_plane_metadata.update(name=imaging_plane_name)
             two_photon_series_metadata.update(
@@ -221,47 +207,39 @@ class BrukerTiffSinglePlaneImagingInterface(BaseImagingExtractorInterface):
         self.folder_path = folder_path
         self._stream_name = self.imaging_extractor.stream_name.replace("_", "")
         self._image_size = self.imaging_extractor.get_image_size()
+        self._bruker_xml = None
+
+    def _get_bruker_xml(self) -> BrukerXML:
+        """Return the index of the frames of the XML file parsed by the extractor, built on the first call."""
+        if self._bruker_xml is None:
+            self._bruker_xml = BrukerXML(xml_root=self.imaging_extractor._xml_root)
+
+        return self._bruker_xml
 
     def _determine_position_current(self) -> list[float]:
         """
         Returns y, x, and z position values. The unit of values is in the microscope reference frame.
         """
-        stream_name = self.imaging_extractor.stream_name
-        frames_per_stream = [
-            frame
-            for frame in self.imaging_extractor._xml_root.findall(".//Frame")
-            for file in frame.findall("File")
-            if stream_name in file.attrib["filename"]
-        ]
+        bruker_xml = self._get_bruker_xml()
+        frame_index = bruker_xml.get_first_frame_index(stream_name=self.imaging_extractor.stream_name)
 
         # general positionCurrent
-        position_values = []
-        default_position_element = self.imaging_extractor._xml_root.find(".//PVStateValue[@key='positionCurrent']")
-
-        for index_value in ["YAxis", "XAxis"]:
-            position_sub_indexed_values = default_position_element.find(f"./SubindexedValues[@index='{index_value}']")
-            for position_sub_indexed_value in position_sub_indexed_values:
-                position_values.append(float(position_sub_indexed_value.attrib["value"]))
+        position_values = bruker_xml.default_position["YAxis"] + bruker_xml.default_position["XAxis"]
 
         # The frames for each plane will have the same positionCurrent values
-        position_element = frames_per_stream[0].find(".//PVStateValue[@key='positionCurrent']")
-        if not position_element:
+        z_position_values = bruker_xml.get_frame_z_positions(frame_index=frame_index)
+        if not z_position_values:
             return position_values
 
-        default_z_position_values = default_position_element.find("./SubindexedValues[@index='ZAxis']")
-        z_positions = []
-        for z_sub_indexed_value in default_z_position_values:
-            z_positions.append(float(z_sub_indexed_value.attrib["value"]))
-
-        z_position_values = position_element.find("./SubindexedValues[@index='ZAxis']")
-        for z_device_ind, z_position_value in enumerate(z_position_values):
-            z_value = float(z_position_value.attrib["value"])
+        z_positions = bruker_xml.default_position["ZAxis"]
+        for z_device_ind, z_value in enumerate(z_position_values):
             # find the changing z position value
             if z_positions[z_device_ind] != z_value:
                 position_values.append(z_value)
 
         return position_values
 
+    @_memoize_metadata
     def get_metadata(self) -> DeepDict:
         metadata = super().get_metadata()
 
@@ -288,8 +266,8 @@ class BrukerTiffSinglePlaneImagingInterface(BaseImagingExtractorInterface):
             scan_line_rate=1 / float(xml_metadata["scanLinePeriod"]),
         )
 
-        streams = self.get_streams(folder_path=self.folder_path)
-        if len(streams["channel_streams"]) > 1 or len(streams["plane_streams"]):
+        bruker_xml = self._get_bruker_xml()
+        if len(bruker_xml.channel_names) > 1 or bruker_xml.is_volumetric:
             imaging_plane_name = f"ImagingPlane{self._stream_name}"
             imaging_plane_metadata.update(name=imaging_plane_name)
             two_photon_series_metadata.update(
@@ -307,7 +285,7 @@ class BrukerTiffSinglePlaneImagingInterface(BaseImagingExtractorInterface):
             x_position_in_meters * self._image_size[0],
         ]
 
-        if len(streams["plane_streams"]) and len(origin_coords) == 3:
+        if bruker_xml.is_volumetric and len(origin_coords) == 3:
             z_plane_current_position_in_meters = abs(origin_coords[-1]) / 1e6
             grid_spacing.append(z_plane_current_position_in_meters)
             field_of_view.append(z_plane_current_position_in_meters)
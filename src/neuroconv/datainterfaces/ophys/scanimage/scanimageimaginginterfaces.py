@@ -7,6 +7,7 @@ from dateutil.parser import parse as dateparse
 from pydantic import DirectoryPath, FilePath, validate_call
 
 from ..baseimagingextractorinterface import BaseImagingExtractorInterface
+from ....basedatainterface import _memoize_metadata
 
 
 class ScanImageImagingInterface(BaseImagingExtractorInterface):
@@ -138,6 +139,7 @@ class ScanImageLegacyImagingInterface(BaseImagingExtractorInterface):
         self.sampling_frequency = sampling_frequency
         super().__init__(file_path=file_path, fallback_sampling_frequency=fallback_sampling_frequency, verbose=verbose)
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         device_number = 0  # Imaging plane metadata is a list with metadata for each plane
 
@@ -303,6 +305,7 @@ class ScanImageMultiPlaneImagingInterface(BaseImagingExtractorInterface):
             verbose=verbose,
         )
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
 
@@ -420,6 +423,7 @@ class ScanImageMultiPlaneMultiFileImagingInterface(BaseImagingExtractorInterface
             verbose=verbose,
         )
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
 
@@ -547,6 +551,7 @@ class ScanImageSinglePlaneImagingInterface(BaseImagingExtractorInterface):
             verbose=verbose,
         )
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
 
@@ -676,6 +681,7 @@ class ScanImageSinglePlaneMultiFileImagingInterface(BaseImagingExtractorInterfac
             verbose=verbose,
         )
 
+    @_memoize_metadata
     def get_metadata(self) -> dict:
         metadata = super().get_metadata()
 
@@ -0,0 +1,216 @@
+import os
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from pydantic import DirectoryPath
+from tqdm import tqdm
+
+from ....tools import get_package
+from ....tools.hdmf import GenericDataChunkIterator
+
+# Silencing `tdt.read_block` swaps the global stdout, which is not safe from concurrent threads (e.g., when prefetching)
+_READ_BLOCK_LOCK = threading.Lock()
+
+
+def get_stream_info(headers, stream_name: str, t1: float = 0.0, t2: float = 0.0) -> dict:
+    """
+    Compute the sampling rate, starting time and extent of a stream stored in the TEV file from the block headers alone.
+
+    Mirrors the sample arithmetic of `tdt.read_block` so that no stream data has to be read.
+
+    Parameters
+    ----------
+    headers : tdt.StructType
+        The headers of the block, as returned by `tdt.read_block(folder_path, headers=1)`.
+    stream_name : str
+        The name of the stream.
+    t1 : float, optional
+        Retrieve data starting at t1 (in seconds), default = 0 for start of recording.
+    t2 : float, optional
+        Retrieve data ending at t2 (in seconds), default = 0 for end of recording.
+
+    Returns
+    -------
+    dict
+        With keys 'rate', 'starting_time' (as reported by `tdt.read_block`), 'first_sample' (the index of the first
+        sample since the start of the block), 'number_of_samples', 'number_of_channels' and 'dtype'.
+    """
+    tdt = get_package(package_name="tdt", installation_instructions="pip install tdt")
+    from tdt.TDTbin2py import time2sample
+
+    store = headers.stores[stream_name]
+    rate = store.fs
+    dtype = np.dtype(tdt.ALLOWED_FORMATS[store.dform])
+    samples_per_event = int((int(store.size) - 10) * 4 // dtype.itemsize)
+    number_of_channels = int(np.max(store.chan))
+    number_of_events = len(store.ts) // number_of_channels
+
+    # The data returned for the full block starts at the first event, even though its 'start_time' is reported as 0
+    first_event_time = time2sample(store.ts[0], fs=rate, to_time=True)
+    first_event_sample = int(time2sample(first_event_time, fs=rate, t1=True))
+    end_sample = first_event_sample + number_of_events * samples_per_event
+
+    first_sample = max(int(time2sample(t1, fs=rate, t1=True)), first_event_sample)
+    stop_sample = end_sample if t2 == 0.0 else min(int(time2sample(t2, fs=rate, t1=True)), end_sample)
+
+    return dict(
+        rate=rate,
+        starting_time=time2sample(t1, fs=rate, t1=True, to_time=True),
+        first_sample=first_sample,
+        number_of_samples=max(stop_sample - first_sample, 0),
+        number_of_channels=number_of_channels,
+        dtype=dtype,
+    )
+
+
+class TDTStreamDataChunkIterator(GenericDataChunkIterator):
+    """DataChunkIterator that reads a stream of a TDT block from the TEV file one time window at a time."""
+
+    def __init__(
+        self,
+        folder_path: DirectoryPath,
+        headers,
+        stream_name: str,
+        t1: float = 0.0,
+        t2: float = 0.0,
+        stream_indices: Optional[Union[int, list[int]]] = None,
+        transpose: bool = True,
+        buffer_gb: Optional[float] = None,
+        buffer_shape: Optional[tuple] = None,
+        chunk_mb: Optional[float] = None,
+        chunk_shape: Optional[tuple] = None,
+        display_progress: bool = False,
+        progress_bar_class: Optional[tqdm] = None,
+        progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
+    ):
+        """
+        Initialize an Iterable object which returns DataChunks with data and their selections on each iteration.
+
+        Parameters
+        ----------
+        folder_path : DirectoryPath
+            The path to the folder containing the TDT data.
+        headers : tdt.StructType
+            The headers of the block, as returned by `tdt.read_block(folder_path, headers=1)`.
+        stream_name : str
+            The name of the stream to iterate over.
+        t1 : float, optional
+            Retrieve data starting at t1 (in seconds), default = 0 for start of recording.
+        t2 : float, optional
+            Retrieve data ending at t2 (in seconds), default = 0 for end of recording.
+        stream_indices : int or list of int, optional
+            The channels of the stream to return.
+            A single index returns a one-dimensional series; a list returns the channels along the second axis.
+            The default returns all channels, with shape (channels, samples) if the stream has more than one.
+        transpose : bool, default: True
+            Whether a list of `stream_indices` is returned with shape (samples, channels), as for the
+            FiberPhotometryResponseSeries, when there are fewer channels than samples.
+            If False, the channels are kept along the first axis, as in the stream (e.g., for CommandedVoltageSeries).
+        buffer_gb : float, optional
+            The upper bound on size in gigabytes (GB) of each selection from the iteration.
+            The buffer_shape will be set implicitly by this argument.
+            Cannot be set if `buffer_shape` is also specified.
+            The default is 1GB.
+        buffer_shape : tuple, optional
+            Manual specification of buffer shape to return on each iteration.
+            Must be a multiple of chunk_shape along each axis.
+            Cannot be set if `buffer_gb` is also specified.
+            The default is None.
+        chunk_mb : float, optional
+            The upper bound on size in megabytes (MB) of the internal chunk for the HDF5 dataset.
+            The chunk_shape will be set implicitly by this argument.
+            Cannot be set if `chunk_shape` is also specified.
+            The default is 10MB, as recommended by the HDF5 group.
+            For more details, search the hdf5 documentation for "Improving IO Performance Compressed Datasets".
+        chunk_shape : tuple, optional
+            Manual specification of the internal chunk shape for the HDF5 dataset.
+            Cannot be set if `chunk_mb` is also specified.
+            The default is None.
+        display_progress : bool, optional
+            Display a progress bar with iteration rate and estimated completion time.
+        progress_bar_class : dict, optional
+            The progress bar class to use.
+            Defaults to tqdm.tqdm if the TQDM package is installed.
+        progress_bar_options : dict, optional
+            Dictionary of keyword arguments to be passed directly to tqdm.
+            See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
+        """
+        self.folder_path = Path(folder_path)
+        self.stream_name = stream_name
+        self.stream_indices = stream_indices
+
+        # Restrict the headers to this stream, otherwise `tdt.read_block` reads every stream of the block
+        tdt = get_package(package_name="tdt", installation_instructions="pip install tdt")
+        self._headers = tdt.StructType(
+            tev_path=headers.tev_path,
+            start_time=headers.start_time,
+            stop_time=headers.stop_time,
+            stores=tdt.StructType({stream_name: headers.stores[stream_name]}),
+        )
+        self._stream_info = get_stream_info(headers=headers, stream_name=stream_name, t1=t1, t2=t2)
+
+        number_of_samples = self._stream_info["number_of_samples"]
+        number_of_channels = self._stream_info["number_of_channels"]
+        if isinstance(stream_indices, int) or (stream_indices is None and number_of_channels == 1):
+            self._full_shape, self._time_axis = (number_of_samples,), 0
+        elif stream_indices is not None and transpose and len(stream_indices) < number_of_samples:
+            self._full_shape, self._time_axis = (number_of_samples, len(stream_indices)), 0
+        else:  # Kept as (channels, samples), as done for the loaded data
+            number_of_channels = len(stream_indices) if stream_indices is not None else number_of_channels
+            self._full_shape, self._time_axis = (number_of_channels, number_of_samples), 1
+
+        super().__init__(
+            buffer_gb=buffer_gb,
+            buffer_shape=buffer_shape,
+            chunk_mb=chunk_mb,
+            chunk_shape=chunk_shape,
+            display_progress=display_progress,
+            progress_bar_class=progress_bar_class,
+            progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
+        )
+
+    def _read_samples(self, start: int, stop: int) -> np.ndarray:
+        """Read samples [start, stop) of every channel of the stream, with shape (channels, samples)."""
+        tdt = get_package(package_name="tdt", installation_instructions="pip install tdt")
+        rate = self._stream_info["rate"]
+        first_sample = self._stream_info["first_sample"]
+
+        with _READ_BLOCK_LOCK, open(os.devnull, "w") as f, redirect_stdout(f):
+            block = tdt.read_block(
+                str(self.folder_path),
+                headers=self._headers,
+                evtype=["streams"],
+                t1=(first_sample + start) / rate,
+                t2=(first_sample + stop) / rate,
+            )
+        samples = np.atleast_2d(block.streams[self.stream_name].data)
+        return samples[:, : stop - start]
+
+    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
+        time_slice = selection[self._time_axis]
+        samples = self._read_samples(start=time_slice.start, stop=time_slice.stop)
+
+        if isinstance(self.stream_indices, int):
+            return samples[self.stream_indices]
+        if len(self._full_shape) == 1:
+            return samples[0]
+        if self.stream_indices is not None:
+            samples = samples[self.stream_indices, :]
+
+        if self._time_axis == 0:
+            return samples[selection[1], :].T
+        return samples[selection[0], :]
+
+    def _get_dtype(self) -> np.dtype:
+        return self._stream_info["dtype"]
+
+    def _get_maxshape(self) -> tuple:
+        return self._full_shape
@@ -1,4 +1,5 @@
 import os
+from collections import OrderedDict
 from contextlib import redirect_stdout
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +14,9 @@ from neuroconv.basetemporalalignmentinterface import BaseTemporalAlignmentInterf
 from neuroconv.tools import get_package
 from neuroconv.tools.fiber_photometry import add_fiber_photometry_device
 from neuroconv.utils import DeepDict
+from neuroconv.utils.cache import cache_on_disk
+
+from .tdt_fp_utils import TDTStreamDataChunkIterator, get_stream_info
 
 
 class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
@@ -27,6 +31,8 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
     display_name = "TDTFiberPhotometry"
     info = "Data Interface for converting fiber photometry data from TDT files."
     associated_suffixes = ("Tbk", "Tdx", "tev", "tin", "tsq")
+    # The maximum total size of the blocks returned by `load` that are kept in memory to be reused by later calls
+    max_block_cache_gb: float = 1.0
 
     @validate_call
     def __init__(self, folder_path: DirectoryPath, verbose: bool = True):
@@ -45,14 +51,22 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         )
         import ndx_fiber_photometry  # noqa: F401
 
+        self._headers = None
+        self._sev_stream_names = None
+        self._block_cache = OrderedDict()
+
     def get_metadata(self) -> DeepDict:
         metadata = super().get_metadata()
-        tdt_photometry = self.load(evtype=["scalars"])  # This evtype quickly loads info without loading all the data.
-        start_timestamp = tdt_photometry.info.start_date.timestamp()
+        start_timestamp = self._get_start_timestamp()
         session_start_datetime = datetime.fromtimestamp(start_timestamp, tz=pytz.utc)
         metadata["NWBFile"]["session_start_time"] = session_start_datetime.isoformat()
         return metadata
 
+    @cache_on_disk
+    def _get_start_timestamp(self) -> float:
+        tdt_photometry = self.load(evtype=["scalars"])  # This evtype quickly loads info without loading all the data.
+        return tdt_photometry.info.start_date.timestamp()
+
     def get_metadata_schema(self) -> dict:
         metadata_schema = super().get_metadata_schema()
         return metadata_schema
@@ -61,6 +75,9 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         """
         Load the TDT data from the folder path.
 
+        The headers of the block are parsed once and reused by every call, and the most recently loaded blocks are
+        kept in memory (up to `max_block_cache_gb`), so the returned object may be shared and should not be modified.
+
         Parameters
         ----------
         t1 : float, optional
@@ -84,10 +101,98 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
                 f"evtype must be a list containing some combination of 'all', 'epocs', 'snips', 'streams', or 'scalars', "
                 f"but got {evtype_string}."
             )
+
+        all_evtypes = {"epocs", "snips", "streams", "scalars"}
+        requested_evtypes = all_evtypes if "all" in evtype else set(evtype)
+        for (cached_t1, cached_t2, cached_evtypes), tdt_photometry in self._block_cache.items():
+            if cached_t1 == t1 and cached_t2 == t2 and requested_evtypes <= cached_evtypes:
+                self._block_cache.move_to_end((cached_t1, cached_t2, cached_evtypes))
+                return tdt_photometry
+
+        headers = self._get_headers()
         with open(os.devnull, "w") as f, redirect_stdout(f):
-            tdt_photometry = tdt.read_block(str(folder_path), t1=t1, t2=t2, evtype=evtype)
+            tdt_photometry = tdt.read_block(str(folder_path), t1=t1, t2=t2, evtype=evtype, headers=headers)
+        self._add_block_to_cache(key=(t1, t2, frozenset(requested_evtypes)), tdt_photometry=tdt_photometry)
         return tdt_photometry
 
+    def _get_headers(self):
+        """Parse the headers of the block (the TSQ file) once, so that later reads only touch the requested data."""
+        if self._headers is None:
+            tdt = get_package("tdt", installation_instructions="pip install tdt")
+            folder_path = str(self.source_data["folder_path"])
+            with open(os.devnull, "w") as f, redirect_stdout(f):
+                self._headers = tdt.read_block(folder_path, headers=1)
+                self._sev_stream_names = tdt.read_sev(folder_path, just_names=True)
+        return self._headers
+
+    def _add_block_to_cache(self, key: tuple, tdt_photometry) -> None:
+        def get_block_size(block) -> int:
+            size = 0
+            for evtype in ["streams", "snips"]:
+                for _, store in block[evtype].items():
+                    size += getattr(getattr(store, "data", None), "nbytes", 0)
+            return size
+
+        max_size = self.max_block_cache_gb * 1e9
+        if get_block_size(tdt_photometry) > max_size:
+            return
+
+        self._block_cache[key] = tdt_photometry
+        while sum(get_block_size(block) for block in self._block_cache.values()) > max_size:
+            self._block_cache.popitem(last=False)
+
+    def _get_stream_name_to_info(self, t1: float = 0.0, t2: float = 0.0) -> dict[str, dict]:
+        """
+        Get the rate, starting time and number of samples of each stream from the headers, without reading its data.
+
+        Streams saved in SEV files cannot be described from the headers, so the data of the block is loaded for those.
+        """
+        headers = self._get_headers()
+        stream_names = [name for name, store in headers.stores.items() if store.type_str == "streams"]
+
+        stream_name_to_info = dict()
+        for stream_name in stream_names:
+            if stream_name in self._sev_stream_names:
+                stream = self.load(t1=t1, t2=t2).streams[stream_name]
+                stream_name_to_info[stream_name] = dict(
+                    rate=stream.fs, starting_time=stream.start_time, number_of_samples=stream.data.shape[-1]
+                )
+            else:
+                stream_name_to_info[stream_name] = get_stream_info(
+                    headers=headers, stream_name=stream_name, t1=t1, t2=t2
+                )
+        return stream_name_to_info
+
+    def _get_stream_data(
+        self, stream_name: str, t1: float = 0.0, t2: float = 0.0, stream_indices=None, transpose: bool = True
+    ):
+        """
+        Get the data of a stream as an iterator over the TEV file, or as the loaded array for SEV streams.
+
+        A list of `stream_indices` is transposed to (samples, channels) when there are fewer channels than samples,
+        unless `transpose` is False.
+        """
+        self._get_headers()
+        if stream_name not in self._sev_stream_names:
+            return TDTStreamDataChunkIterator(
+                folder_path=self.source_data["folder_path"],
+                headers=self._headers,
+                stream_name=stream_name,
+                t1=t1,
+                t2=t2,
+                stream_indices=stream_indices,
+                transpose=transpose,
+            )
+
+        data = self.load(t1=t1, t2=t2).streams[stream_name].data
+        if stream_indices is not None:
+            data = data[stream_indices, :]
+            # Transpose the data if it is in the wrong shape
+            if transpose and data.ndim == 2 and data.shape[0] < data.shape[1]:
+                data = data.T
+        return data
+
+    @cache_on_disk
     def get_original_timestamps(self, t1: float = 0.0, t2: float = 0.0) -> dict[str, np.ndarray]:
         """
         Get the original timestamps for the data.
@@ -104,12 +209,12 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         dict[str, np.ndarray]
             Dictionary of stream names to timestamps.
         """
-        tdt_photometry = self.load(t1=t1, t2=t2)
+        stream_name_to_info = self._get_stream_name_to_info(t1=t1, t2=t2)
         stream_name_to_timestamps = {}
-        for stream_name in tdt_photometry.streams.keys():
-            rate = tdt_photometry.streams[stream_name].fs
+        for stream_name, stream_info in stream_name_to_info.items():
+            rate = stream_info["rate"]
             starting_time = 0.0
-            timestamps = np.arange(starting_time, tdt_photometry.streams[stream_name].data.shape[-1] / rate, 1 / rate)
+            timestamps = np.arange(starting_time, stream_info["number_of_samples"] / rate, 1 / rate)
             stream_name_to_timestamps[stream_name] = timestamps
         return stream_name_to_timestamps
 
@@ -170,6 +275,7 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         }
         self.set_aligned_timestamps(aligned_stream_name_to_timestamps)
 
+    @cache_on_disk
     def get_original_starting_time_and_rate(self, t1: float = 0.0, t2: float = 0.0) -> dict[str, tuple[float, float]]:
         """
         Get the original starting time and rate for the data.
@@ -186,11 +292,11 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         dict[str, tuple[float, float]]
             Dictionary of stream names to starting time and rate.
         """
-        tdt_photometry = self.load(t1=t1, t2=t2)
+        stream_name_to_info = self._get_stream_name_to_info(t1=t1, t2=t2)
         stream_name_to_starting_time_and_rate = {}
-        for stream_name in tdt_photometry.streams.keys():
-            rate = tdt_photometry.streams[stream_name].fs
-            starting_time = tdt_photometry.streams[stream_name].start_time
+        for stream_name, stream_info in stream_name_to_info.items():
+            rate = stream_info["rate"]
+            starting_time = stream_info["starting_time"]
             stream_name_to_starting_time_and_rate[stream_name] = (starting_time, rate)
         return stream_name_to_starting_time_and_rate
 
@@ -288,8 +394,8 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
             FiberPhotometryTable,
         )
 
-        # Load Data
-        tdt_photometry = self.load(t1=t1, t2=t2)
+        # The stream data is read lazily, so only the rates and starting times are needed up front
+        stream_name_to_info = self._get_stream_name_to_info(t1=t1, t2=t2)
 
         # timing_source is used to avoid loading the data twice if alignment is NOT used.
         # It is also used to determine whether or not to use the aligned timestamps or starting time and rate.
@@ -324,10 +430,13 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
         # Commanded Voltage Series
         for commanded_voltage_series_metadata in metadata["Ophys"]["FiberPhotometry"].get("CommandedVoltageSeries", []):
             index = commanded_voltage_series_metadata["index"]
-            if index is None:
-                data = tdt_photometry.streams[commanded_voltage_series_metadata["stream_name"]].data
-            else:
-                data = tdt_photometry.streams[commanded_voltage_series_metadata["stream_name"]].data[index, :]
+            data = self._get_stream_data(
+                stream_name=commanded_voltage_series_metadata["stream_name"],
+                t1=t1,
+                t2=t2,
+                stream_indices=index,
+                transpose=False,
+            )
             if timing_source == "aligned_timestamps":
                 timestamps = stream_name_to_timestamps[commanded_voltage_series_metadata["stream_name"]]
                 timing_kwargs = dict(timestamps=timestamps)
@@ -338,7 +447,7 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
                 timing_kwargs = dict(starting_time=starting_time, rate=rate)
             else:
                 starting_time = 0.0
-                rate = tdt_photometry.streams[commanded_voltage_series_metadata["stream_name"]].fs
+                rate = stream_name_to_info[commanded_voltage_series_metadata["stream_name"]]["rate"]
                 timing_kwargs = dict(starting_time=starting_time, rate=rate)
             commanded_voltage_series = CommandedVoltageSeries(
                 name=commanded_voltage_series_metadata["name"],
@@ -404,17 +513,12 @@ class TDTFiberPhotometryInterface(BaseTemporalAlignmentInterface):
                 starting_time, rate = stream_name_to_starting_time_and_rate[stream_name]
                 timing_kwargs = dict(starting_time=starting_time, rate=rate)
             else:
-                rate = tdt_photometry.streams[stream_name].fs
-                starting_time = tdt_photometry.streams[stream_name].start_time
+                rate = stream_name_to_info[stream_name]["rate"]
+                starting_time = stream_name_to_info[stream_name]["starting_time"]
                 timing_kwargs = dict(starting_time=starting_time, rate=rate)
 
             # Get the data
-            data = tdt_photometry.streams[stream_name].data
-            if stream_indices is not None:
-                data = tdt_photometry.streams[stream_name].data[stream_indices, :]
-                # Transpose the data if it is in the wrong shape
-                if data.shape[0] < data.shape[1]:
-                    data = data.T
+            data = self._get_stream_data(stream_name=stream_name, t1=t1, t2=t2, stream_indices=stream_indices)
 
             fiber_photometry_table_region = fiber_photometry_table.create_fiber_photometry_table_region(
                 description=fiber_photometry_response_series_metadata["fiber_photometry_table_region_description"],
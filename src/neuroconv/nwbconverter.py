@@ -3,6 +3,7 @@
 import json
 import warnings
 from collections import Counter
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Literal, Optional, Union
 
@@ -11,6 +12,7 @@ from pydantic import FilePath, validate_call
 from pynwb import NWBFile
 
 from .basedatainterface import BaseDataInterface
+from .tools.hdmf import DataChunkPrefetcher
 from .tools.nwb_helpers import (
     HDF5BackendConfiguration,
     ZarrBackendConfiguration,
@@ -20,7 +22,13 @@ from .tools.nwb_helpers import (
     make_nwbfile_from_metadata,
     make_or_load_nwbfile,
 )
+from .tools.nwb_helpers._chunk_planner import (
+    _check_memory_budget,
+    _fit_buffers_into_memory_budget,
+)
+from .tools.nwb_helpers._dataset_configuration import _get_data_chunk_iterators
 from .tools.nwb_helpers._metadata_and_file_helpers import _resolve_backend
+from .tools.profiling import ConversionProfiler, _profile_stage
 from .utils import (
     dict_deep_update,
     fill_defaults,
@@ -42,6 +50,9 @@ class NWBConverter:
 
     data_interface_classes = None
 
+    # Set for the duration of `run_conversion` when a `ConversionProfiler` is specified
+    _profiler: Optional[ConversionProfiler] = None
+
     @classmethod
     def get_source_schema(cls) -> dict:
         """Compile input schemas from each of the data interface classes."""
@@ -89,7 +100,7 @@ class NWBConverter:
         metadata_schema = load_dict_from_file(Path(__file__).parent / "schemas" / "base_metadata_schema.json")
         for data_interface in self.data_interface_objects.values():
             interface_schema = unroot_schema(data_interface.get_metadata_schema())
-            metadata_schema = dict_deep_update(metadata_schema, interface_schema)
+            metadata_schema = dict_deep_update(metadata_schema, interface_schema, copy=False)
 
         default_values = self.get_metadata()
         fill_defaults(metadata_schema, default_values)
@@ -100,7 +111,7 @@ class NWBConverter:
         metadata = get_default_nwbfile_metadata()
         for interface in self.data_interface_objects.values():
             interface_metadata = interface.get_metadata()
-            metadata = dict_deep_update(metadata, interface_metadata)
+            metadata = dict_deep_update(metadata, interface_metadata, copy=False)
         return metadata
 
     def validate_metadata(self, metadata: dict[str, dict], append_mode: bool = False):
@@ -169,9 +180,12 @@ class NWBConverter:
     def add_to_nwbfile(self, nwbfile: NWBFile, metadata, conversion_options: Optional[dict] = None) -> None:
         conversion_options = conversion_options or dict()
         for interface_name, data_interface in self.data_interface_objects.items():
-            data_interface.add_to_nwbfile(
-                nwbfile=nwbfile, metadata=metadata, **conversion_options.get(interface_name, dict())
-            )
+            with _profile_stage(
+                profiler=self._profiler, name="add_to_nwbfile", interface_name=interface_name, nwbfile=nwbfile
+            ):
+                data_interface.add_to_nwbfile(
+                    nwbfile=nwbfile, metadata=metadata, **conversion_options.get(interface_name, dict())
+                )
 
     def run_conversion(
         self,
@@ -179,12 +193,13 @@ class NWBConverter:
         nwbfile: Optional[NWBFile] = None,
         metadata: Optional[dict] = None,
         overwrite: bool = False,
-        # TODO: when all H5DataIO prewraps are gone, introduce Zarr safely
-        # backend: Union[Literal["hdf5", "zarr"]],
-        # backend_configuration: Optional[Union[HDF5BackendConfiguration, ZarrBackendConfiguration]] = None,
-        backend: Optional[Literal["hdf5"]] = None,
-        backend_configuration: Optional[HDF5BackendConfiguration] = None,
+        backend: Optional[Literal["hdf5", "zarr"]] = None,
+        backend_configuration: Optional[Union[HDF5BackendConfiguration, ZarrBackendConfiguration]] = None,
         conversion_options: Optional[dict] = None,
+        number_of_prefetch_jobs: Optional[int] = None,
+        max_prefetch_gb: float = 2.0,
+        memory_budget_gb: Optional[float] = None,
+        profiler: Optional[ConversionProfiler] = None,
     ) -> None:
         """
         Run the NWB conversion over all the instantiated data interfaces.
@@ -201,11 +216,11 @@ class NWBConverter:
         overwrite : bool, default: False
             Whether to overwrite the NWBFile if one exists at the nwbfile_path.
             The default is False (append mode).
-        backend : "hdf5", optional
+        backend : {"hdf5", "zarr"}, optional
             The type of backend to use when writing the file.
             If a `backend_configuration` is not specified, the default type will be "hdf5".
             If a `backend_configuration` is specified, then the type will be auto-detected.
-        backend_configuration : HDF5BackendConfiguration, optional
+        backend_configuration : HDF5BackendConfiguration or ZarrBackendConfiguration, optional
             The configuration model to use when configuring the datasets for this backend.
             To customize, call the `.get_default_backend_configuration(...)` method, modify the returned
             BackendConfiguration object, and pass that instead.
@@ -213,6 +228,22 @@ class NWBConverter:
         conversion_options : dict, optional
             Similar to source_data, a dictionary containing keywords for each interface for which non-default
             conversion specification is requested.
+        number_of_prefetch_jobs : int, optional
+            If specified, the buffers of all data chunk iterators in the file are read ahead of the writer, concurrently
+            across iterators, using this many worker threads. Negative values, starting from -1, will use all the
+            available CPUs (including logical), -2 is all except one, etc.
+            The default (None) reads each buffer only when the writer requests it.
+        max_prefetch_gb : float, default: 2.0
+            The upper bound in gigabytes (GB) on the total size of buffers held in memory ahead of the writer.
+            Only used if `number_of_prefetch_jobs` is specified.
+        memory_budget_gb : float, optional
+            The upper bound in gigabytes (GB) on the total size of the buffers of all data chunk iterators in the file.
+            If specified, it is divided evenly among these iterators and their buffer shapes (including those of a
+            given `backend_configuration`, which is modified in place) are reduced to fit their share; it also bounds
+            `max_prefetch_gb`. A budget that exceeds the memory available on the machine is reduced to it.
+        profiler : ConversionProfiler, optional
+            If specified, records the time and memory of each stage of the conversion, and the reads and writes of each
+            dataset, then emits its report once the file is written.
         """
 
         if nwbfile_path is None:
@@ -229,28 +260,65 @@ class NWBConverter:
         append_mode = file_initially_exists and not overwrite
 
         if metadata is None:
-            metadata = self.get_metadata()
-
-        self.validate_metadata(metadata=metadata, append_mode=append_mode)
-        self.validate_conversion_options(conversion_options=conversion_options)
-
-        self.temporally_align_data_interfaces()
-
-        with make_or_load_nwbfile(
-            nwbfile_path=nwbfile_path,
-            nwbfile=nwbfile,
-            metadata=metadata,
-            overwrite=overwrite,
-            backend=backend,
-            verbose=getattr(self, "verbose", False),
-        ) as nwbfile_out:
-            if no_nwbfile_provided:
-                self.add_to_nwbfile(nwbfile=nwbfile_out, metadata=metadata, conversion_options=conversion_options)
-
-            if backend_configuration is None:
-                backend_configuration = self.get_default_backend_configuration(nwbfile=nwbfile_out, backend=backend)
-
-            configure_backend(nwbfile=nwbfile_out, backend_configuration=backend_configuration)
+            with _profile_stage(profiler=profiler, name="get_metadata"):
+                metadata = self.get_metadata()
+
+        with _profile_stage(profiler=profiler, name="validate_metadata"):
+            self.validate_metadata(metadata=metadata, append_mode=append_mode)
+            self.validate_conversion_options(conversion_options=conversion_options)
+
+        with _profile_stage(profiler=profiler, name="temporally_align_data_interfaces"):
+            self.temporally_align_data_interfaces()
+
+        if memory_budget_gb is not None:
+            memory_budget_gb = _check_memory_budget(memory_budget_gb=memory_budget_gb)
+            max_prefetch_gb = min(max_prefetch_gb, memory_budget_gb)
+
+        # The prefetcher must outlive the context below, since the file is only written when that context exits
+        prefetch_data_chunks = number_of_prefetch_jobs is not None
+        prefetcher = (
+            DataChunkPrefetcher(number_of_jobs=number_of_prefetch_jobs, max_prefetch_gb=max_prefetch_gb)
+            if prefetch_data_chunks
+            else nullcontext()
+        )
+        self._profiler = profiler  # Lets `add_to_nwbfile` record the stage of each interface
+        try:
+            with prefetcher, make_or_load_nwbfile(
+                nwbfile_path=nwbfile_path,
+                nwbfile=nwbfile,
+                metadata=metadata,
+                overwrite=overwrite,
+                backend=backend,
+                verbose=getattr(self, "verbose", False),
+                profiler=profiler,
+            ) as nwbfile_out:
+                if no_nwbfile_provided:
+                    self.add_to_nwbfile(nwbfile=nwbfile_out, metadata=metadata, conversion_options=conversion_options)
+
+                if backend_configuration is None:
+                    with _profile_stage(profiler=profiler, name="get_default_backend_configuration"):
+                        backend_configuration = self.get_default_backend_configuration(
+                            nwbfile=nwbfile_out, backend=backend
+                        )
+                if memory_budget_gb is not None:
+                    _fit_buffers_into_memory_budget(
+                        backend_configuration=backend_configuration,
+                        nwbfile=nwbfile_out,
+                        memory_budget_gb=memory_budget_gb,
+                    )
+
+                with _profile_stage(profiler=profiler, name="configure_backend"):
+                    configure_backend(nwbfile=nwbfile_out, backend_configuration=backend_configuration)
+
+                if profiler is not None:
+                    profiler.profile_datasets(nwbfile=nwbfile_out, backend_configuration=backend_configuration)
+                if prefetch_data_chunks:
+                    prefetcher.register(iterators=_get_data_chunk_iterators(nwbfile=nwbfile_out))
+        finally:
+            self._profiler = None
+
+        if profiler is not None:
+            profiler.finalize(nwbfile_path=nwbfile_path, backend=backend)
 
     def temporally_align_data_interfaces(self):
         """Override this method to implement custom alignment."""
@@ -260,6 +328,9 @@ class NWBConverter:
     def get_default_backend_configuration(
         nwbfile: NWBFile,
         backend: Literal["hdf5", "zarr"] = "hdf5",
+        access_pattern: Union[Literal["time", "channel", "frame"], dict[str, str], None] = None,
+        storage_profile: Optional[Literal["local_ssd", "network_filesystem", "object_store"]] = None,
+        available_memory_gb: Optional[float] = None,
     ) -> Union[HDF5BackendConfiguration, ZarrBackendConfiguration]:
         """
         Fill and return a default backend configuration to serve as a starting point for further customization.
@@ -270,13 +341,27 @@ class NWBConverter:
             The in-memory object with this interface's data already added to it.
         backend : "hdf5" or "zarr", default: "hdf5"
             The type of backend to use when creating the file.
+        access_pattern : "time", "channel" or "frame", or a dictionary of them, optional
+            How the datasets will most often be read, either for all datasets or by location in the file.
+            If specified, the chunk and buffer shapes of each dataset are planned for this access pattern.
+        storage_profile : "local_ssd", "network_filesystem" or "object_store", optional
+            Where the file will be read from. If specified, the chunk and buffer shapes of each dataset are planned
+            for this storage.
+        available_memory_gb : float, optional
+            The memory available to the conversion, which bounds the planned buffer shapes.
 
         Returns
         -------
         backend_configuration : HDF5BackendConfiguration or ZarrBackendConfiguration
             The default configuration for the specified backend type.
         """
-        return get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+        return get_default_backend_configuration(
+            nwbfile=nwbfile,
+            backend=backend,
+            access_pattern=access_pattern,
+            storage_profile=storage_profile,
+            available_memory_gb=available_memory_gb,
+        )
 
 
 class ConverterPipe(NWBConverter):
@@ -1,15 +1,155 @@
 """Collection of modifications of HDMF functions that are to be tested/used on this repo until propagation upstream."""
 
+import inspect
+import itertools
 import math
+import threading
 import warnings
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
 
+import h5py
 import numpy as np
+import psutil
+from hdmf.backends.hdf5 import H5DataIO
+from hdmf.data_utils import DataChunk
 from hdmf.data_utils import GenericDataChunkIterator as HDMFGenericDataChunkIterator
 
 
 class GenericDataChunkIterator(HDMFGenericDataChunkIterator):  # noqa: D101
     # TODO Should this be added to the API?
 
+    # Set by a `DataChunkPrefetcher` when the buffers of this iterator are being read ahead of the writer
+    _prefetcher: Optional["DataChunkPrefetcher"] = None
+    _owns_prefetcher: bool = False
+
+    # Set by a `ConversionProfiler` when the reads and writes of this iterator are being timed
+    _profile = None
+
+    # Set by `configure_backend` from the `number_of_jobs` of a Zarr backend configuration
+    _zarr_number_of_jobs: int = 1
+
+    def __init__(
+        self,
+        buffer_gb: Optional[float] = None,
+        buffer_shape: Optional[tuple] = None,
+        chunk_mb: Optional[float] = None,
+        chunk_shape: Optional[tuple] = None,
+        display_progress: bool = False,
+        progress_bar_class: Optional[Callable] = None,
+        progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
+    ):
+        """
+        Break a dataset into buffers containing multiple chunks to be written into an HDF5 dataset.
+
+        See `hdmf.data_utils.GenericDataChunkIterator` for a description of the shape and progress bar arguments.
+
+        Parameters
+        ----------
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
+            The default of zero reads each buffer only when it is requested.
+        """
+        assert prefetch_buffers >= 0, f"prefetch_buffers ({prefetch_buffers}) must be greater than or equal to zero!"
+        self.prefetch_buffers = prefetch_buffers
+
+        super().__init__(
+            buffer_gb=buffer_gb,
+            buffer_shape=buffer_shape,
+            chunk_mb=chunk_mb,
+            chunk_shape=chunk_shape,
+            display_progress=display_progress,
+            progress_bar_class=progress_bar_class,
+            progress_bar_options=progress_bar_options,
+        )
+
+    def __next__(self) -> DataChunk:
+        if self._profile is not None:
+            return self._profile.get_next_data_chunk(iterator=self)
+
+        return self._get_next_data_chunk()
+
+    def _get_next_data_chunk(self) -> DataChunk:
+        if self._prefetcher is None and self.prefetch_buffers > 0:
+            self._start_prefetching()
+
+        if self._prefetcher is None:
+            return super().__next__()
+
+        try:
+            data_chunk = self._prefetcher.get_next_data_chunk(iterator=self)
+        except StopIteration:
+            self.close()
+
+            # Allow text to be written to new lines after completion
+            if self.display_progress:
+                self.progress_bar.write("\n")
+            raise StopIteration
+        except BaseException:
+            self.close()
+            raise
+
+        if self.display_progress:
+            self.progress_bar.update(n=1)
+
+        return data_chunk
+
+    def close(self) -> None:
+        """
+        Stop the reads ahead of the writer started by this iterator, if any.
+
+        Called once the iterator is exhausted or fails; call it when an iterator is not iterated to the end.
+        """
+        if self._owns_prefetcher:
+            self._prefetcher.close()
+            self._owns_prefetcher = False
+
+    def _start_prefetching(self) -> None:
+        """Read ahead on a single background thread, holding at most `prefetch_buffers` full buffers in memory."""
+        buffer_bytes = math.prod(self.buffer_shape) * self.dtype.itemsize
+        prefetcher = DataChunkPrefetcher(number_of_jobs=1, max_prefetch_gb=self.prefetch_buffers * buffer_bytes / 1e9)
+        try:
+            prefetcher.register(iterators=[self])
+        except BaseException:
+            prefetcher.close()
+            raise
+        self._owns_prefetcher = True
+
+    def _set_shapes(self, chunk_shape: tuple[int, ...], buffer_shape: tuple[int, ...]) -> bool:
+        """
+        Change the chunk and buffer shapes of an iterator that has not returned any buffer yet.
+
+        Returns False, leaving the iterator as it is, if the iteration has already started.
+        """
+        if inspect.getgeneratorstate(self.buffer_selection_generator) != inspect.GEN_CREATED:
+            return False
+
+        self.chunk_shape = tuple(int(axis_length) for axis_length in chunk_shape)
+        self.buffer_shape = tuple(int(axis_length) for axis_length in buffer_shape)
+        axis_shapes = list(zip(self.buffer_shape, self.maxshape))
+        self.num_buffers = math.prod(
+            math.ceil(maxshape_axis / buffer_axis) for buffer_axis, maxshape_axis in axis_shapes
+        )
+
+        # Same order of buffers as `hdmf.data_utils.GenericDataChunkIterator`, with the first axis outermost
+        axis_starts = (range(0, maxshape_axis, buffer_axis) for buffer_axis, maxshape_axis in axis_shapes)
+        self.buffer_selection_generator = (
+            tuple(
+                slice(start, min(start + buffer_axis, maxshape_axis))
+                for start, (buffer_axis, maxshape_axis) in zip(starts, axis_shapes)
+            )
+            for starts in itertools.product(*axis_starts)
+        )
+        if self.display_progress:
+            self.progress_bar.total = self.num_buffers
+            self.progress_bar.refresh()
+
+        return True
+
     def _get_default_buffer_shape(self, buffer_gb: float = 1.0) -> tuple[int]:
         return self.estimate_default_buffer_shape(
             buffer_gb=buffer_gb, chunk_shape=self.chunk_shape, maxshape=self.maxshape, dtype=self.dtype
@@ -151,4 +291,324 @@ class SliceableDataChunkIterator(GenericDataChunkIterator):
         return self.data.shape
 
     def _get_data(self, selection: tuple[slice]) -> np.ndarray:
-        return self.data[selection]
+        data = self.data[selection]
+
+        # Memory maps are only read from disk on access; ensure that happens on the thread prefetching the buffer
+        if self._prefetcher is not None and isinstance(data, np.memmap):
+            return np.array(data)
+
+        return data
+
+
+class _PrefetchLane:
+    """The queue of scheduled and pending buffer reads for a single iterator."""
+
+    def __init__(self, iterator: GenericDataChunkIterator):
+        self.iterator = iterator
+        self.buffer_bytes_per_element = iterator.dtype.itemsize
+        self.next_selection = next(iterator.buffer_selection_generator, None)
+        self.pending = deque()  # (selection, number of bytes, future) in the order the writer will request them
+        self.to_read = deque()  # (selection, future) not yet picked up by a worker
+        self.is_reading = False
+
+    def get_buffer_bytes(self, selection: tuple[slice, ...]) -> int:
+        return math.prod(axis.stop - axis.start for axis in selection) * self.buffer_bytes_per_element
+
+
+class DataChunkPrefetcher:
+    """
+    Read the buffers of one or more GenericDataChunkIterators ahead of the writer on a pool of worker threads.
+
+    Reads from different iterators run concurrently, but reads from the same iterator are always performed one at a
+    time and in order, since many sources (video decoders in particular) are not safe to access from several threads.
+
+    The total size of the buffers that have been scheduled but not yet consumed by the writer is bounded by
+    `max_prefetch_gb`. The buffer the writer is currently waiting on is always read, even if doing so would exceed it.
+    """
+
+    def __init__(self, number_of_jobs: int = -1, max_prefetch_gb: float = 2.0):
+        """
+        Parameters
+        ----------
+        number_of_jobs : int, default: -1
+            Number of worker threads used to read buffers. Negative values, starting from -1, will use all the
+            available CPUs (including logical), -2 is all except one, etc.
+        max_prefetch_gb : float, default: 2.0
+            The upper bound in gigabytes (GB) on the total size of all buffers held in memory ahead of the writer.
+        """
+        assert max_prefetch_gb > 0, f"max_prefetch_gb ({max_prefetch_gb}) must be greater than zero!"
+
+        self.number_of_jobs = _resolve_number_of_jobs(number_of_jobs=number_of_jobs)
+        self.max_prefetch_bytes = max_prefetch_gb * 1e9
+
+        self._executor = ThreadPoolExecutor(max_workers=self.number_of_jobs, thread_name_prefix="neuroconv_prefetch")
+        self._lock = threading.Lock()
+        self._lanes: dict[int, _PrefetchLane] = dict()
+        self._active_lane: Optional[_PrefetchLane] = None
+        self._prefetched_bytes = 0
+
+    def __enter__(self) -> "DataChunkPrefetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def register(self, iterators: Iterable[GenericDataChunkIterator]) -> None:
+        """Take over the buffer iteration of each iterator and immediately start reading ahead."""
+        with self._lock:
+            for iterator in iterators:
+                if id(iterator) in self._lanes:
+                    continue
+                assert (
+                    iterator._prefetcher is None
+                ), f"The iterator {iterator} is already registered with another prefetcher!"
+
+                iterator._prefetcher = self
+                self._lanes[id(iterator)] = _PrefetchLane(iterator=iterator)
+
+            self._schedule()
+
+    def get_next_data_chunk(self, iterator: GenericDataChunkIterator) -> DataChunk:
+        """Retrieve the next buffer of the iterator, blocking until it has been read."""
+        with self._lock:
+            lane = self._lanes[id(iterator)]
+            self._active_lane = lane
+
+            # The writer is waiting on this buffer, so it is read regardless of the memory bound
+            if not lane.pending and not self._submit_next_read(lane=lane):
+                raise StopIteration
+            selection, buffer_bytes, future = lane.pending.popleft()
+            self._schedule()
+
+        try:
+            data = future.result()
+        finally:
+            with self._lock:
+                self._prefetched_bytes -= buffer_bytes
+                self._schedule()
+
+        return DataChunk(data=data, selection=selection)
+
+    def close(self) -> None:
+        """Cancel all reads that have not yet started and release the worker threads."""
+        with self._lock:
+            for lane in self._lanes.values():
+                for _, future in lane.to_read:
+                    future.cancel()
+                lane.to_read.clear()
+                lane.iterator._prefetcher = None
+            self._lanes.clear()
+            self._active_lane = None
+
+        self._executor.shutdown(wait=True)
+
+    def _schedule(self) -> None:
+        """Submit reads until the memory bound is reached; must be called while holding the lock."""
+        while True:
+            lane = self._select_lane()
+            if lane is None:
+                return
+
+            buffer_bytes = lane.get_buffer_bytes(selection=lane.next_selection)
+            if self._prefetched_bytes + buffer_bytes > self.max_prefetch_bytes:
+                return
+
+            self._submit_next_read(lane=lane)
+
+    def _select_lane(self) -> Optional[_PrefetchLane]:
+        """Prioritize the iterator the writer is consuming, then spread reads evenly over all others."""
+        active_lane = self._active_lane
+        if active_lane is not None and active_lane.next_selection is not None and len(active_lane.pending) < 2:
+            return active_lane
+
+        candidate_lanes = [lane for lane in self._lanes.values() if lane.next_selection is not None]
+        if not candidate_lanes:
+            return None
+
+        return min(candidate_lanes, key=lambda lane: len(lane.pending))
+
+    def _submit_next_read(self, lane: _PrefetchLane) -> bool:
+        """Schedule the read of the next buffer of the lane; must be called while holding the lock."""
+        selection = lane.next_selection
+        if selection is None:
+            return False
+        lane.next_selection = next(lane.iterator.buffer_selection_generator, None)
+
+        future = Future()
+        buffer_bytes = lane.get_buffer_bytes(selection=selection)
+        lane.pending.append((selection, buffer_bytes, future))
+        lane.to_read.append((selection, future))
+        self._prefetched_bytes += buffer_bytes
+
+        if not lane.is_reading:
+            lane.is_reading = True
+            self._executor.submit(self._read_from_lane, lane)
+
+        return True
+
+    def _read_from_lane(self, lane: _PrefetchLane) -> None:
+        """Read a single buffer, then requeue the lane so that workers are shared fairly across iterators."""
+        with self._lock:
+            if not lane.to_read:
+                lane.is_reading = False
+                return
+            selection, future = lane.to_read.popleft()
+
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(lane.iterator._get_data(selection=selection))
+            except BaseException as exception:
+                future.set_exception(exception)
+
+        with self._lock:
+            if lane.to_read:
+                self._executor.submit(self._read_from_lane, lane)
+            else:
+                lane.is_reading = False
+
+
+def _resolve_number_of_jobs(number_of_jobs: int) -> int:
+    """Follow the indexing pattern of `list(range(total_number_of_cpu))[number_of_jobs]` for negative values."""
+    total_number_of_cpu = psutil.cpu_count()
+    assert number_of_jobs != 0, "number_of_jobs cannot be zero!"
+
+    if number_of_jobs < 0:
+        return max(total_number_of_cpu + 1 + number_of_jobs, 1)
+
+    return number_of_jobs
+
+
+# The filters of the HDF5 pipeline that can be applied outside of the library with identical output
+_H5Z_FILTER_DEFLATE = 1
+_H5Z_FILTER_SHUFFLE = 2
+
+
+def _get_chunk_filter_pipeline(dataset: h5py.Dataset) -> Optional[list[tuple[int, tuple[int, ...]]]]:
+    """
+    Return the code and client values of each filter applied to the chunks of the dataset, in order.
+
+    Returns None if the dataset is not compressed or if any of its filters cannot be applied outside of HDF5.
+    """
+    if dataset.chunks is None or dataset.dtype.kind not in "biuf":
+        return None
+
+    creation_property_list = dataset.id.get_create_plist()
+    filter_pipeline = []
+    for filter_index in range(creation_property_list.get_nfilters()):
+        filter_code, _, client_values, _ = creation_property_list.get_filter(filter_index)
+        if filter_code not in (_H5Z_FILTER_DEFLATE, _H5Z_FILTER_SHUFFLE):
+            return None
+        filter_pipeline.append((filter_code, tuple(client_values)))
+
+    return filter_pipeline or None
+
+
+def _encode_chunk(chunk: np.ndarray, filter_pipeline: list[tuple[int, tuple[int, ...]]]) -> bytes:
+    """Apply the filters of an HDF5 dataset to a full chunk, as the library would when writing it."""
+    encoded_chunk = np.ascontiguousarray(chunk).tobytes()
+    for filter_code, client_values in filter_pipeline:
+        if filter_code == _H5Z_FILTER_SHUFFLE:
+            element_size = client_values[0] if client_values else chunk.dtype.itemsize
+            encoded_chunk = np.frombuffer(encoded_chunk, dtype="uint8").reshape(-1, element_size).T.tobytes()
+        elif filter_code == _H5Z_FILTER_DEFLATE:
+            encoded_chunk = zlib.compress(encoded_chunk, client_values[0])
+
+    return encoded_chunk
+
+
+def _write_buffer_by_chunks(
+    dataset: h5py.Dataset,
+    data_chunk: DataChunk,
+    filter_pipeline: list[tuple[int, tuple[int, ...]]],
+    executor: ThreadPoolExecutor,
+) -> bool:
+    """
+    Encode the chunks covered by a buffer on a pool of threads, then write them with direct chunk writes.
+
+    Returns False, without writing anything, if the buffer does not cover whole chunks of the dataset.
+    """
+    chunk_shape = dataset.chunks
+    selection = data_chunk.selection
+    if not isinstance(selection, tuple) or len(selection) != len(chunk_shape):
+        return False
+    for axis_selection, chunk_length, axis_length in zip(selection, chunk_shape, dataset.shape):
+        if not isinstance(axis_selection, slice) or axis_selection.step not in (None, 1):
+            return False
+        if axis_selection.start % chunk_length != 0:
+            return False
+        if axis_selection.stop % chunk_length != 0 and axis_selection.stop != axis_length:
+            return False
+
+    data = np.asarray(data_chunk.data, dtype=dataset.dtype)
+    if data.shape != tuple(axis_selection.stop - axis_selection.start for axis_selection in selection):
+        return False
+
+    chunk_offsets = list(
+        itertools.product(
+            *(
+                range(axis_selection.start, axis_selection.stop, chunk_length)
+                for axis_selection, chunk_length in zip(selection, chunk_shape)
+            )
+        )
+    )
+
+    def encode_chunk(chunk_offset: tuple[int, ...]) -> bytes:
+        chunk = data[
+            tuple(
+                slice(offset - axis_selection.start, offset - axis_selection.start + chunk_length)
+                for offset, axis_selection, chunk_length in zip(chunk_offset, selection, chunk_shape)
+            )
+        ]
+
+        # Chunks on the edges of the dataset are still stored at full size, padded with the fill value
+        if chunk.shape != chunk_shape:
+            padded_chunk = np.full(shape=chunk_shape, fill_value=dataset.fillvalue, dtype=dataset.dtype)
+            padded_chunk[tuple(slice(0, length) for length in chunk.shape)] = chunk
+            chunk = padded_chunk
+
+        return _encode_chunk(chunk=chunk, filter_pipeline=filter_pipeline)
+
+    for chunk_offset, encoded_chunk in zip(chunk_offsets, executor.map(encode_chunk, chunk_offsets)):
+        dataset.id.write_direct_chunk(chunk_offset, encoded_chunk)
+
+    return True
+
+
+class _ParallelCompressionH5DataIO(H5DataIO):
+    """
+    Have HDMF create the dataset of a GenericDataChunkIterator empty, so that it is filled once the file is written.
+
+    HDMF writes the dataset with the shape, data type and all the options of an H5DataIO (chunks, filters, etc.) but
+    none of the data; `_write_parallel_compressed_dataset` then writes the buffers of the iterator to it.
+    """
+
+    def __init__(self, data: GenericDataChunkIterator, number_of_jobs: int, **kwargs):
+        self.data_chunk_iterator = data
+        self.number_of_jobs = number_of_jobs
+        super().__init__(data=None, shape=data.maxshape, dtype=data.dtype, **kwargs)
+
+
+def _write_parallel_compressed_dataset(data_io: _ParallelCompressionH5DataIO) -> None:
+    """
+    Write every buffer of the iterator of a `_ParallelCompressionH5DataIO` to the empty dataset created by HDMF.
+
+    The chunks covered by each buffer are compressed on a pool of `number_of_jobs` threads (zlib releases the GIL) and
+    written with direct chunk writes, byte-identical to the chunks HDF5 would write. Buffers that do not cover whole
+    chunks, and datasets with filters other than shuffle and deflate, are written through h5py instead.
+
+    Parameters
+    ----------
+    data_io : _ParallelCompressionH5DataIO
+        The DataIO of a dataset written by HDMF, which sets its `dataset`.
+    """
+    dataset = data_io.dataset
+    filter_pipeline = _get_chunk_filter_pipeline(dataset=dataset)
+    with ThreadPoolExecutor(
+        max_workers=_resolve_number_of_jobs(number_of_jobs=data_io.number_of_jobs),
+        thread_name_prefix="neuroconv_compression",
+    ) as executor:
+        for data_chunk in data_io.data_chunk_iterator:
+            if filter_pipeline is None or not _write_buffer_by_chunks(
+                dataset=dataset, data_chunk=data_chunk, filter_pipeline=filter_pipeline, executor=executor
+            ):
+                dataset[data_chunk.selection] = data_chunk.data
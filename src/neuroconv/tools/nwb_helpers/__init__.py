@@ -7,6 +7,7 @@ from ._backend_configuration import (
     BACKEND_CONFIGURATIONS,
     get_default_backend_configuration,
 )
+from ._chunk_planner import STORAGE_PROFILES
 from ._configuration_models import DATASET_IO_CONFIGURATIONS
 from ._configuration_models._base_backend import BackendConfiguration
 from ._configuration_models._base_dataset_io import DatasetIOConfiguration
@@ -38,6 +39,7 @@ __all__ = [
     "BACKEND_CONFIGURATIONS",
     "DATASET_IO_CONFIGURATIONS",
     "BACKEND_NWB_IO",
+    "STORAGE_PROFILES",
     "BackendConfiguration",
     "HDF5BackendConfiguration",
     "ZarrBackendConfiguration",
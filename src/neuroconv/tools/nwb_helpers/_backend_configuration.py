@@ -1,9 +1,10 @@
 """Collection of helper functions related to configuration of datasets dependent on backend."""
 
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 from pynwb import NWBFile
 
+from ._chunk_planner import AccessPattern, StorageProfile, _plan_dataset_shapes
 from ._configuration_models._hdf5_backend import HDF5BackendConfiguration
 from ._configuration_models._zarr_backend import ZarrBackendConfiguration
 
@@ -11,9 +12,51 @@ BACKEND_CONFIGURATIONS = dict(hdf5=HDF5BackendConfiguration, zarr=ZarrBackendCon
 
 
 def get_default_backend_configuration(
-    nwbfile: NWBFile, backend: Literal["hdf5", "zarr"]
+    nwbfile: NWBFile,
+    backend: Literal["hdf5", "zarr"],
+    access_pattern: Union[AccessPattern, dict[str, AccessPattern], None] = None,
+    storage_profile: Optional[StorageProfile] = None,
+    available_memory_gb: Optional[float] = None,
 ) -> Union[HDF5BackendConfiguration, ZarrBackendConfiguration]:
-    """Fill a default backend configuration to serve as a starting point for further customization."""
+    """
+    Fill a default backend configuration to serve as a starting point for further customization.
+
+    By default, the chunks of each dataset keep the aspect ratio of the data under 10 MB. If any of the `access_pattern`,
+    `storage_profile` or `available_memory_gb` is specified, the chunk and buffer shapes of each dataset are instead
+    planned for how the file will be read and where it will be stored.
+
+    Parameters
+    ----------
+    nwbfile : pynwb.NWBFile
+        The in-memory file to configure.
+    backend : "hdf5" or "zarr"
+        The type of backend to configure.
+    access_pattern : "time", "channel" or "frame", or a dictionary of them, optional
+        How the datasets will most often be read:
+            - 'time': windows of time across all channels or pixels, such as when scrolling through a recording.
+            - 'channel': long stretches of time of a single channel or pixel.
+            - 'frame': single frames (or volumes) of an image series.
+        A dictionary maps the location of a dataset in the file (e.g., 'acquisition/ElectricalSeries/data') to its
+        access pattern. Datasets without one are read by 'frame' if they are the data of an ImageSeries, by 'time'
+        otherwise.
+    storage_profile : "local_ssd", "network_filesystem" or "object_store", optional
+        Where the file will be read from, which sets the target size of the chunks (see `STORAGE_PROFILES`).
+        The default when planning is "network_filesystem".
+    available_memory_gb : float, optional
+        The memory available to the conversion when planning. Each buffer uses at most a quarter of it, up to 1 GB.
+        Defaults to the memory currently available on the system.
+    """
 
     BackendConfigurationClass = BACKEND_CONFIGURATIONS[backend]
-    return BackendConfigurationClass.from_nwbfile(nwbfile=nwbfile)
+    backend_configuration = BackendConfigurationClass.from_nwbfile(nwbfile=nwbfile)
+
+    if access_pattern is not None or storage_profile is not None or available_memory_gb is not None:
+        _plan_dataset_shapes(
+            backend_configuration=backend_configuration,
+            nwbfile=nwbfile,
+            access_pattern=access_pattern,
+            storage_profile=storage_profile or "network_filesystem",
+            available_memory_gb=available_memory_gb,
+        )
+
+    return backend_configuration
@@ -0,0 +1,195 @@
+"""Plan the chunk and buffer shapes of each dataset from how it will be read and where it will be stored."""
+
+import math
+import warnings
+from typing import Literal, Optional, Union
+
+import numpy as np
+import psutil
+from hdmf.common import Data
+from hdmf.data_utils import DataIO
+from pynwb import NWBFile
+from pynwb.image import ImageSeries
+
+from ._configuration_models._base_backend import BackendConfiguration
+from ..hdmf import GenericDataChunkIterator
+
+AccessPattern = Literal["time", "channel", "frame"]
+StorageProfile = Literal["local_ssd", "network_filesystem", "object_store"]
+
+# 'chunk_mb' is the size of a chunk that amortizes the cost of a request to the storage when scrolling through the data
+# 'minimum_read_mb' is the smallest read below which the latency of a request dominates its duration
+STORAGE_PROFILES: dict[str, dict[str, float]] = dict(
+    local_ssd=dict(chunk_mb=1.0, minimum_read_mb=0.1),
+    network_filesystem=dict(chunk_mb=10.0, minimum_read_mb=1.0),
+    object_store=dict(chunk_mb=16.0, minimum_read_mb=8.0),
+)
+
+# The largest buffer of a single dataset, and the fraction of the available memory it may use
+_MAXIMUM_BUFFER_GB = 1.0
+_BUFFER_MEMORY_FRACTION = 0.25
+
+
+def _plan_chunk_shape(
+    full_shape: tuple[int, ...], itemsize: int, access_pattern: AccessPattern, storage_profile: StorageProfile
+) -> tuple[int, ...]:
+    """
+    Plan the chunk shape of a dataset whose first axis is time.
+
+    - 'time': whole frames (all channels, or all pixels), as many as fit within the chunk size of the storage.
+    - 'frame': whole frames, as few as reach the minimum read size of the storage.
+    - 'channel': a single channel (or pixel) per chunk, with as many samples as fit within the chunk size.
+
+    Frames larger than the chunk size are tiled by halving their longest axis until a tile fits.
+    """
+    chunk_bytes = STORAGE_PROFILES[storage_profile]["chunk_mb"] * 1e6
+    minimum_read_bytes = STORAGE_PROFILES[storage_profile]["minimum_read_mb"] * 1e6
+
+    number_of_frames = full_shape[0]
+    if access_pattern == "channel" or len(full_shape) == 1:
+        samples_per_chunk = max(int(chunk_bytes // itemsize), 1)
+        return (min(samples_per_chunk, number_of_frames),) + (1,) * (len(full_shape) - 1)
+
+    frame_shape = list(full_shape[1:])
+    while math.prod(frame_shape) * itemsize > chunk_bytes and max(frame_shape) > 1:
+        longest_axis = int(np.argmax(frame_shape))
+        frame_shape[longest_axis] = math.ceil(frame_shape[longest_axis] / 2)
+    frame_bytes = math.prod(frame_shape) * itemsize
+
+    if access_pattern == "frame":
+        frames_per_chunk = math.ceil(minimum_read_bytes / frame_bytes)
+    else:
+        frames_per_chunk = max(int(chunk_bytes // frame_bytes), 1)
+
+    return (min(frames_per_chunk, number_of_frames), *frame_shape)
+
+
+def _plan_buffer_shape(
+    chunk_shape: tuple[int, ...], full_shape: tuple[int, ...], itemsize: int, buffer_bytes: float
+) -> tuple[int, ...]:
+    """
+    Grow the chunk shape into a buffer, first along all axes but time, then along time.
+
+    Most sources store their data one frame after the other, so buffers spanning whole frames are read contiguously.
+    """
+    buffer_shape = list(chunk_shape)
+    for axis in [*range(1, len(full_shape)), 0]:
+        other_axes_bytes = math.prod(buffer_shape[:axis] + buffer_shape[axis + 1 :]) * itemsize
+        number_of_chunks = max(int(buffer_bytes // (other_axes_bytes * chunk_shape[axis])), 1)
+        buffer_shape[axis] = min(number_of_chunks * chunk_shape[axis], full_shape[axis])
+
+    return tuple(buffer_shape)
+
+
+def _get_default_access_pattern(neurodata_object, dataset_name: str) -> AccessPattern:
+    if isinstance(neurodata_object, ImageSeries) and dataset_name == "data":
+        return "frame"
+
+    return "time"
+
+
+def _plan_dataset_shapes(
+    backend_configuration: BackendConfiguration,
+    nwbfile: NWBFile,
+    access_pattern: Union[AccessPattern, dict[str, AccessPattern], None] = None,
+    storage_profile: StorageProfile = "network_filesystem",
+    available_memory_gb: Optional[float] = None,
+) -> None:
+    """
+    Set the chunk and buffer shapes of each dataset of a backend configuration, in place, from how it will be read.
+
+    See `get_default_backend_configuration` for a description of the access patterns and storage profiles.
+    """
+    if available_memory_gb is None:
+        available_memory_gb = psutil.virtual_memory().available / 1e9
+    maximum_buffer_bytes = min(_MAXIMUM_BUFFER_GB, _BUFFER_MEMORY_FRACTION * available_memory_gb) * 1e9
+
+    access_patterns = access_pattern if isinstance(access_pattern, dict) else dict()
+    for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+        if location_in_file in access_patterns:
+            dataset_access_pattern = access_patterns[location_in_file]
+        elif access_pattern is not None and not isinstance(access_pattern, dict):
+            dataset_access_pattern = access_pattern
+        else:
+            dataset_access_pattern = _get_default_access_pattern(
+                neurodata_object=nwbfile.objects[dataset_configuration.object_id],
+                dataset_name=dataset_configuration.dataset_name,
+            )
+
+        full_shape = dataset_configuration.full_shape
+        itemsize = dataset_configuration.dtype.itemsize
+        chunk_shape = _plan_chunk_shape(
+            full_shape=full_shape,
+            itemsize=itemsize,
+            access_pattern=dataset_access_pattern,
+            storage_profile=storage_profile,
+        )
+        buffer_bytes = max(maximum_buffer_bytes, math.prod(chunk_shape) * itemsize)
+        buffer_shape = _plan_buffer_shape(
+            chunk_shape=chunk_shape, full_shape=full_shape, itemsize=itemsize, buffer_bytes=buffer_bytes
+        )
+
+        # Replaced rather than assigned one at a time, since each shape is validated against the other
+        backend_configuration.dataset_configurations[location_in_file] = dataset_configuration.model_validate(
+            dict(dataset_configuration.model_dump(), chunk_shape=chunk_shape, buffer_shape=buffer_shape)
+        )
+
+
+def _check_memory_budget(memory_budget_gb: float) -> float:
+    """Return the memory budget of a conversion, reduced (with a warning) to the memory available on the machine."""
+    assert memory_budget_gb > 0, f"memory_budget_gb ({memory_budget_gb}) must be greater than zero!"
+
+    available_memory_gb = psutil.virtual_memory().available / 1e9
+    if memory_budget_gb > available_memory_gb:
+        warnings.warn(
+            f"The memory budget ({memory_budget_gb:.2f} GB) exceeds the memory available on this machine "
+            f"({available_memory_gb:.2f} GB); the available memory will be used as the budget instead."
+        )
+        return available_memory_gb
+
+    return memory_budget_gb
+
+
+def _fit_buffers_into_memory_budget(
+    backend_configuration: BackendConfiguration, nwbfile: NWBFile, memory_budget_gb: float
+) -> None:
+    """
+    Shrink, in place, the buffer shapes of the datasets written from a GenericDataChunkIterator to fit a memory budget.
+
+    The budget is divided evenly among these datasets, so that it holds even if each of them has a buffer in memory
+    at the same time (for example, when prefetching). A buffer is never made smaller than a single chunk.
+    """
+    iterator_locations = []
+    for location_in_file, dataset_configuration in backend_configuration.dataset_configurations.items():
+        neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+        if isinstance(neurodata_object, Data):
+            dataset = neurodata_object.data
+        else:
+            dataset = neurodata_object.fields.get(dataset_configuration.dataset_name)
+        if isinstance(dataset, DataIO):
+            dataset = dataset.data
+        if isinstance(dataset, GenericDataChunkIterator):
+            iterator_locations.append(location_in_file)
+
+    if len(iterator_locations) == 0:
+        return
+
+    buffer_bytes = memory_budget_gb * 1e9 / len(iterator_locations)
+    for location_in_file in iterator_locations:
+        dataset_configuration = backend_configuration.dataset_configurations[location_in_file]
+        itemsize = dataset_configuration.dtype.itemsize
+        if (
+            dataset_configuration.chunk_shape is None
+            or math.prod(dataset_configuration.buffer_shape) * itemsize <= buffer_bytes
+        ):
+            continue
+
+        buffer_shape = _plan_buffer_shape(
+            chunk_shape=dataset_configuration.chunk_shape,
+            full_shape=dataset_configuration.full_shape,
+            itemsize=itemsize,
+            buffer_bytes=buffer_bytes,
+        )
+        backend_configuration.dataset_configurations[location_in_file] = dataset_configuration.model_validate(
+            dict(dataset_configuration.model_dump(), buffer_shape=buffer_shape)
+        )
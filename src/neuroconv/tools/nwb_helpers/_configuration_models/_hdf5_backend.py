@@ -2,6 +2,7 @@
 
 from typing import ClassVar, Literal, Type
 
+import psutil
 from pydantic import Field
 from pynwb import H5DataIO
 
@@ -22,3 +23,15 @@ class HDF5BackendConfiguration(BackendConfiguration):
             "information for writing the datasets to disk using the HDF5 backend."
         )
     )
+    number_of_jobs: int = Field(
+        description=(
+            "Number of threads used to compress the chunks of each buffer of a data chunk iterator during write, "
+            "which are then written to the file as they are. Only applies to datasets compressed with GZIP (and "
+            "optionally shuffled); the chunks are byte-identical to those HDF5 would write. Negative values, starting "
+            "from -1, will use all the available CPUs (including logical), -2 is all except one, etc. "
+            "The default of 1 leaves the compression to HDF5, on the writing thread."
+        ),
+        ge=-psutil.cpu_count(),
+        le=psutil.cpu_count(),
+        default=1,
+    )
@@ -8,6 +8,8 @@ from pynwb import NWBFile, TimeSeries
 
 from ._configuration_models._hdf5_backend import HDF5BackendConfiguration
 from ._configuration_models._zarr_backend import ZarrBackendConfiguration
+from ._dataset_configuration import _get_data_chunk_iterators
+from ..hdmf import GenericDataChunkIterator, _ParallelCompressionH5DataIO
 from ..importing import is_package_installed
 
 
@@ -33,17 +35,35 @@ def configure_backend(
         backend_configuration = backend_configuration.build_remapped_backend(locations_to_remap=locations_to_remap)
 
     # Set all DataIO based on the configuration
-    data_io_class = backend_configuration.data_io_class
     for dataset_configuration in backend_configuration.dataset_configurations.values():
         object_id = dataset_configuration.object_id
         dataset_name = dataset_configuration.dataset_name
         data_io_kwargs = dataset_configuration.get_data_io_kwargs()
 
-        # TODO: update buffer shape in iterator, if present
-
         neurodata_object = nwbfile.objects[object_id]
         is_dataset_linked = isinstance(neurodata_object.fields.get(dataset_name), TimeSeries)
 
+        # Iterators that have not started are given the chunk and buffer shapes of the configuration
+        if isinstance(neurodata_object, Data):
+            dataset = neurodata_object.data
+        else:
+            dataset = neurodata_object.fields.get(dataset_name)
+        if isinstance(dataset, GenericDataChunkIterator):
+            dataset._set_shapes(
+                chunk_shape=dataset_configuration.chunk_shape, buffer_shape=dataset_configuration.buffer_shape
+            )
+
+        # HDF5 datasets of iterators are created empty and filled with chunks compressed in parallel after the write
+        if (
+            backend_configuration.backend == "hdf5"
+            and backend_configuration.number_of_jobs != 1
+            and isinstance(dataset, GenericDataChunkIterator)
+        ):
+            data_io_class = _ParallelCompressionH5DataIO
+            data_io_kwargs["number_of_jobs"] = backend_configuration.number_of_jobs
+        else:
+            data_io_class = backend_configuration.data_io_class
+
         # Table columns
         if isinstance(neurodata_object, Data):
             neurodata_object.set_data_io(data_io_class=data_io_class, data_io_kwargs=data_io_kwargs)
@@ -69,3 +89,8 @@ def configure_backend(
                 f"Unsupported object type {type(neurodata_object)} for backend configuration "
                 f"of {neurodata_object.name}!"
             )
+
+    # Passed on to `ZarrIO.write` when the file is written, see `_write_nwbfile`
+    if backend_configuration.backend == "zarr":
+        for data_chunk_iterator in _get_data_chunk_iterators(nwbfile=nwbfile):
+            data_chunk_iterator._zarr_number_of_jobs = backend_configuration.number_of_jobs
@@ -5,7 +5,7 @@ from typing import Generator, Literal, Union
 import h5py
 import numpy as np
 import zarr
-from hdmf import Container
+from hdmf import Container, Data
 from hdmf.data_utils import DataIO
 from hdmf.utils import get_data_shape
 from hdmf_zarr import NWBZarrIO
@@ -15,6 +15,7 @@ from pynwb.file import NWBContainer
 
 from ._configuration_models import DATASET_IO_CONFIGURATIONS
 from ._configuration_models._base_dataset_io import DatasetIOConfiguration
+from ..hdmf import GenericDataChunkIterator, _ParallelCompressionH5DataIO
 
 
 def _get_io_mode(io: Union[NWBHDF5IO, NWBZarrIO]) -> str:
@@ -49,6 +50,34 @@ def _is_dataset_written_to_file(
     )
 
 
+def _get_data_chunk_iterators(nwbfile: NWBFile) -> list[GenericDataChunkIterator]:
+    """
+    Collect all GenericDataChunkIterators that will be consumed when writing the in-memory NWBFile.
+
+    Iterators that have already been wrapped in a DataIO (for example, by `configure_backend`) are also included.
+    """
+    known_dataset_fields = ("data", "timestamps")
+
+    data_chunk_iterators = dict()
+    for neurodata_object in nwbfile.objects.values():
+        # Table columns store their values on the object itself rather than in the fields
+        if isinstance(neurodata_object, Data):
+            candidate_datasets = [neurodata_object.data]
+        else:
+            candidate_datasets = [neurodata_object.fields.get(field_name) for field_name in known_dataset_fields]
+
+        for candidate_dataset in candidate_datasets:
+            if isinstance(candidate_dataset, _ParallelCompressionH5DataIO):
+                candidate_dataset = candidate_dataset.data_chunk_iterator
+            elif isinstance(candidate_dataset, DataIO):
+                candidate_dataset = candidate_dataset.data
+
+            if isinstance(candidate_dataset, GenericDataChunkIterator):
+                data_chunk_iterators[id(candidate_dataset)] = candidate_dataset
+
+    return list(data_chunk_iterators.values())
+
+
 def get_default_dataset_io_configurations(
     nwbfile: NWBFile,
     backend: Union[None, Literal["hdf5", "zarr"]] = None,  # None for auto-detect from append mode, otherwise required
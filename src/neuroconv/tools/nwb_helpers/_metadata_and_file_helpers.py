@@ -12,10 +12,18 @@ from warnings import warn
 
 from hdmf_zarr import NWBZarrIO
 from pydantic import FilePath
+from hdmf.common import Data
 from pynwb import NWBHDF5IO, NWBFile
 from pynwb.file import Subject
 
 from . import BackendConfiguration, configure_backend, get_default_backend_configuration
+from ._dataset_configuration import _get_data_chunk_iterators
+from ..hdmf import (
+    _ParallelCompressionH5DataIO,
+    _resolve_number_of_jobs,
+    _write_parallel_compressed_dataset,
+)
+from ..profiling import ConversionProfiler, _profile_stage
 from ...utils.dict import DeepDict, load_dict_from_file
 from ...utils.json_schema import validate_metadata
 
@@ -168,6 +176,7 @@ def make_or_load_nwbfile(
     overwrite: bool = False,
     backend: Literal["hdf5", "zarr"] = "hdf5",
     verbose: bool = True,
+    profiler: Optional[ConversionProfiler] = None,
 ):
     """
     Context for automatically handling decision of write vs. append for writing an NWBFile.
@@ -188,6 +197,9 @@ def make_or_load_nwbfile(
         The type of backend used to create the file.
     verbose: bool, default: True
         If 'nwbfile_path' is specified, informs user after a successful write operation.
+    profiler : ConversionProfiler, optional
+        If specified, the reading of an existing file (stage 'load') and the writing of the file (stage 'write') are
+        recorded by this profiler.
     """
     from . import BACKEND_NWB_IO
 
@@ -207,13 +219,14 @@ def make_or_load_nwbfile(
         "'nwbfile_path' exists at location, 'overwrite' is False (append mode), but an in-memory 'nwbfile' object was "
         "passed! Cannot reconcile which nwbfile object to write."
     )
-    if overwrite is False and backend == "zarr":
-        # TODO: remove when https://github.com/hdmf-dev/hdmf-zarr/issues/182 is resolved
-        raise NotImplementedError("Appending a Zarr file is not yet supported!")
 
     load_kwargs = dict()
     file_initially_exists = nwbfile_path_in.exists() if nwbfile_path_is_provided else False
     append_mode = file_initially_exists and not overwrite
+    if append_mode and backend == "zarr":
+        # TODO: remove when https://github.com/hdmf-dev/hdmf-zarr/issues/182 is resolved
+        raise NotImplementedError("Appending a Zarr file is not yet supported!")
+
     if nwbfile_path_is_provided:
         load_kwargs.update(path=str(nwbfile_path_in))
 
@@ -249,7 +262,8 @@ def make_or_load_nwbfile(
         if nwbfile_is_provided:
             nwbfile = nwbfile_in
         elif read_nwbfile:
-            nwbfile = io.read()
+            with _profile_stage(profiler=profiler, name="load"):
+                nwbfile = io.read()
         elif create_nwbfile:
             if metadata is None:
                 error_msg = "Metadata is required for creating an nwbfile "
@@ -266,7 +280,8 @@ def make_or_load_nwbfile(
     finally:
         if nwbfile_path_is_provided and nwbfile_loaded_succesfully:
             try:
-                io.write(nwbfile)
+                with _profile_stage(profiler=profiler, name="write"):
+                    _write_nwbfile(io=io, nwbfile=nwbfile)
 
                 if verbose:
                     print(f"NWB file saved at {nwbfile_path_in}!")
@@ -297,20 +312,20 @@ def make_or_load_nwbfile(
 
 
 def _resolve_backend(
-    backend: Optional[Literal["hdf5"]] = None,
+    backend: Optional[Literal["hdf5", "zarr"]] = None,
     backend_configuration: Optional[BackendConfiguration] = None,
-) -> Literal["hdf5"]:
+) -> Literal["hdf5", "zarr"]:
     """
     Resolve the backend to use for writing the NWBFile.
 
     Parameters
     ----------
-    backend: {"hdf5"}, optional
+    backend: {"hdf5", "zarr"}, optional
     backend_configuration: BackendConfiguration, optional
 
     Returns
     -------
-    backend: {"hdf5"}
+    backend: {"hdf5", "zarr"}
 
     """
 
@@ -332,10 +347,40 @@ def _resolve_backend(
     return backend
 
 
+def _write_nwbfile(io, nwbfile: NWBFile) -> None:
+    """
+    Write the NWBFile, then fill the datasets that `configure_backend` set up for parallel compression.
+
+    HDMF creates these datasets empty; their iterators are consumed here, once the file holds them. Zarr files are
+    written with the `number_of_jobs` that `configure_backend` gave to their iterators.
+    """
+    if isinstance(io, NWBZarrIO):
+        number_of_jobs = max(
+            (
+                _resolve_number_of_jobs(number_of_jobs=data_chunk_iterator._zarr_number_of_jobs)
+                for data_chunk_iterator in _get_data_chunk_iterators(nwbfile=nwbfile)
+            ),
+            default=1,
+        )
+        io.write(nwbfile, number_of_jobs=number_of_jobs)
+    else:
+        io.write(nwbfile)
+
+    for neurodata_object in nwbfile.objects.values():
+        if isinstance(neurodata_object, Data):
+            candidate_datasets = [neurodata_object.data]
+        else:
+            candidate_datasets = neurodata_object.fields.values()
+
+        for candidate_dataset in candidate_datasets:
+            if isinstance(candidate_dataset, _ParallelCompressionH5DataIO) and candidate_dataset.dataset is not None:
+                _write_parallel_compressed_dataset(data_io=candidate_dataset)
+
+
 def configure_and_write_nwbfile(
     nwbfile: NWBFile,
     output_filepath: str,
-    backend: Optional[Literal["hdf5"]] = None,
+    backend: Optional[Literal["hdf5", "zarr"]] = None,
     backend_configuration: Optional[BackendConfiguration] = None,
 ) -> None:
     """
@@ -349,7 +394,7 @@ def configure_and_write_nwbfile(
     ----------
     nwbfile: NWBFile
     output_filepath: str
-    backend: {"hdf5"}, optional
+    backend: {"hdf5", "zarr"}, optional
         The type of backend used to create the file. This option uses the default ``backend_configuration`` for the
         specified backend. If no ``backend`` is specified, the ``backend_configuration`` is used.
     backend_configuration: BackendConfiguration, optional
@@ -369,4 +414,4 @@ def configure_and_write_nwbfile(
     IO = BACKEND_NWB_IO[backend_configuration.backend]
 
     with IO(output_filepath, mode="w") as io:
-        io.write(nwbfile)
+        _write_nwbfile(io=io, nwbfile=nwbfile)
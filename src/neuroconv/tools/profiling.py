@@ -0,0 +1,319 @@
+"""Opt-in instrumentation of the stages of a conversion and of the reads and writes of each dataset."""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from importlib.metadata import version
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+import numpy as np
+import psutil
+from hdmf.common import Data
+from hdmf.data_utils import DataChunk, DataIO
+from pydantic import FilePath
+from pynwb import NWBFile
+
+from .hdmf import GenericDataChunkIterator
+
+
+class _PeakMemorySampler:
+    """Sample the resident memory of the process on a background thread and keep the largest value."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._process = psutil.Process()
+        self.peak_rss = self._process.memory_info().rss
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="neuroconv_memory_sampler", daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop_event.wait(timeout=self.interval):
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def __enter__(self) -> "_PeakMemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+
+class _DatasetProfile:
+    """The reads and writes of a single dataset, as seen through its GenericDataChunkIterator if it has one."""
+
+    def __init__(self, dataset_configuration, interface_name: Optional[str]):
+        self.location_in_file = dataset_configuration.location_in_file
+        self.interface_name = interface_name
+        self.dtype = np.dtype(dataset_configuration.dtype)
+        self.full_shape = tuple(dataset_configuration.full_shape)
+        self.chunk_shape = tuple(dataset_configuration.chunk_shape)
+        self.buffer_shape = tuple(dataset_configuration.buffer_shape)
+        self.compression_method = dataset_configuration.compression_method
+
+        self.iterator: Optional[GenericDataChunkIterator] = None
+        self.number_of_buffers = 0
+        self.number_of_bytes_read = 0
+        self.read_time = 0.0
+        self.wait_time = 0.0
+        self.write_time = 0.0
+        self.stored_bytes: Optional[int] = None
+        self._last_buffer_time: Optional[float] = None
+
+    def attach(self, iterator: GenericDataChunkIterator) -> None:
+        """Time the reads of the iterator, which may happen on the threads of a prefetcher, and the writes between."""
+        self.iterator = iterator
+        iterator._profile = self
+
+        get_data = iterator._get_data
+
+        # Reads of the same iterator are never concurrent, so the counters need no lock
+        def timed_get_data(selection: tuple[slice]) -> np.ndarray:
+            start_time = time.perf_counter()
+            data = get_data(selection=selection)
+            self.read_time += time.perf_counter() - start_time
+            self.number_of_bytes_read += data.nbytes
+            return data
+
+        iterator._get_data = timed_get_data
+
+    def detach(self) -> None:
+        if self.iterator is None:
+            return
+
+        self.iterator.__dict__.pop("_get_data", None)
+        self.iterator._profile = None
+        self.iterator = None
+
+    def get_next_data_chunk(self, iterator: GenericDataChunkIterator) -> DataChunk:
+        """Return the next buffer of the iterator, attributing the time since the previous one to its write."""
+        start_time = time.perf_counter()
+        if self._last_buffer_time is not None:
+            self.write_time += start_time - self._last_buffer_time
+
+        try:
+            data_chunk = iterator._get_next_data_chunk()
+        except StopIteration:
+            self._last_buffer_time = None
+            raise
+
+        self.number_of_buffers += 1
+        self._last_buffer_time = time.perf_counter()
+        self.wait_time += self._last_buffer_time - start_time
+        return data_chunk
+
+    def get_report(self) -> dict:
+        number_of_bytes = math.prod(self.full_shape) * self.dtype.itemsize
+        report = dict(
+            location_in_file=self.location_in_file,
+            interface_name=self.interface_name,
+            dtype=str(self.dtype),
+            full_shape=self.full_shape,
+            chunk_shape=self.chunk_shape,
+            buffer_shape=self.buffer_shape,
+            compression_method=str(self.compression_method) if self.compression_method is not None else None,
+            bytes_in=number_of_bytes,
+            bytes_out=self.stored_bytes,
+            compression_ratio=number_of_bytes / self.stored_bytes if self.stored_bytes else None,
+            is_iterated=self.number_of_buffers > 0,
+        )
+        if self.number_of_buffers > 0:
+            report.update(
+                number_of_buffers=self.number_of_buffers,
+                read_time=self.read_time,
+                wait_time=self.wait_time,
+                write_time=self.write_time,
+                read_throughput_mb_per_s=self.number_of_bytes_read / 1e6 / self.read_time if self.read_time else None,
+                write_throughput_mb_per_s=number_of_bytes / 1e6 / self.write_time if self.write_time else None,
+            )
+
+        return report
+
+
+class ConversionProfiler:
+    """
+    Record the wall time and peak memory of each stage of a conversion, and the reads and writes of each dataset.
+
+    Pass an instance as the `profiler` of `NWBConverter.run_conversion`. Once the file is written, the report is built,
+    saved to `report_file_path` (if specified) and passed to each of the `sinks`; it also remains available from
+    `get_report`.
+
+    The report contains
+        - 'stages': the time and peak resident memory of each stage (e.g., 'get_metadata', 'add_to_nwbfile',
+          'configure_backend', 'write'), with the name of the interface for stages run once per interface.
+        - 'interfaces': the total time and peak memory of the stages of each interface, and the datasets it added.
+        - 'datasets': the shapes and compression of each configured dataset, with its size in memory ('bytes_in') and
+          on disk ('bytes_out'). For datasets written through a GenericDataChunkIterator, also the number of buffers,
+          the time spent in `_get_data` ('read_time'), waiting on a buffer ('wait_time'; less than the read time when
+          prefetching) and writing and compressing them ('write_time').
+    """
+
+    def __init__(
+        self,
+        report_file_path: Optional[FilePath] = None,
+        sinks: Optional[list[Callable[[dict], None]]] = None,
+        memory_sampling_interval: float = 0.05,
+    ):
+        """
+        Parameters
+        ----------
+        report_file_path : FilePath, optional
+            The path of a JSON file to save the report to.
+        sinks : list of callables, optional
+            Functions called with the report (a dictionary) once the conversion is complete, for example to send it to
+            a logging or monitoring service.
+        memory_sampling_interval : float, default: 0.05
+            The time in seconds between two samples of the resident memory of the process.
+        """
+        self.report_file_path = Path(report_file_path) if report_file_path is not None else None
+        self.sinks = list(sinks or [])
+        self.memory_sampling_interval = memory_sampling_interval
+
+        self._start_time: Optional[float] = None
+        self._stages: list[dict] = []
+        self._object_interface_names: dict[str, str] = dict()
+        self._dataset_profiles: dict[str, _DatasetProfile] = dict()
+        self._nwbfile_path: Optional[Path] = None
+        self._backend: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str, interface_name: Optional[str] = None, nwbfile: Optional[NWBFile] = None):
+        """
+        Time a stage of the conversion and sample the memory of the process while it runs.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        interface_name : str, optional
+            The name of the interface this stage is run for.
+        nwbfile : pynwb.NWBFile, optional
+            If specified along with the `interface_name`, the neurodata objects added to the file during the stage
+            (and thus their datasets) are attributed to the interface.
+        """
+        # The `objects` of an NWBFile are cached, so its children are gathered again to find the new ones
+        object_ids_before = {child.object_id for child in nwbfile.all_children()} if nwbfile is not None else None
+
+        start_time = time.perf_counter()
+        if self._start_time is None:
+            self._start_time = start_time
+        with _PeakMemorySampler(interval=self.memory_sampling_interval) as memory_sampler:
+            yield
+        self._stages.append(
+            dict(
+                name=name,
+                interface_name=interface_name,
+                time=time.perf_counter() - start_time,
+                peak_memory_mb=memory_sampler.peak_rss / 1e6,
+            )
+        )
+
+        if object_ids_before is not None and interface_name is not None:
+            for object_id in {child.object_id for child in nwbfile.all_children()} - object_ids_before:
+                self._object_interface_names[object_id] = interface_name
+
+    def profile_datasets(self, nwbfile: NWBFile, backend_configuration) -> None:
+        """Register the datasets of a configured file, and time the iterators among them while the file is written."""
+        for dataset_configuration in backend_configuration.dataset_configurations.values():
+            neurodata_object = nwbfile.objects[dataset_configuration.object_id]
+            dataset_profile = _DatasetProfile(
+                dataset_configuration=dataset_configuration,
+                interface_name=self._object_interface_names.get(dataset_configuration.object_id),
+            )
+            self._dataset_profiles[dataset_configuration.location_in_file] = dataset_profile
+
+            if isinstance(neurodata_object, Data):
+                dataset = neurodata_object.data
+            else:
+                dataset = neurodata_object.fields.get(dataset_configuration.dataset_name)
+            if isinstance(dataset, DataIO):
+                dataset = dataset.data
+            if isinstance(dataset, GenericDataChunkIterator) and dataset._profile is None:
+                dataset_profile.attach(iterator=dataset)
+
+    def finalize(self, nwbfile_path: Optional[FilePath], backend: Literal["hdf5", "zarr"]) -> dict:
+        """
+        Measure the size on disk of each dataset of the written file, then build, save and emit the report.
+
+        Parameters
+        ----------
+        nwbfile_path : FilePath, optional
+            The path of the written file.
+        backend : "hdf5" or "zarr"
+            The backend the file was written with.
+
+        Returns
+        -------
+        dict
+            The report.
+        """
+        for dataset_profile in self._dataset_profiles.values():
+            dataset_profile.detach()
+
+        self._nwbfile_path = Path(nwbfile_path) if nwbfile_path is not None else None
+        self._backend = backend
+        if self._nwbfile_path is not None and self._nwbfile_path.exists():
+            self._measure_stored_bytes()
+
+        report = self.get_report()
+        if self.report_file_path is not None:
+            with open(file=self.report_file_path, mode="w") as file:
+                json.dump(obj=report, fp=file, indent=4)
+        for sink in self.sinks:
+            sink(report)
+
+        return report
+
+    def _measure_stored_bytes(self) -> None:
+        if self._backend == "hdf5":
+            import h5py
+
+            with h5py.File(name=self._nwbfile_path, mode="r") as file:
+                for location_in_file, dataset_profile in self._dataset_profiles.items():
+                    if isinstance(file.get(location_in_file), h5py.Dataset):
+                        dataset_profile.stored_bytes = int(file[location_in_file].id.get_storage_size())
+        elif self._backend == "zarr":
+            import zarr
+
+            group = zarr.open(store=str(self._nwbfile_path), mode="r")
+            for location_in_file, dataset_profile in self._dataset_profiles.items():
+                if isinstance(group.get(location_in_file), zarr.Array):
+                    dataset_profile.stored_bytes = int(group[location_in_file].nbytes_stored)
+
+    def get_report(self) -> dict:
+        """Return the timings and sizes recorded so far, as a JSON-serializable dictionary."""
+        datasets = [dataset_profile.get_report() for dataset_profile in self._dataset_profiles.values()]
+
+        interfaces = dict()
+        for stage in self._stages:
+            if stage["interface_name"] is None:
+                continue
+            interface = interfaces.setdefault(
+                stage["interface_name"], dict(time=0.0, peak_memory_mb=0.0, stages=dict(), datasets=[])
+            )
+            interface["time"] += stage["time"]
+            interface["peak_memory_mb"] = max(interface["peak_memory_mb"], stage["peak_memory_mb"])
+            interface["stages"][stage["name"]] = interface["stages"].get(stage["name"], 0.0) + stage["time"]
+        for dataset in datasets:
+            if dataset["interface_name"] in interfaces:
+                interfaces[dataset["interface_name"]]["datasets"].append(dataset["location_in_file"])
+
+        return dict(
+            neuroconv_version=version("neuroconv"),
+            nwbfile_path=str(self._nwbfile_path) if self._nwbfile_path is not None else None,
+            backend=self._backend,
+            total_time=time.perf_counter() - self._start_time if self._start_time is not None else 0.0,
+            peak_memory_mb=max((stage["peak_memory_mb"] for stage in self._stages), default=None),
+            stages=list(self._stages),
+            interfaces=interfaces,
+            datasets=datasets,
+        )
+
+
+def _profile_stage(profiler: Optional[ConversionProfiler], **stage_kwargs):
+    """Return the context of a stage of the profiler, or a context that does nothing when not profiling."""
+    return profiler.stage(**stage_kwargs) if profiler is not None else nullcontext()
@@ -0,0 +1,187 @@
+"""Iterator over the image masks of a SegmentationExtractor, built from its sparse pixel masks."""
+
+import math
+from typing import Optional
+
+import numpy as np
+from roiextractors import SegmentationExtractor
+from tqdm import tqdm
+
+from neuroconv.tools.hdmf import GenericDataChunkIterator
+
+
+class ImageMaskDataChunkIterator(GenericDataChunkIterator):
+    """
+    DataChunkIterator for the 'image_mask' column of a PlaneSegmentation, with shape (number of ROIs, width, height).
+
+    Each buffer is filled in from the pixel masks of its ROIs only, so the dense image masks of the whole segmentation
+    (number of ROIs times the size of the image) are never held in memory at once.
+    """
+
+    def __init__(
+        self,
+        segmentation_extractor: SegmentationExtractor,
+        roi_ids: Optional[list] = None,
+        background: bool = False,
+        buffer_gb: Optional[float] = None,
+        buffer_shape: Optional[tuple] = None,
+        chunk_mb: Optional[float] = None,
+        chunk_shape: Optional[tuple] = None,
+        display_progress: bool = False,
+        progress_bar_class: Optional[tqdm] = None,
+        progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
+    ):
+        """
+        Initialize an Iterable object which returns DataChunks with data and their selections on each iteration.
+
+        Parameters
+        ----------
+        segmentation_extractor : SegmentationExtractor
+            The SegmentationExtractor object which handles the data access.
+        roi_ids : list, optional
+            The IDs of the ROIs (or background components) to iterate over, in order.
+            The default is all of them.
+        background : bool, default: False
+            Whether to iterate over the masks of the background components instead of those of the ROIs.
+        buffer_gb : float, optional
+            The upper bound on size in gigabytes (GB) of each selection from the iteration.
+            The buffer_shape will be set implicitly by this argument.
+            Cannot be set if `buffer_shape` is also specified.
+            The default is 1GB.
+        buffer_shape : tuple, optional
+            Manual specification of buffer shape to return on each iteration.
+            Must be a multiple of chunk_shape along each axis.
+            Cannot be set if `buffer_gb` is also specified.
+            The default is None.
+        chunk_mb : float, optional
+            The upper bound on size in megabytes (MB) of the internal chunk for the HDF5 dataset.
+            The chunk_shape will be set implicitly by this argument.
+            Cannot be set if `chunk_shape` is also specified.
+            The default is 10MB, as recommended by the HDF5 group.
+            For more details, search the hdf5 documentation for "Improving IO Performance Compressed Datasets".
+        chunk_shape : tuple, optional
+            Manual specification of the internal chunk shape for the HDF5 dataset.
+            Cannot be set if `chunk_mb` is also specified.
+            The default is None.
+        display_progress : bool, default=False
+            Display a progress bar with iteration rate and estimated completion time.
+        progress_bar_class : dict, optional
+            The progress bar class to use.
+            Defaults to tqdm.tqdm if the TQDM package is installed.
+        progress_bar_options : dict, optional
+            Dictionary of keyword arguments to be passed directly to tqdm.
+            See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
+        """
+        self.segmentation_extractor = segmentation_extractor
+        self.background = background
+        if background:
+            self.roi_ids = list(segmentation_extractor.get_background_ids() if roi_ids is None else roi_ids)
+        else:
+            self.roi_ids = list(segmentation_extractor.get_roi_ids() if roi_ids is None else roi_ids)
+        assert len(self.roi_ids) > 0, "The segmentation extractor has no masks to iterate over!"
+
+        self._pixel_masks_selection = None
+        self._pixel_masks = None
+
+        assert not (buffer_gb and buffer_shape), "Only one of 'buffer_gb' or 'buffer_shape' can be specified!"
+        assert not (chunk_mb and chunk_shape), "Only one of 'chunk_mb' or 'chunk_shape' can be specified!"
+
+        if chunk_mb and buffer_gb:
+            assert chunk_mb * 1e6 <= buffer_gb * 1e9, "chunk_mb must be less than or equal to buffer_gb!"
+
+        if chunk_mb is None and chunk_shape is None:
+            chunk_mb = 10.0
+
+        self._maxshape = self._get_maxshape()
+        self._dtype = self._get_dtype()
+        if chunk_shape is None:
+            chunk_shape = self._get_default_chunk_shape(chunk_mb=chunk_mb)
+
+        if buffer_gb is None and buffer_shape is None:
+            buffer_gb = 1.0
+
+        if buffer_shape is None:
+            buffer_shape = self._get_scaled_buffer_shape(buffer_gb=buffer_gb, chunk_shape=chunk_shape)
+
+        super().__init__(
+            buffer_shape=buffer_shape,
+            chunk_shape=chunk_shape,
+            display_progress=display_progress,
+            progress_bar_class=progress_bar_class,
+            progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
+        )
+
+    def __len__(self) -> int:
+        # The columns of a DynamicTable must have one row per ROI
+        return self._maxshape[0]
+
+    def _get_default_chunk_shape(self, chunk_mb: float) -> tuple:
+        """Select as many whole masks per chunk as fit within chunk_mb, since masks are most often read one by one."""
+        assert chunk_mb > 0, f"chunk_mb ({chunk_mb}) must be greater than zero!"
+
+        mask_size_bytes = math.prod(self._maxshape[1:]) * self._dtype.itemsize
+        number_of_masks_per_chunk = int(chunk_mb * 1e6 / mask_size_bytes)
+
+        return (max(min(number_of_masks_per_chunk, self._maxshape[0]), 1),) + self._maxshape[1:]
+
+    def _get_scaled_buffer_shape(self, buffer_gb: float, chunk_shape: tuple) -> tuple:
+        """Select the buffer_shape of whole masks less than buffer_gb that is also a multiple of the chunk_shape."""
+        assert buffer_gb > 0, f"buffer_gb ({buffer_gb}) must be greater than zero!"
+
+        chunk_size_bytes = math.prod((chunk_shape[0],) + self._maxshape[1:]) * self._dtype.itemsize
+        number_of_chunks_per_buffer = max(math.floor(buffer_gb * 1e9 / chunk_size_bytes), 1)
+        number_of_masks_per_buffer = min(number_of_chunks_per_buffer * chunk_shape[0], self._maxshape[0])
+
+        return (number_of_masks_per_buffer,) + self._maxshape[1:]
+
+    def _get_pixel_masks(self, roi_selection: slice) -> list[np.ndarray]:
+        # A buffer may be split along the image axes, in which case its ROIs are shared by consecutive buffers
+        if self._pixel_masks_selection != roi_selection:
+            roi_ids = self.roi_ids[roi_selection]
+            if self.background:
+                self._pixel_masks = self.segmentation_extractor.get_background_pixel_masks(background_ids=roi_ids)
+            else:
+                self._pixel_masks = self.segmentation_extractor.get_roi_pixel_masks(roi_ids=roi_ids)
+            self._pixel_masks_selection = roi_selection
+
+        return self._pixel_masks
+
+    def _get_dtype(self) -> np.dtype:
+        # A single dense mask is enough to find the data type of the dense masks of the extractor
+        if self.background:
+            image_mask = self.segmentation_extractor.get_background_image_masks(background_ids=self.roi_ids[:1])
+        else:
+            image_mask = self.segmentation_extractor.get_roi_image_masks(roi_ids=self.roi_ids[:1])
+
+        return image_mask.dtype
+
+    def _get_maxshape(self) -> tuple:
+        # ROIExtractors uses height x width x (depth), but NWB uses width x height x depth, with the ROIs first
+        image_size = tuple(int(axis_length) for axis_length in self.segmentation_extractor.get_image_size())
+        return (len(self.roi_ids),) + image_size[::-1]
+
+    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
+        roi_selection, *image_selection = selection
+        data = np.zeros(
+            shape=tuple(axis_selection.stop - axis_selection.start for axis_selection in selection), dtype=self._dtype
+        )
+
+        image_starts = np.array([axis_selection.start for axis_selection in image_selection])
+        image_stops = np.array([axis_selection.stop for axis_selection in image_selection])
+        for roi_index, pixel_mask in enumerate(self._get_pixel_masks(roi_selection=roi_selection)):
+            pixel_mask = np.asarray(pixel_mask)
+            if pixel_mask.size == 0:
+                continue
+
+            # The coordinates of each pixel, followed by its weight, in the axis order of ROIExtractors
+            coordinates = pixel_mask[:, -2::-1].astype("int64")
+            is_in_selection = np.all((coordinates >= image_starts) & (coordinates < image_stops), axis=1)
+            local_coordinates = coordinates[is_in_selection] - image_starts
+            data[(roi_index, *local_coordinates.T)] = pixel_mask[is_in_selection, -1]
+
+        return data
@@ -4,7 +4,8 @@ import math
 from typing import Optional
 
 import numpy as np
-from roiextractors import ImagingExtractor
+from roiextractors import ImagingExtractor, NumpyImagingExtractor
+from roiextractors.extractors.memmapextractors import MemmapImagingExtractor
 from tqdm import tqdm
 
 from neuroconv.tools.hdmf import GenericDataChunkIterator
@@ -23,6 +24,7 @@ class ImagingExtractorDataChunkIterator(GenericDataChunkIterator):
         display_progress: bool = False,
         progress_bar_class: Optional[tqdm] = None,
         progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
     ):
         """
         Initialize an Iterable object which returns DataChunks with data and their selections on each iteration.
@@ -59,8 +61,14 @@ class ImagingExtractorDataChunkIterator(GenericDataChunkIterator):
         progress_bar_options : dict, optional
             Dictionary of keyword arguments to be passed directly to tqdm.
             See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
         """
         self.imaging_extractor = imaging_extractor
+        self._video = self._get_sliceable_video()
+        self._frame_block_selection = None
+        self._frame_block = None
 
         assert not (buffer_gb and buffer_shape), "Only one of 'buffer_gb' or 'buffer_shape' can be specified!"
         assert not (chunk_mb and chunk_shape), "Only one of 'chunk_mb' or 'chunk_shape' can be specified!"
@@ -88,6 +96,7 @@ class ImagingExtractorDataChunkIterator(GenericDataChunkIterator):
             display_progress=display_progress,
             progress_bar_class=progress_bar_class,
             progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
         )
 
     def _get_default_chunk_shape(self, chunk_mb: float) -> tuple:
@@ -139,10 +148,44 @@ class ImagingExtractorDataChunkIterator(GenericDataChunkIterator):
             video_shape += (depth,)
         return video_shape
 
-    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
-        data = self.imaging_extractor.get_video(
-            start_frame=selection[0].start,
-            end_frame=selection[0].stop,
-        )
+    def _get_sliceable_video(self) -> Optional[np.ndarray]:
+        """
+        Return the array backing the extractor when it can be sliced spatially, otherwise None.
+
+        Only extractors that use the `get_video` of `NumpyImagingExtractor` or `MemmapImagingExtractor` store the video
+        as a single (frames, rows, columns, channels) array, from which a window of each frame can be read directly.
+        """
+        get_video = type(self.imaging_extractor).get_video
+        if get_video not in (NumpyImagingExtractor.get_video, MemmapImagingExtractor.get_video):
+            return None
+
+        video = getattr(self.imaging_extractor, "_video", None)
+        image_size = tuple(self.imaging_extractor.get_image_size())
+        expected_shape = (self.imaging_extractor.get_num_frames(),) + image_size
+        if video is None or len(image_size) != 2 or video.ndim != 4 or video.shape[:3] != expected_shape:
+            return None
+
+        return video
+
+    def _get_frame_block(self, frame_selection: slice) -> np.ndarray:
+        """Read and transpose all frames of a selection, reusing the last block for the remaining spatial tiles."""
+        frame_block_selection = (frame_selection.start, frame_selection.stop)
+        if frame_block_selection == self._frame_block_selection:
+            return self._frame_block
+
+        data = self.imaging_extractor.get_video(start_frame=frame_selection.start, end_frame=frame_selection.stop)
         tranpose_axes = (0, 2, 1) if len(data.shape) == 3 else (0, 2, 1, 3)
-        return data.transpose(tranpose_axes)[(slice(0, self.buffer_shape[0]),) + selection[1:]]
+        frame_block = data.transpose(tranpose_axes)
+
+        # Buffers are generated with the frame axis outermost, so the spatial tiles of a frame block are consecutive
+        # When buffers span the whole image each block is only needed once and is not kept in memory
+        if self.buffer_shape[1:] != self.maxshape[1:]:
+            self._frame_block_selection, self._frame_block = frame_block_selection, frame_block
+        return frame_block
+
+    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
+        if self._video is not None:  # Iterator axes are (frames, width, height), the video is (frames, rows, columns)
+            return self._video[selection[0], selection[2], selection[1], 0].transpose((0, 2, 1))
+
+        frame_block = self._get_frame_block(frame_selection=selection[0])
+        return frame_block[(slice(0, self.buffer_shape[0]),) + selection[1:]]
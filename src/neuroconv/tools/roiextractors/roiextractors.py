@@ -2,12 +2,11 @@ import math
 import warnings
 from collections import defaultdict
 from copy import deepcopy
-from typing import Literal, Optional
+from typing import Iterator, Literal, Optional
 
 import numpy as np
 import psutil
-
-# from hdmf.common import VectorData
+from hdmf.common import VectorData, VectorIndex
 from hdmf.data_utils import DataChunkIterator
 from pydantic import FilePath
 from pynwb import NWBFile
@@ -31,8 +30,9 @@ from roiextractors import (
     SegmentationExtractor,
 )
 
+from .imagemaskdatachunkiterator import ImageMaskDataChunkIterator
 from .imagingextractordatachunkiterator import ImagingExtractorDataChunkIterator
-from ..hdmf import SliceableDataChunkIterator
+from .segmentationextractordatachunkiterator import SegmentationExtractorDataChunkIterator
 from ..nwb_helpers import get_default_nwbfile_metadata, get_module, make_or_load_nwbfile
 from ...utils import (
     DeepDict,
@@ -587,6 +587,31 @@ def _check_if_imaging_fits_into_memory(imaging: ImagingExtractor) -> None:
         raise MemoryError(message)
 
 
+def _get_transposed_frames(imaging: ImagingExtractor, frames_per_block: int) -> Iterator[np.ndarray]:
+    """
+    Yield each frame of an imaging extractor transposed to width x height (x depth), reading blocks of frames at once.
+
+    Each block is read with a single call to `get_video` and transposed as a whole; the frames yielded are views of it.
+    Blocks are limited to about 1 MB (but at least one frame): the frames of larger blocks are copied by hdmf about 5%
+    slower than frames read one at a time, while blocks of small frames are read about twice as fast.
+
+    Parameters
+    ----------
+    imaging : ImagingExtractor
+        The imaging extractor to get the frames from.
+    frames_per_block : int
+        The maximum number of frames to read with each call to `get_video`.
+    """
+    frame_size_in_bytes = math.prod(imaging.get_image_size()) * imaging.get_dtype().itemsize
+    frames_per_block = max(1, min(frames_per_block, 2**20 // frame_size_in_bytes))
+
+    number_of_frames = imaging.get_num_frames()
+    for start_frame in range(0, number_of_frames, frames_per_block):
+        end_frame = min(start_frame + frames_per_block, number_of_frames)
+        video = imaging.get_video(start_frame=start_frame, end_frame=end_frame)
+        yield from video.transpose((0, *range(video.ndim - 1, 0, -1)))
+
+
 def _imaging_frames_to_hdmf_iterator(
     imaging: ImagingExtractor,
     iterator_type: Optional[str] = "v2",
@@ -601,7 +626,7 @@ def _imaging_frames_to_hdmf_iterator(
         The imaging extractor to get the data from.
     iterator_type : {"v2", "v1",  None}, default: 'v2'
         The type of DataChunkIterator to use.
-        'v1' is the original DataChunkIterator of the hdmf data_utils.
+        'v1' is the original DataChunkIterator of the hdmf data_utils, fed with blocks of `buffer_size` frames.
         'v2' is the locally developed SpikeInterfaceRecordingDataChunkIterator, which offers full control over chunking.
         None: write the TimeSeries with no memory chunking.
     iterator_options : dict, optional
@@ -617,10 +642,6 @@ def _imaging_frames_to_hdmf_iterator(
         The frames of the imaging extractor wrapped in an iterator object.
     """
 
-    def data_generator(imaging):
-        for i in range(imaging.get_num_frames()):
-            yield imaging.get_frames(frame_idxs=[i]).squeeze().T
-
     assert iterator_type in ["v1", "v2", None], "'iterator_type' must be either 'v1', 'v2' (recommended), or None."
     iterator_options = dict() if iterator_options is None else iterator_options
 
@@ -631,7 +652,8 @@ def _imaging_frames_to_hdmf_iterator(
     if iterator_type == "v1":
         if "buffer_size" not in iterator_options:
             iterator_options.update(buffer_size=10)
-        return DataChunkIterator(data=data_generator(imaging), **iterator_options)
+        frames = _get_transposed_frames(imaging=imaging, frames_per_block=iterator_options["buffer_size"])
+        return DataChunkIterator(data=frames, **iterator_options)
 
     return ImagingExtractorDataChunkIterator(imaging_extractor=imaging, **iterator_options)
 
@@ -929,6 +951,7 @@ def add_plane_segmentation_to_nwbfile(
     mask_type: Optional[str] = "image",  # Optional[Literal["image", "pixel"]]
     iterator_options: Optional[dict] = None,
     compression_options: Optional[dict] = None,  # TODO: remove completely after 10/1/2024
+    max_image_mask_gb: Optional[float] = None,
 ) -> NWBFile:
     """
     Adds the plane segmentation specified by the metadata to the image segmentation.
@@ -965,8 +988,13 @@ def add_plane_segmentation_to_nwbfile(
 
         Specify your choice between these two as mask_type='image', 'pixel', 'voxel', or None.
         If None, the mask information is not written to the NWB file.
+        Image masks are written through an ImageMaskDataChunkIterator, which fills in each buffer from the pixel masks
+        of its ROIs; if they are larger than `max_image_mask_gb`, pixel masks are written instead, with a warning.
     iterator_options : dict, optional
         The options to use when iterating over the image masks of the segmentation extractor.
+    max_image_mask_gb : float, optional
+        The largest size of the image masks, in gigabytes, to write as image masks when mask_type='image'.
+        Defaults to the memory available when the masks are written.
 
     Returns
     -------
@@ -987,17 +1015,23 @@ def add_plane_segmentation_to_nwbfile(
     default_plane_segmentation_index = 0
     roi_ids = segmentation_extractor.get_roi_ids()
     if include_roi_acceptance:
-        accepted_ids = [int(roi_id in segmentation_extractor.get_accepted_list()) for roi_id in roi_ids]
-        rejected_ids = [int(roi_id in segmentation_extractor.get_rejected_list()) for roi_id in roi_ids]
+        accepted_ids = np.isin(roi_ids, segmentation_extractor.get_accepted_list()).astype(int)
+        rejected_ids = np.isin(roi_ids, segmentation_extractor.get_rejected_list()).astype(int)
     else:
         accepted_ids, rejected_ids = None, None
+    image_or_pixel_masks = None
     if mask_type == "image":
-        image_or_pixel_masks = segmentation_extractor.get_roi_image_masks()
-    elif mask_type == "pixel" or mask_type == "voxel":
+        image_or_pixel_masks = _get_image_mask_iterator(
+            segmentation_extractor=segmentation_extractor,
+            background=False,
+            iterator_options=iterator_options,
+            max_image_mask_gb=max_image_mask_gb,
+        )
+        if image_or_pixel_masks is None:
+            mask_type = "pixel"
+    if mask_type == "pixel" or mask_type == "voxel":
         image_or_pixel_masks = segmentation_extractor.get_roi_pixel_masks()
-    elif mask_type is None:
-        image_or_pixel_masks = None
-    else:
+    elif mask_type not in ("image", None):
         raise AssertionError(
             "Keyword argument 'mask_type' must be one of either 'image', 'pixel', 'voxel', "
             f"or None (to not write any masks)! Received '{mask_type}'."
@@ -1026,6 +1060,104 @@ def add_plane_segmentation_to_nwbfile(
     return nwbfile
 
 
+def _get_image_mask_iterator(
+    segmentation_extractor: SegmentationExtractor,
+    background: bool,
+    iterator_options: Optional[dict] = None,
+    max_image_mask_gb: Optional[float] = None,
+) -> Optional[ImageMaskDataChunkIterator]:
+    """
+    Wrap the image masks of the ROIs (or background components) of a segmentation extractor into an iterator.
+
+    The iterator fills in each buffer from the sparse pixel masks of its ROIs. If the dense image masks are larger than
+    `max_image_mask_gb` (by default, the available memory, beyond which they could hardly be read back from the file
+    either), a warning is raised and None is returned, in which case the pixel masks are written instead.
+
+    Parameters
+    ----------
+    segmentation_extractor : SegmentationExtractor
+        The segmentation extractor to get the masks from.
+    background : bool
+        Whether to get the masks of the background components instead of those of the ROIs.
+    iterator_options : dict, optional
+        The options of the ImageMaskDataChunkIterator.
+    max_image_mask_gb : float, optional
+        The largest size of the image masks, in gigabytes, to write as image masks.
+        Defaults to the memory available when the masks are written.
+
+    Returns
+    -------
+    ImageMaskDataChunkIterator or None
+        The iterator over the image masks, or None if they are to be written as pixel masks.
+    """
+    iterator_options = iterator_options or dict()
+    image_masks = ImageMaskDataChunkIterator(
+        segmentation_extractor=segmentation_extractor, background=background, **iterator_options
+    )
+
+    image_masks_size_in_bytes = math.prod(image_masks.maxshape) * image_masks.dtype.itemsize
+    if max_image_mask_gb is not None:
+        if image_masks_size_in_bytes > max_image_mask_gb * 1e9:
+            warnings.warn(
+                f"Specified mask_type='image', but the image masks are "
+                f"{human_readable_size(image_masks_size_in_bytes, binary=True)}, more than "
+                f"max_image_mask_gb={max_image_mask_gb}. Using mask_type='pixel' instead."
+            )
+            return None
+
+        return image_masks
+
+    available_memory_in_bytes = psutil.virtual_memory().available
+    if image_masks_size_in_bytes > available_memory_in_bytes:
+        warnings.warn(
+            f"Specified mask_type='image', but the image masks are "
+            f"{human_readable_size(image_masks_size_in_bytes, binary=True)} while only "
+            f"{human_readable_size(available_memory_in_bytes, binary=True)} are available. "
+            "Using mask_type='pixel' instead."
+        )
+        return None
+
+    return image_masks
+
+
+def _get_pixel_mask_columns(pixel_masks: list[np.ndarray], mask_type: Literal["pixel", "voxel"]) -> list:
+    """
+    Build the ragged pixel or voxel mask column of a PlaneSegmentation from the masks of all ROIs at once.
+
+    The masks are concatenated into a single structured array with the compound dtype of the NWB schema, and the end
+    offsets of each ROI form the accompanying index, instead of adding every ROI (and pixel) one at a time.
+
+    Parameters
+    ----------
+    pixel_masks : list of numpy.ndarray
+        The mask of each ROI, with shape (number_of_pixels, 3) for pixel masks or (number_of_voxels, 4) for voxel masks.
+    mask_type : {'pixel', 'voxel'}
+        The type of the masks.
+
+    Returns
+    -------
+    list
+        The VectorData holding the masks and the VectorIndex delimiting the masks of each ROI.
+    """
+    coordinate_names = ("x", "y") if mask_type == "pixel" else ("x", "y", "z")
+    dtype = np.dtype([(name, "uint32") for name in coordinate_names] + [("weight", "float32")])
+
+    stacked_masks = np.concatenate([np.asarray(pixel_mask).reshape(-1, len(dtype)) for pixel_mask in pixel_masks])
+    data = np.empty(shape=stacked_masks.shape[0], dtype=dtype)
+    for field_index, field_name in enumerate(dtype.names):
+        data[field_name] = stacked_masks[:, field_index]
+
+    mask_column_name = f"{mask_type}_mask"
+    mask_description = f"{mask_type.capitalize()} masks for each ROI."
+    mask_column = VectorData(name=mask_column_name, description=mask_description, data=data)
+    mask_index = VectorIndex(
+        name=f"{mask_column_name}_index",
+        data=np.cumsum([len(pixel_mask) for pixel_mask in pixel_masks]),
+        target=mask_column,
+    )
+    return [mask_column, mask_index]
+
+
 def _add_plane_segmentation(
     background_or_roi_ids: list,
     image_or_pixel_masks: np.ndarray,
@@ -1092,7 +1224,7 @@ def _add_plane_segmentation(
             plane_segmentation.add_column(
                 name="image_mask",
                 description="Image masks for each ROI.",
-                data=image_or_pixel_masks.T,
+                data=image_or_pixel_masks,
             )
         elif mask_type == "pixel" or mask_type == "voxel":
             pixel_masks = image_or_pixel_masks
@@ -1115,11 +1247,8 @@ def _add_plane_segmentation(
                 )
                 mask_type = "pixel"
 
-            mask_type_kwarg = f"{mask_type}_mask"
-            plane_segmentation = PlaneSegmentation(**plane_segmentation_kwargs)
-
-            for roi_id, pixel_mask in zip(roi_ids, pixel_masks):
-                plane_segmentation.add_roi(**{"id": roi_id, mask_type_kwarg: [tuple(x) for x in pixel_mask]})
+            mask_columns = _get_pixel_mask_columns(pixel_masks=pixel_masks, mask_type=mask_type)
+            plane_segmentation = PlaneSegmentation(id=roi_ids, columns=mask_columns, **plane_segmentation_kwargs)
 
         if include_roi_centroids:
             # ROIExtractors uses height x width x (depth), but NWB uses width x height x depth
@@ -1188,6 +1317,7 @@ def add_background_plane_segmentation_to_nwbfile(
     mask_type: Optional[str] = "image",  # Optional[Literal["image", "pixel"]]
     iterator_options: Optional[dict] = None,
     compression_options: Optional[dict] = None,  # TODO: remove completely after 10/1/2024
+    max_image_mask_gb: Optional[float] = None,
 ) -> NWBFile:
     """
     Add background plane segmentation data from a SegmentationExtractor object to an NWBFile.
@@ -1208,6 +1338,9 @@ def add_background_plane_segmentation_to_nwbfile(
         Options for iterating over the segmentation data, by default None.
     compression_options : dict, optional
         Deprecated: options for compression; will be removed after 2024-10-01, by default None.
+    max_image_mask_gb : float, optional
+        The largest size of the image masks, in gigabytes, to write as image masks when mask_type="image"; larger
+        masks are written as pixel masks, with a warning. Defaults to the memory available when the masks are written.
 
     Returns
     -------
@@ -1227,13 +1360,19 @@ def add_background_plane_segmentation_to_nwbfile(
 
     default_plane_segmentation_index = 1
     background_ids = segmentation_extractor.get_background_ids()
+    image_or_pixel_masks = None
     if mask_type == "image":
-        image_or_pixel_masks = segmentation_extractor.get_background_image_masks()
-    elif mask_type == "pixel" or mask_type == "voxel":
+        image_or_pixel_masks = _get_image_mask_iterator(
+            segmentation_extractor=segmentation_extractor,
+            background=True,
+            iterator_options=iterator_options,
+            max_image_mask_gb=max_image_mask_gb,
+        )
+        if image_or_pixel_masks is None:
+            mask_type = "pixel"
+    if mask_type == "pixel" or mask_type == "voxel":
         image_or_pixel_masks = segmentation_extractor.get_background_pixel_masks()
-    elif mask_type is None:
-        image_or_pixel_masks = None
-    else:
+    elif mask_type not in ("image", None):
         raise AssertionError(
             "Keyword argument 'mask_type' must be one of either 'image', 'pixel', 'voxel', "
             f"or None (to not write any masks)! Received '{mask_type}'."
@@ -1333,20 +1472,17 @@ def add_fluorescence_traces_to_nwbfile(
 
     default_plane_segmentation_index = 0
 
-    traces_to_add = segmentation_extractor.get_traces_dict()
     # Filter empty data and background traces
-    traces_to_add = {
-        trace_name: trace for trace_name, trace in traces_to_add.items() if trace is not None and trace.size != 0
-    }
-    if include_background_segmentation:
-        traces_to_add.pop("neuropil")
-    if not traces_to_add:
+    trace_names = _get_trace_names_with_data(segmentation_extractor=segmentation_extractor)
+    if include_background_segmentation and "neuropil" in trace_names:
+        trace_names.remove("neuropil")
+    if not trace_names:
         return nwbfile
 
     roi_ids = segmentation_extractor.get_roi_ids()
     nwbfile = _add_fluorescence_traces_to_nwbfile(
         segmentation_extractor=segmentation_extractor,
-        traces_to_add=traces_to_add,
+        trace_names=trace_names,
         background_or_roi_ids=roi_ids,
         nwbfile=nwbfile,
         metadata=metadata,
@@ -1357,9 +1493,24 @@ def add_fluorescence_traces_to_nwbfile(
     return nwbfile
 
 
+def _get_trace_names_with_data(segmentation_extractor: SegmentationExtractor) -> list[str]:
+    """
+    Return the names of the traces of the segmentation extractor that are not empty.
+
+    Only the first frame of each trace is read, so whether the traces are otherwise loaded depends on the extractor.
+    """
+    trace_names = []
+    for trace_name in ("raw", "dff", "neuropil", "deconvolved", "denoised"):
+        first_frame = segmentation_extractor.get_traces(start_frame=0, end_frame=1, name=trace_name)
+        if first_frame is not None and np.size(first_frame) != 0:
+            trace_names.append(trace_name)
+
+    return trace_names
+
+
 def _add_fluorescence_traces_to_nwbfile(
     segmentation_extractor: SegmentationExtractor,
-    traces_to_add: dict,
+    trace_names: list[str],
     background_or_roi_ids: list,
     nwbfile: NWBFile,
     metadata: Optional[dict],
@@ -1412,20 +1563,18 @@ def _add_fluorescence_traces_to_nwbfile(
         roi_response_series_kwargs.update(rate=rate)
 
     trace_to_data_interface = defaultdict()
-    traces_to_add_to_fluorescence_data_interface = [
-        trace_name for trace_name in traces_to_add.keys() if trace_name != "dff"
-    ]
+    traces_to_add_to_fluorescence_data_interface = [trace_name for trace_name in trace_names if trace_name != "dff"]
     if traces_to_add_to_fluorescence_data_interface:
         fluorescence_data_interface = _get_segmentation_data_interface(
             nwbfile=nwbfile, data_interface_name=fluorescence_name
         )
         trace_to_data_interface.default_factory = lambda: fluorescence_data_interface
 
-    if "dff" in traces_to_add:
+    if "dff" in trace_names:
         df_over_f_data_interface = _get_segmentation_data_interface(nwbfile=nwbfile, data_interface_name=df_over_f_name)
         trace_to_data_interface.update(dff=df_over_f_data_interface)
 
-    for trace_name, trace in traces_to_add.items():
+    for trace_name in trace_names:
         # Decide which data interface to use based on the trace name
         data_interface = trace_to_data_interface[trace_name]
         data_interface_metadata = df_over_f_metadata if isinstance(data_interface, DfOverF) else fluorescence_metadata
@@ -1447,7 +1596,9 @@ def _add_fluorescence_traces_to_nwbfile(
 
         # Build the roi response series
         roi_response_series_kwargs.update(
-            data=SliceableDataChunkIterator(trace, **iterator_options),
+            data=SegmentationExtractorDataChunkIterator(
+                segmentation_extractor=segmentation_extractor, trace_name=trace_name, **iterator_options
+            ),
             rois=roi_table_region,
             **trace_metadata,
         )
@@ -1459,6 +1610,36 @@ def _add_fluorescence_traces_to_nwbfile(
     return nwbfile
 
 
+def _get_roi_id_to_row_index(plane_segmentation: PlaneSegmentation) -> dict:
+    """
+    Map the ID of each ROI of a plane segmentation to its row in the table.
+
+    The map is kept on the plane segmentation and only extended with the rows added since it was last requested,
+    so that the region of each series of traces (raw, dF/F, deconvolved, neuropil, ...) is not found by a list search
+    of every ROI over the whole table.
+
+    Parameters
+    ----------
+    plane_segmentation : pynwb.ophys.PlaneSegmentation
+        The plane segmentation to index.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each ROI ID to the index of the first row with that ID.
+    """
+    number_of_indexed_rows, roi_id_to_row_index = getattr(plane_segmentation, "_roi_id_to_row_index", (0, dict()))
+    if number_of_indexed_rows > len(plane_segmentation.id):  # Rows cannot be removed, but rebuild the map if they were
+        number_of_indexed_rows, roi_id_to_row_index = 0, dict()
+
+    roi_ids = plane_segmentation.id.data[number_of_indexed_rows:]
+    for row_index, roi_id in enumerate(roi_ids, start=number_of_indexed_rows):
+        roi_id_to_row_index.setdefault(roi_id, row_index)
+
+    plane_segmentation._roi_id_to_row_index = (len(plane_segmentation.id), roi_id_to_row_index)
+    return roi_id_to_row_index
+
+
 def _create_roi_table_region(
     segmentation_extractor: SegmentationExtractor,
     background_or_roi_ids: list,
@@ -1496,11 +1677,11 @@ def _create_roi_table_region(
     plane_segmentation = image_segmentation.plane_segmentations[plane_segmentation_name]
 
     # Create a reference for ROIs from the plane segmentation
-    id_list = list(plane_segmentation.id)
+    roi_id_to_row_index = _get_roi_id_to_row_index(plane_segmentation=plane_segmentation)
 
     imaging_plane_name = plane_segmentation.imaging_plane.name
     roi_table_region = plane_segmentation.create_roi_table_region(
-        region=[id_list.index(id) for id in background_or_roi_ids],
+        region=[roi_id_to_row_index[roi_id] for roi_id in background_or_roi_ids],
         description=f"The ROIs for {imaging_plane_name}.",
     )
 
@@ -1602,20 +1783,19 @@ def add_background_fluorescence_traces_to_nwbfile(
 
     default_plane_segmentation_index = 1
 
-    traces_to_add = segmentation_extractor.get_traces_dict()
-    # Filter empty data and background traces
-    traces_to_add = {
-        trace_name: trace
-        for trace_name, trace in traces_to_add.items()
-        if trace is not None and trace.size != 0 and trace_name == "neuropil"
-    }
-    if not traces_to_add:
+    # Only the neuropil traces belong to the background plane segmentation
+    trace_names = [
+        trace_name
+        for trace_name in _get_trace_names_with_data(segmentation_extractor=segmentation_extractor)
+        if trace_name == "neuropil"
+    ]
+    if not trace_names:
         return nwbfile
 
     background_ids = segmentation_extractor.get_background_ids()
     nwbfile = _add_fluorescence_traces_to_nwbfile(
         segmentation_extractor=segmentation_extractor,
-        traces_to_add=traces_to_add,
+        trace_names=trace_names,
         background_or_roi_ids=background_ids,
         nwbfile=nwbfile,
         metadata=metadata,
@@ -1777,6 +1957,7 @@ def add_segmentation_to_nwbfile(
     mask_type: Optional[str] = "image",  # Literal["image", "pixel"]
     iterator_options: Optional[dict] = None,
     compression_options: Optional[dict] = None,  # TODO: remove completely after 10/1/2024
+    max_image_mask_gb: Optional[float] = None,
 ) -> NWBFile:
     """
     Add segmentation data from a SegmentationExtractor object to an NWBFile.
@@ -1805,6 +1986,9 @@ def add_segmentation_to_nwbfile(
         Options for iterating over the data, by default None.
     compression_options : dict, optional
         Deprecated: options for compression; will be removed after 2024-10-01, by default None.
+    max_image_mask_gb : float, optional
+        The largest size of the image masks, in gigabytes, to write as image masks when mask_type="image"; larger
+        masks are written as pixel masks, with a warning. Defaults to the memory available when the masks are written.
 
     Returns
     -------
@@ -1837,6 +2021,7 @@ def add_segmentation_to_nwbfile(
         include_roi_acceptance=include_roi_acceptance,
         mask_type=mask_type,
         iterator_options=iterator_options,
+        max_image_mask_gb=max_image_mask_gb,
     )
     if include_background_segmentation:
         add_background_plane_segmentation_to_nwbfile(
@@ -1846,6 +2031,7 @@ def add_segmentation_to_nwbfile(
             background_plane_segmentation_name=background_plane_segmentation_name,
             mask_type=mask_type,
             iterator_options=iterator_options,
+            max_image_mask_gb=max_image_mask_gb,
         )
 
     # Add fluorescence traces:
@@ -0,0 +1,150 @@
+"""General purpose iterator for the traces of all SegmentationExtractor data."""
+
+import math
+from typing import Optional
+
+import numpy as np
+from roiextractors import SegmentationExtractor
+from tqdm import tqdm
+
+from neuroconv.tools.hdmf import GenericDataChunkIterator
+
+
+class SegmentationExtractorDataChunkIterator(GenericDataChunkIterator):
+    """
+    DataChunkIterator for a trace of a SegmentationExtractor, with shape (number of frames, number of ROIs).
+
+    Each buffer is read with `get_traces` over its window of frames only, so the traces of all ROIs over the whole
+    session are never held in memory by the iterator.
+    """
+
+    def __init__(
+        self,
+        segmentation_extractor: SegmentationExtractor,
+        trace_name: str = "raw",
+        buffer_gb: Optional[float] = None,
+        buffer_shape: Optional[tuple] = None,
+        chunk_mb: Optional[float] = None,
+        chunk_shape: Optional[tuple] = None,
+        display_progress: bool = False,
+        progress_bar_class: Optional[tqdm] = None,
+        progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
+    ):
+        """
+        Initialize an Iterable object which returns DataChunks with data and their selections on each iteration.
+
+        Parameters
+        ----------
+        segmentation_extractor : SegmentationExtractor
+            The SegmentationExtractor object which handles the data access.
+        trace_name : str, default: "raw"
+            The name of the trace to iterate over, as in the keys of `get_traces_dict` (e.g., "raw", "dff",
+            "neuropil", "deconvolved").
+        buffer_gb : float, optional
+            The upper bound on size in gigabytes (GB) of each selection from the iteration.
+            The buffer_shape will be set implicitly by this argument.
+            Cannot be set if `buffer_shape` is also specified.
+            The default is 1GB.
+        buffer_shape : tuple, optional
+            Manual specification of buffer shape to return on each iteration.
+            Must be a multiple of chunk_shape along each axis.
+            Cannot be set if `buffer_gb` is also specified.
+            The default is None.
+        chunk_mb : float, optional
+            The upper bound on size in megabytes (MB) of the internal chunk for the HDF5 dataset.
+            The chunk_shape will be set implicitly by this argument.
+            Cannot be set if `chunk_shape` is also specified.
+            The default is 10MB, as recommended by the HDF5 group.
+            For more details, search the hdf5 documentation for "Improving IO Performance Compressed Datasets".
+        chunk_shape : tuple, optional
+            Manual specification of the internal chunk shape for the HDF5 dataset.
+            Cannot be set if `chunk_mb` is also specified.
+            The default is None.
+        display_progress : bool, default=False
+            Display a progress bar with iteration rate and estimated completion time.
+        progress_bar_class : dict, optional
+            The progress bar class to use.
+            Defaults to tqdm.tqdm if the TQDM package is installed.
+        progress_bar_options : dict, optional
+            Dictionary of keyword arguments to be passed directly to tqdm.
+            See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
+        """
+        self.segmentation_extractor = segmentation_extractor
+        self.trace_name = trace_name
+        self._frame_block_selection = None
+        self._frame_block = None
+
+        # The first frame gives the number of ROIs and the data type of the trace without reading the rest of it
+        first_frame = np.asarray(segmentation_extractor.get_traces(start_frame=0, end_frame=1, name=trace_name))
+        self._number_of_rois = first_frame.shape[1]
+        self._trace_dtype = first_frame.dtype
+
+        assert not (buffer_gb and buffer_shape), "Only one of 'buffer_gb' or 'buffer_shape' can be specified!"
+        assert not (chunk_mb and chunk_shape), "Only one of 'chunk_mb' or 'chunk_shape' can be specified!"
+
+        if chunk_mb and buffer_gb:
+            assert chunk_mb * 1e6 <= buffer_gb * 1e9, "chunk_mb must be less than or equal to buffer_gb!"
+
+        if chunk_mb is None and chunk_shape is None:
+            chunk_mb = 10.0
+
+        self._maxshape = self._get_maxshape()
+        self._dtype = self._get_dtype()
+        if chunk_shape is None:
+            chunk_shape = self.estimate_default_chunk_shape(
+                chunk_mb=chunk_mb, maxshape=self._maxshape, dtype=self._dtype
+            )
+
+        if buffer_gb is None and buffer_shape is None:
+            buffer_gb = 1.0
+
+        if buffer_shape is None:
+            buffer_shape = self._get_scaled_buffer_shape(buffer_gb=buffer_gb, chunk_shape=chunk_shape)
+
+        super().__init__(
+            buffer_shape=buffer_shape,
+            chunk_shape=chunk_shape,
+            display_progress=display_progress,
+            progress_bar_class=progress_bar_class,
+            progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
+        )
+
+    def _get_scaled_buffer_shape(self, buffer_gb: float, chunk_shape: tuple) -> tuple:
+        """Select the buffer_shape of all ROIs less than buffer_gb that is also a multiple of the chunk_shape."""
+        assert buffer_gb > 0, f"buffer_gb ({buffer_gb}) must be greater than zero!"
+
+        number_of_frames, number_of_rois = self._maxshape
+        chunk_row_size_bytes = chunk_shape[0] * number_of_rois * self._dtype.itemsize
+        number_of_chunks_per_buffer = max(math.floor(buffer_gb * 1e9 / chunk_row_size_bytes), 1)
+
+        return (min(number_of_chunks_per_buffer * chunk_shape[0], number_of_frames), number_of_rois)
+
+    def _get_dtype(self) -> np.dtype:
+        return self._trace_dtype
+
+    def _get_maxshape(self) -> tuple:
+        return (self.segmentation_extractor.get_num_frames(), self._number_of_rois)
+
+    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
+        frame_selection, roi_selection = selection
+        if roi_selection.stop - roi_selection.start == self._number_of_rois:
+            return self._get_frame_block(frame_selection=frame_selection)
+
+        # Buffers split along the ROIs share the frames of consecutive buffers, which are then read only once
+        if self._frame_block_selection != frame_selection:
+            self._frame_block = self._get_frame_block(frame_selection=frame_selection)
+            self._frame_block_selection = frame_selection
+
+        return self._frame_block[:, roi_selection]
+
+    def _get_frame_block(self, frame_selection: slice) -> np.ndarray:
+        # The traces of all ROIs are read at once, since `get_traces` looks up each of the requested ROI IDs in a list
+        traces = self.segmentation_extractor.get_traces(
+            start_frame=frame_selection.start, end_frame=frame_selection.stop, name=self.trace_name
+        )
+        return np.asarray(traces)
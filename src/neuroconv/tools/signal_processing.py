@@ -1,12 +1,120 @@
-from typing import Optional
+import math
+from typing import Iterator, Optional
 
 import numpy as np
 
 
-def get_rising_frames_from_ttl(trace: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+def _iterate_trace_blocks(trace: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    """Yield consecutive blocks of at most `chunk_size` frames of a one-dimensional (possibly lazy) trace."""
+    shape = tuple(trace.shape)
+    number_of_frames = int(np.max(shape))
+    # Shapes like (1, x, 1, 1) might result from slicing patterns and are allowed
+    if math.prod(shape) != number_of_frames:
+        raise ValueError(f"This function expects a one-dimensional array! Received shape of {trace.shape}.")
+
+    frame_axis = int(np.argmax(shape))
+    for start_frame in range(0, number_of_frames, chunk_size):
+        selection = tuple(
+            slice(start_frame, start_frame + chunk_size) if axis == frame_axis else 0 for axis in range(len(shape))
+        )
+        yield np.ravel(trace[selection])
+
+
+class _TTLEdgeDetector:
+    """
+    Detect the rising and falling edges of a TTL signal one block of frames at a time.
+
+    The state of the signal at the end of each block is carried over to the next one, so that edges falling exactly on
+    a block boundary are found once and the result does not depend on the size of the blocks.
+    """
+
+    def __init__(self, threshold: float, hysteresis: float = 0.0):
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self._previous_state = None
+        self._number_of_frames = 0
+
+    def _get_states(self, block: np.ndarray) -> Optional[np.ndarray]:
+        if self.hysteresis == 0.0:
+            return np.sign(block - self.threshold)
+
+        # Frames within the band around the threshold keep the state of the last frame outside of it
+        levels = (block > self.threshold + self.hysteresis / 2).astype("int8")
+        levels -= block < self.threshold - self.hysteresis / 2
+        last_decided_frames = np.maximum.accumulate(np.where(levels != 0, np.arange(len(block)), -1))
+
+        initial_state = self._previous_state
+        if initial_state is None:  # A signal starting within the band takes its first state from outside of it
+            decided_frames = np.flatnonzero(levels)
+            if len(decided_frames) == 0:
+                return None
+            initial_state = levels[decided_frames[0]]
+
+        return np.where(last_decided_frames >= 0, levels[last_decided_frames], initial_state)
+
+    def update(self, block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the frame indices, counted from the start of the signal, of the rising and falling edges in a block.
+
+        Parameters
+        ----------
+        block : numpy.ndarray
+            The next frames of the TTL signal.
+
+        Returns
+        -------
+        rising_frames, falling_frames : numpy.ndarray
+            The frame indices of rising and falling events.
+        """
+        states = self._get_states(block=block)
+        frame_offset = self._number_of_frames
+        self._number_of_frames += len(block)
+        if states is None or len(states) == 0:
+            return np.empty(shape=0, dtype="int64"), np.empty(shape=0, dtype="int64")
+
+        if self._previous_state is None:
+            diff = np.diff(states)
+            frame_offset += 1
+        else:
+            diff = np.diff(states, prepend=self._previous_state)
+        self._previous_state = states[-1]
+
+        rising_frames = np.flatnonzero(diff > 0) + frame_offset
+        falling_frames = np.flatnonzero(diff < 0) + frame_offset
+        return rising_frames, falling_frames
+
+
+def _get_edge_frames_from_ttl(
+    trace: np.ndarray, threshold: Optional[float], hysteresis: float, chunk_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    if threshold is None:  # The mean of the trace, accumulated over the blocks
+        total = 0.0
+        number_of_frames = 0
+        for block in _iterate_trace_blocks(trace=trace, chunk_size=chunk_size):
+            total += np.sum(block, dtype="float64")
+            number_of_frames += len(block)
+        threshold = total / max(number_of_frames, 1)
+
+    edge_detector = _TTLEdgeDetector(threshold=threshold, hysteresis=hysteresis)
+    all_rising_frames = [np.empty(shape=0, dtype="int64")]
+    all_falling_frames = [np.empty(shape=0, dtype="int64")]
+    for block in _iterate_trace_blocks(trace=trace, chunk_size=chunk_size):
+        rising_frames, falling_frames = edge_detector.update(block=block)
+        all_rising_frames.append(rising_frames)
+        all_falling_frames.append(falling_frames)
+
+    return np.concatenate(all_rising_frames), np.concatenate(all_falling_frames)
+
+
+def get_rising_frames_from_ttl(
+    trace: np.ndarray, threshold: Optional[float] = None, hysteresis: float = 0.0, chunk_size: int = 1_000_000
+) -> np.ndarray:
     """
     Return the frame indices for rising events in a TTL pulse.
 
+    The trace is processed in blocks of frames, so it may also be any lazily sliceable array (e.g., a memory map or an
+    h5py.Dataset) that is larger than the available memory.
+
     Parameters
     ----------
     trace : numpy.ndarray
@@ -14,29 +122,33 @@ def get_rising_frames_from_ttl(trace: np.ndarray, threshold: Optional[float] = N
     threshold : float, optional
         The threshold used to distinguish on/off states in the trace.
         The mean of the trace is used by default.
+    hysteresis : float, default: 0.0
+        The width of a band centered on the threshold within which the trace keeps its previous on/off state.
+        Use it to debounce noisy (e.g., analog) signals that would otherwise cross the threshold many times per pulse.
+    chunk_size : int, default: 1_000_000
+        The number of frames to process at a time.
 
     Returns
     -------
     rising_frames : numpy.ndarray
         The frame indices of rising events.
     """
-    flattened_trace = np.ravel(trace)  # Shapes like (1, x, 1, 1) might result from slicing patterns and are allowed
-    if np.max(trace.shape) != flattened_trace.shape[0]:  # TODO: when 3.7 dropped, use math.prod to avoid overflow
-        raise ValueError(f"This function expects a one-dimensional array! Received shape of {trace.shape}.")
-
-    threshold = np.mean(trace) if threshold is None else threshold
-
-    sign = np.sign(flattened_trace - threshold)
-    diff = np.diff(sign)
-    rising_frames = np.where(diff > 0)[0] + 1
+    rising_frames, _ = _get_edge_frames_from_ttl(
+        trace=trace, threshold=threshold, hysteresis=hysteresis, chunk_size=chunk_size
+    )
 
     return rising_frames
 
 
-def get_falling_frames_from_ttl(trace: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+def get_falling_frames_from_ttl(
+    trace: np.ndarray, threshold: Optional[float] = None, hysteresis: float = 0.0, chunk_size: int = 1_000_000
+) -> np.ndarray:
     """
     Return the frame indices for falling events in a TTL pulse.
 
+    The trace is processed in blocks of frames, so it may also be any lazily sliceable array (e.g., a memory map or an
+    h5py.Dataset) that is larger than the available memory.
+
     Parameters
     ----------
     trace : numpy.ndarray
@@ -44,20 +156,19 @@ def get_falling_frames_from_ttl(trace: np.ndarray, threshold: Optional[float] =
     threshold : float, optional
         The threshold used to distinguish on/off states in the trace.
         The mean of the trace is used by default.
+    hysteresis : float, default: 0.0
+        The width of a band centered on the threshold within which the trace keeps its previous on/off state.
+        Use it to debounce noisy (e.g., analog) signals that would otherwise cross the threshold many times per pulse.
+    chunk_size : int, default: 1_000_000
+        The number of frames to process at a time.
 
     Returns
     -------
     falling_frames : numpy.ndarray
         The frame indices of falling events.
     """
-    flattened_trace = np.ravel(trace)  # Shapes like (1, x, 1, 1) might result from slicing patterns and are allowed
-    if np.max(trace.shape) != flattened_trace.shape[0]:  # TODO: when 3.7 dropped, use math.prod to avoid overflow
-        raise ValueError(f"This function expects a one-dimensional array! Received shape of {trace.shape}.")
-
-    threshold = np.mean(trace) if threshold is None else threshold
-
-    sign = np.sign(flattened_trace - threshold)
-    diff = np.diff(sign)
-    falling_frames = np.where(diff < 0)[0] + 1
+    _, falling_frames = _get_edge_frames_from_ttl(
+        trace=trace, threshold=threshold, hysteresis=hysteresis, chunk_size=chunk_size
+    )
 
     return falling_frames
@@ -12,6 +12,7 @@ from spikeinterface import BaseRecording, BaseSorting, SortingAnalyzer
 
 from .spikeinterfacerecordingdatachunkiterator import (
     SpikeInterfaceRecordingDataChunkIterator,
+    SpikeInterfaceRecordingTimestampsDataChunkIterator,
 )
 from ..nwb_helpers import get_module, make_or_load_nwbfile
 from ...utils import (
@@ -261,11 +262,13 @@ def _get_group_name(recording: BaseRecording) -> np.ndarray:
     return group_names
 
 
-def _get_electrodes_table_global_ids(nwbfile: pynwb.NWBFile) -> list[str]:
+def _get_electrodes_table_global_id_to_index(nwbfile: pynwb.NWBFile) -> dict[str, int]:
     """
-    Generate a list of global identifiers for channels in the electrode table of an NWB file.
+    Map the global identifiers of the channels in the electrode table of an NWB file to their row indices.
 
     These identifiers are used to map electrodes across writing operations.
+    The map is kept on the electrodes table and only extended with the rows added since it was last requested,
+    so that repeated lookups (e.g., one per probe or per recording) do not rebuild it from the whole table.
 
     Parameters
     ----------
@@ -274,23 +277,30 @@ def _get_electrodes_table_global_ids(nwbfile: pynwb.NWBFile) -> list[str]:
 
     Returns
     -------
-    list[str]
-        A list of unique keys, each representing a combination of channel name and
-        group name from the electrodes table. If the electrodes table or the
-        necessary columns are not present, an empty list is returned.
+    dict[str, int]
+        A dictionary mapping each unique key, a combination of channel name and group name from the electrodes table,
+        to the index of the first row with that key. If the electrodes table or the necessary columns are not present,
+        an empty dictionary is returned.
     """
 
-    if nwbfile.electrodes is None:
-        return []
+    electrodes_table = nwbfile.electrodes
+    if electrodes_table is None:
+        return dict()
+
+    if "channel_name" not in electrodes_table.colnames or "group_name" not in electrodes_table.colnames:
+        return dict()
 
-    if "channel_name" not in nwbfile.electrodes.colnames or "group_name" not in nwbfile.electrodes.colnames:
-        return []
+    number_of_indexed_rows, global_id_to_index = getattr(electrodes_table, "_global_id_to_index", (0, dict()))
+    if number_of_indexed_rows > len(electrodes_table):  # Rows cannot be removed, but rebuild the map if they were
+        number_of_indexed_rows, global_id_to_index = 0, dict()
 
-    channel_names = nwbfile.electrodes["channel_name"][:]
-    group_names = nwbfile.electrodes["group_name"][:]
-    unique_keys = [f"{ch_name}_{gr_name}" for ch_name, gr_name in zip(channel_names, group_names)]
+    channel_names = electrodes_table["channel_name"].data[number_of_indexed_rows:]
+    group_names = electrodes_table["group_name"].data[number_of_indexed_rows:]
+    for index, (ch_name, gr_name) in enumerate(zip(channel_names, group_names), start=number_of_indexed_rows):
+        global_id_to_index.setdefault(f"{ch_name}_{gr_name}", index)
 
-    return unique_keys
+    electrodes_table._global_id_to_index = (len(electrodes_table), global_id_to_index)
+    return global_id_to_index
 
 
 def _get_electrode_table_indices_for_recording(recording: BaseRecording, nwbfile: pynwb.NWBFile) -> list[int]:
@@ -319,12 +329,74 @@ def _get_electrode_table_indices_for_recording(recording: BaseRecording, nwbfile
     channel_names = _get_channel_name(recording=recording)
     group_names = _get_group_name(recording=recording)
     channel_global_ids = [f"{ch_name}_{gr_name}" for ch_name, gr_name in zip(channel_names, group_names)]
-    table_global_ids = _get_electrodes_table_global_ids(nwbfile=nwbfile)
-    electrode_table_indices = [table_global_ids.index(ch_id) for ch_id in channel_global_ids]
+    table_global_id_to_index = _get_electrodes_table_global_id_to_index(nwbfile=nwbfile)
+    electrode_table_indices = [table_global_id_to_index[ch_id] for ch_id in channel_global_ids]
 
     return electrode_table_indices
 
 
+def _create_electrodes_table(data_to_add: dict[str, dict]) -> pynwb.core.DynamicTable:
+    """
+    Create an electrodes table holding all the channels at once, instead of adding the electrodes one by one.
+
+    Parameters
+    ----------
+    data_to_add : dict
+        Maps each property to a dictionary with its per-channel 'data'; must contain the required columns of the table.
+
+    Returns
+    -------
+    DynamicTable
+        The electrodes table, with the same columns as the one `pynwb.NWBFile.add_electrode` creates.
+    """
+    empty_electrodes_table = pynwb.file.ElectrodeTable()
+    columns = list()
+    for column in empty_electrodes_table.columns:
+        data = list(data_to_add[column.name]["data"])
+        columns.append(pynwb.core.VectorData(name=column.name, description=column.description, data=data))
+    number_of_electrodes = len(columns[0].data)
+
+    return pynwb.core.DynamicTable(
+        name=empty_electrodes_table.name,
+        description=empty_electrodes_table.description,
+        id=list(range(number_of_electrodes)),
+        columns=columns,
+    )
+
+
+def _append_rows_to_electrodes_table(electrodes_table: pynwb.core.DynamicTable, data_to_append: dict[str, list]):
+    """
+    Append electrodes to an existing electrodes table column by column, instead of adding the electrodes one by one.
+
+    Parameters
+    ----------
+    electrodes_table : DynamicTable
+        The electrodes table to extend; the ids of the new rows continue from the number of rows in the table.
+    data_to_append : dict
+        Maps the name of every column of the table to the list of its values for the new rows.
+    """
+    number_of_rows = len(electrodes_table)
+    number_of_new_rows = len(data_to_append["group"])
+    new_ids = list(range(number_of_rows, number_of_rows + number_of_new_rows))
+    if not set(new_ids).isdisjoint(electrodes_table.id[:]):
+        raise ValueError(f"ids {new_ids} overlap with the ids already in the table")
+
+    columns_and_values = [(electrodes_table.id, new_ids)]
+    for column_name in electrodes_table.colnames:
+        # Ragged columns are extended through their index
+        columns_and_values.append((electrodes_table[column_name], data_to_append[column_name]))
+
+    for column, values in columns_and_values:
+        if isinstance(column, pynwb.core.VectorIndex):
+            for value in values:
+                column.add_vector(value)
+        elif isinstance(column.data, np.ndarray):
+            # `extend` stacks the values of an array as a new row instead of appending them
+            column.transform(func=lambda data: np.append(data, np.asarray(values), axis=0))
+        else:
+            column.extend(values)
+
+
 def _get_null_value_for_property(property: str, sample_data: Any, null_values_for_properties: dict[str, Any]) -> Any:
     """
     Retrieve the null value for a given property based on its data type or a provided mapping.
@@ -560,17 +632,27 @@ def add_electrodes_to_nwbfile(
         )
         nul_values_for_rows[property] = null_value
 
-    # We only add new electrodes to the table
-    existing_global_ids = _get_electrodes_table_global_ids(nwbfile=nwbfile)
-    channel_global_ids = [f"{ch_name}_{gr_name}" for ch_name, gr_name in zip(channel_names, group_names)]
-    channel_indices_to_add = [index for index, key in enumerate(channel_global_ids) if key not in existing_global_ids]
-
-    properties_with_data = properties_to_add_by_rows.intersection(data_to_add)
-    for channel_index in channel_indices_to_add:
-        electrode_kwargs = nul_values_for_rows
-        data_dict = {property: data_to_add[property]["data"][channel_index] for property in properties_with_data}
-        electrode_kwargs.update(**data_dict)
-        nwbfile.add_electrode(**electrode_kwargs, enforce_unique_id=True)
+    # We only add new electrodes to the table, all at once if there is no table yet
+    if nwbfile.electrodes is None:
+        nwbfile.electrodes = _create_electrodes_table(data_to_add=data_to_add)
+    else:
+        existing_global_ids = _get_electrodes_table_global_id_to_index(nwbfile=nwbfile)
+        channel_global_ids = [f"{ch_name}_{gr_name}" for ch_name, gr_name in zip(channel_names, group_names)]
+        channel_indices_to_add = [
+            index for index, key in enumerate(channel_global_ids) if key not in existing_global_ids
+        ]
+
+        # Each column is extended once, as checking the ids and every column for ragged data on each added row
+        # makes appending quadratic in the size of the table
+        if channel_indices_to_add:
+            data_to_append = {
+                property: [null_value] * len(channel_indices_to_add)
+                for property, null_value in nul_values_for_rows.items()
+            }
+            for property in properties_to_add_by_rows.intersection(data_to_add):
+                property_data = data_to_add[property]["data"]
+                data_to_append[property] = [property_data[channel_index] for channel_index in channel_indices_to_add]
+            _append_rows_to_electrodes_table(electrodes_table=nwbfile.electrodes, data_to_append=data_to_append)
 
     # The channel_name column as we use channel_name, group_name as a unique identifier
     # We fill previously inexistent values with the electrode table ids
@@ -590,7 +672,7 @@ def add_electrodes_to_nwbfile(
 
     all_indices = np.arange(electrode_table_size)
     indices_for_new_data = _get_electrode_table_indices_for_recording(recording=recording, nwbfile=nwbfile)
-    indices_for_null_values = [index for index in all_indices if index not in indices_for_new_data]
+    indices_for_null_values = np.setdiff1d(all_indices, indices_for_new_data)
     extending_column = len(indices_for_null_values) > 0
 
     # Add properties as columns
@@ -739,6 +821,40 @@ def _recording_traces_to_hdmf_iterator(
     return traces_as_iterator
 
 
+def _recording_timestamps_to_hdmf_iterator(
+    recording: BaseRecording,
+    segment_index: int = 0,
+    starting_time: float = 0.0,
+    iterator_type: Optional[str] = "v2",
+) -> Union[np.ndarray, AbstractDataChunkIterator]:
+    """
+    Wrap the timestamps of a recording segment, shifted by `starting_time`, to be written chunked like its traces.
+
+    Parameters
+    ----------
+    recording : spikeinterface.BaseRecording
+        The recording whose timestamps to write.
+    segment_index : int, default: 0
+        The recording segment of the timestamps.
+    starting_time : float, default: 0.0
+        The offset, in seconds, to add to the timestamps of the recording.
+    iterator_type : {"v2", "v1",  None}, default: 'v2'
+        The iterator type of the traces. If None, the timestamps are returned as an array in memory; otherwise they
+        are computed one buffer at a time by a SpikeInterfaceRecordingTimestampsDataChunkIterator.
+
+    Returns
+    -------
+    numpy.ndarray or SpikeInterfaceRecordingTimestampsDataChunkIterator
+        The shifted timestamps.
+    """
+    if iterator_type is None:
+        return starting_time + recording.get_times(segment_index=segment_index)
+
+    return SpikeInterfaceRecordingTimestampsDataChunkIterator(
+        recording=recording, segment_index=segment_index, starting_time=starting_time
+    )
+
+
 def add_electrical_series(
     recording: BaseRecording,
     nwbfile: pynwb.NWBFile,
@@ -936,9 +1052,13 @@ def add_electrical_series_to_nwbfile(
 
     starting_time = starting_time if starting_time is not None else 0
     if always_write_timestamps:
-        timestamps = recording.get_times(segment_index=segment_index)
-        shifted_timestamps = starting_time + timestamps
-        eseries_kwargs.update(timestamps=shifted_timestamps)
+        timestamps_iterator = _recording_timestamps_to_hdmf_iterator(
+            recording=recording,
+            segment_index=segment_index,
+            starting_time=starting_time,
+            iterator_type=iterator_type,
+        )
+        eseries_kwargs.update(timestamps=timestamps_iterator)
     else:
         # By default we write the rate if the timestamps are regular
         recording_has_timestamps = recording.has_time_vector(segment_index=segment_index)
@@ -957,8 +1077,13 @@ def add_electrical_series_to_nwbfile(
             # sampling frequency of the recording extractor by some epsilon.
             eseries_kwargs.update(starting_time=starting_time, rate=recording.get_sampling_frequency())
         else:
-            shifted_timestamps = starting_time + timestamps
-            eseries_kwargs.update(timestamps=shifted_timestamps)
+            timestamps_iterator = _recording_timestamps_to_hdmf_iterator(
+                recording=recording,
+                segment_index=segment_index,
+                starting_time=starting_time,
+                iterator_type=iterator_type,
+            )
+            eseries_kwargs.update(timestamps=timestamps_iterator)
 
     # Create ElectricalSeries object and add it to nwbfile
     es = pynwb.ecephys.ElectricalSeries(**eseries_kwargs)
@@ -1331,6 +1456,94 @@ def write_recording_to_nwbfile(
     return nwbfile_out
 
 
+def _get_spike_times_and_index(sorting: BaseSorting) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gather the spike times of all units, concatenated across segments, from a single pass over the spike vector.
+
+    Parameters
+    ----------
+    sorting : spikeinterface.BaseSorting
+        The sorting whose spike trains to gather.
+
+    Returns
+    -------
+    spike_times : numpy.ndarray
+        The spike times (in seconds) of all units, grouped by unit in the order of `sorting.unit_ids`.
+    spike_times_index : numpy.ndarray
+        The end offset of the spike times of each unit in `spike_times`, as in the index of a ragged column.
+    """
+    spike_vector = sorting.to_spike_vector()
+
+    # The spike vector is ordered by segment and sample, so a stable sort by unit keeps that order within each unit
+    spike_times = np.empty(shape=spike_vector.size, dtype="float64")
+    for segment_index in range(sorting.get_num_segments()):
+        segment_start, segment_stop = np.searchsorted(spike_vector["segment_index"], [segment_index, segment_index + 1])
+        sample_indices = spike_vector["sample_index"][segment_start:segment_stop]
+        if sorting.has_recording():
+            times = sorting.get_times(segment_index=segment_index)
+            spike_times[segment_start:segment_stop] = times[sample_indices]
+        else:
+            segment = sorting._sorting_segments[segment_index]
+            t_start = segment._t_start if segment._t_start is not None else 0
+            spike_times[segment_start:segment_stop] = t_start + sample_indices / sorting.get_sampling_frequency()
+
+    unit_order = np.argsort(spike_vector["unit_index"], kind="stable")
+    spike_counts = np.bincount(spike_vector["unit_index"], minlength=sorting.get_num_units())
+    return spike_times[unit_order], np.cumsum(spike_counts)
+
+
+def _create_units_table(
+    name: str,
+    description: str,
+    spike_times: np.ndarray,
+    spike_times_index: np.ndarray,
+    electrodes_table: Optional[pynwb.core.DynamicTable] = None,
+    waveform_means: Optional[np.ndarray] = None,
+    waveform_sds: Optional[np.ndarray] = None,
+    unit_electrode_indices=None,
+) -> pynwb.misc.Units:
+    """Create a Units table with the spike times (and waveforms and electrodes) of all units, column by column."""
+    columns_by_name = {column["name"]: column for column in pynwb.misc.Units.__columns__}
+
+    def get_column(column_name: str, data, column_class=pynwb.core.VectorData, **column_kwargs):
+        return column_class(
+            name=column_name, description=columns_by_name[column_name]["description"], data=data, **column_kwargs
+        )
+
+    spike_times_column = get_column("spike_times", data=spike_times)
+    columns = [
+        spike_times_column,
+        pynwb.core.VectorIndex(name="spike_times_index", data=spike_times_index, target=spike_times_column),
+    ]
+    if waveform_means is not None:
+        columns.append(get_column("waveform_mean", data=waveform_means))
+        if waveform_sds is not None:
+            columns.append(get_column("waveform_sd", data=waveform_sds))
+    # As with `Units.add_unit`, units without electrode indices do not create the electrodes column
+    if unit_electrode_indices is not None and all(indices is not None for indices in unit_electrode_indices):
+        electrode_indices_per_unit = [np.asarray(electrode_indices) for electrode_indices in unit_electrode_indices]
+        electrodes_column = get_column(
+            "electrodes",
+            data=np.concatenate(electrode_indices_per_unit).tolist(),
+            column_class=pynwb.core.DynamicTableRegion,
+            table=electrodes_table,
+        )
+        electrodes_index = pynwb.core.VectorIndex(
+            name="electrodes_index",
+            data=np.cumsum([len(electrode_indices) for electrode_indices in electrode_indices_per_unit]),
+            target=electrodes_column,
+        )
+        columns.extend([electrodes_column, electrodes_index])
+
+    return pynwb.misc.Units(
+        name=name,
+        description=description,
+        id=list(range(len(spike_times_index))),
+        columns=columns,
+        electrode_table=electrodes_table,
+    )
+
+
 def add_units_table(
     sorting: BaseSorting,
     nwbfile: pynwb.NWBFile,
@@ -1439,16 +1652,8 @@ def add_units_table_to_nwbfile(
             description="Intermediate data from extracellular electrophysiology recordings, e.g., LFP.",
         )
         write_table_first_time = units_table_name not in ecephys_mod.data_interfaces
-        if write_table_first_time:
-            units_table = pynwb.misc.Units(name=units_table_name, description=unit_table_description)
-            ecephys_mod.add(units_table)
-
-        units_table = ecephys_mod[units_table_name]
     else:
         write_table_first_time = nwbfile.units is None
-        if write_table_first_time:
-            nwbfile.units = pynwb.misc.Units(name="units", description=unit_table_description)
-        units_table = nwbfile.units
 
     default_descriptions = dict(
         isi_violation="Quality metric that measures the ISI violation ratio as a proxy for the purity of the unit.",
@@ -1502,7 +1707,34 @@ def add_units_table_to_nwbfile(
         unit_name_array = unit_ids.astype("str", copy=False)
         data_to_add["unit_name"].update(description="Unique reference for each unit.", data=unit_name_array)
 
+    spike_times, spike_times_index = _get_spike_times_and_index(sorting=sorting)
+
+    # A new table is built column by column, while rows are appended to an existing one
+    if write_table_first_time:
+        units_table = _create_units_table(
+            name=units_table_name,
+            description=unit_table_description,
+            spike_times=spike_times,
+            spike_times_index=spike_times_index,
+            electrodes_table=nwbfile.electrodes,
+            waveform_means=waveform_means,
+            waveform_sds=waveform_sds,
+            unit_electrode_indices=unit_electrode_indices,
+        )
+        if write_in_processing_module:
+            ecephys_mod.add(units_table)
+        else:
+            nwbfile.units = units_table
+    else:
+        units_table = ecephys_mod[units_table_name] if write_in_processing_module else nwbfile.units
+        # `hdmf` stacks a one-dimensional array with the spike times of a new unit instead of concatenating them, so
+        # the spike times of a table created in memory from an array are moved to a list to append units
+        if "spike_times" in units_table and isinstance(units_table["spike_times"].target.data, np.ndarray):
+            units_table["spike_times"].target.transform(func=lambda data: data.tolist())
+
     units_table_previous_properties = set(units_table.colnames).difference({"spike_times"})
+    if write_table_first_time:  # The columns of the new table are not properties written by a previous call
+        units_table_previous_properties = set()
     properties_to_add = set(data_to_add)
     properties_to_add_by_rows = units_table_previous_properties.union({"id"})
     properties_to_add_by_columns = properties_to_add - properties_to_add_by_rows
@@ -1523,39 +1755,34 @@ def add_units_table_to_nwbfile(
     null_values_for_row["id"] = None
 
     # Add data by rows excluding the rows with previously added unit names
-    unit_names_used_previously = []
+    unit_name_to_previous_row = dict()
     if "unit_name" in units_table_previous_properties:
-        unit_names_used_previously = units_table["unit_name"].data
-    has_electrodes_column = "electrodes" in units_table.colnames
+        for previous_row, unit_name in enumerate(units_table["unit_name"].data[:]):
+            unit_name_to_previous_row.setdefault(unit_name, previous_row)
+    has_electrodes_column = "electrodes" in units_table_previous_properties
 
     properties_with_data = {property for property in properties_to_add_by_rows if "data" in data_to_add[property]}
     rows_in_data = [index for index in range(sorting.get_num_units())]
-    if not has_electrodes_column:
-        rows_to_add = [index for index in rows_in_data if unit_name_array[index] not in unit_names_used_previously]
+    if write_table_first_time:
+        rows_to_add = []  # Already added column by column
+    elif not has_electrodes_column:
+        rows_to_add = [index for index in rows_in_data if unit_name_array[index] not in unit_name_to_previous_row]
     else:
         rows_to_add = []
         for index in rows_in_data:
-            if unit_name_array[index] not in unit_names_used_previously:
+            if unit_name_array[index] not in unit_name_to_previous_row:
                 rows_to_add.append(index)
             else:
-                unit_name = unit_name_array[index]
-                previous_electrodes = units_table[np.where(units_table["unit_name"][:] == unit_name)[0]].electrodes
-                if list(previous_electrodes.values[0]) != list(unit_electrode_indices[index]):
+                previous_row = unit_name_to_previous_row[unit_name_array[index]]
+                previous_electrodes = units_table["electrodes"].get(previous_row, df=False, index=True)
+                if list(previous_electrodes) != list(unit_electrode_indices[index]):
                     rows_to_add.append(index)
 
+    spike_times_start_index = np.concatenate([[0], spike_times_index[:-1]])
     for row in rows_to_add:
         unit_kwargs = null_values_for_row
         for property in properties_with_data:
             unit_kwargs[property] = data_to_add[property]["data"][row]
-        spike_times = []
-
-        # Extract and concatenate the spike times from multiple segments
-        for segment_index in range(sorting.get_num_segments()):
-            segment_spike_times = sorting.get_unit_spike_train(
-                unit_id=unit_ids[row], segment_index=segment_index, return_times=True
-            )
-            spike_times.append(segment_spike_times)
-        spike_times = np.concatenate(spike_times)
         if waveform_means is not None:
             unit_kwargs["waveform_mean"] = waveform_means[row]
             if waveform_sds is not None:
@@ -1563,7 +1790,8 @@ def add_units_table_to_nwbfile(
         if unit_electrode_indices is not None:
             unit_kwargs["electrodes"] = unit_electrode_indices[row]
 
-        units_table.add_unit(spike_times=spike_times, **unit_kwargs, enforce_unique_id=True)
+        unit_spike_times = spike_times[spike_times_start_index[row] : spike_times_index[row]]
+        units_table.add_unit(spike_times=unit_spike_times, **unit_kwargs, enforce_unique_id=True)
 
     # Add unit_name as a column and fill previously existing rows with unit_name equal to str(ids)
     unit_table_size = len(units_table.id[:])
@@ -1579,14 +1807,13 @@ def add_units_table_to_nwbfile(
         cols_args["data"] = extended_data
         units_table.add_column("unit_name", **cols_args)
 
-    # Build  a channel name to electrode table index map
-    table_df = units_table.to_dataframe().reset_index()
-    unit_name_to_electrode_index = {
-        unit_name: table_df.query(f"unit_name=='{unit_name}'").index[0] for unit_name in unit_name_array
-    }
+    # Build a unit name to units table index map, keeping the first row of each name
+    unit_name_to_electrode_index = dict()
+    for table_index, unit_name in enumerate(units_table["unit_name"].data[:]):
+        unit_name_to_electrode_index.setdefault(unit_name, table_index)
 
     indices_for_new_data = [unit_name_to_electrode_index[unit_name] for unit_name in unit_name_array]
-    indices_for_null_values = table_df.index.difference(indices_for_new_data).values
+    indices_for_null_values = np.setdiff1d(np.arange(unit_table_size), indices_for_new_data)
     extending_column = len(indices_for_null_values) > 0
 
     # Add properties as columns
@@ -1,13 +1,30 @@
 from typing import Iterable, Optional
 
+import numpy as np
+from packaging.specifiers import SpecifierSet
 from spikeinterface import BaseRecording
+from spikeinterface.core.binaryrecordingextractor import BinaryRecordingSegment
+from spikeinterface.core.channelslice import ChannelSliceRecordingSegment
+from spikeinterface.core.frameslicerecording import FrameSliceRecordingSegment
+from spikeinterface.extractors.neoextractors.neobaseextractor import NeoRecordingSegment
 from tqdm import tqdm
 
 from neuroconv.tools.hdmf import GenericDataChunkIterator
+from neuroconv.tools.importing import get_package_version
+
+# The private attributes of the recording segments (and Neo readers) that locate their flat binary files were checked
+# against these versions of SpikeInterface; other versions read the traces through `get_traces`
+_FLAT_BINARY_LAYOUT_SPIKEINTERFACE_VERSIONS = SpecifierSet(">=0.101.0,<0.102.0")
 
 
 class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
-    """DataChunkIterator specifically for use on RecordingExtractor objects."""
+    """
+    DataChunkIterator specifically for use on RecordingExtractor objects.
+
+    Recordings read from a flat binary file of samples by channels (e.g., SpikeGLX, OpenEphys binary, Neuroscope,
+    MCS raw or a `BinaryRecordingExtractor`), possibly sliced along their channels or frames, are read directly from a
+    memory map of that file; buffers are then views of the file rather than arrays copied out of it.
+    """
 
     def __init__(
         self,
@@ -21,6 +38,7 @@ class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
         display_progress: bool = False,
         progress_bar_class: Optional[tqdm] = None,
         progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
     ):
         """
         Initialize an Iterable object which returns DataChunks with data and their selections on each iteration.
@@ -63,11 +81,19 @@ class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
         progress_bar_options : dict, optional
             Dictionary of keyword arguments to be passed directly to tqdm.
             See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
         """
         self.recording = recording
         self.segment_index = segment_index
         self.return_scaled = return_scaled
         self.channel_ids = recording.get_channel_ids()
+        self._flat_binary_layout = None
+        if not return_scaled:
+            self._flat_binary_layout = _get_flat_binary_layout(
+                recording_segment=recording._recording_segments[segment_index], dtype=recording.get_dtype()
+            )
         super().__init__(
             buffer_gb=buffer_gb,
             buffer_shape=buffer_shape,
@@ -76,6 +102,7 @@ class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
             display_progress=display_progress,
             progress_bar_class=progress_bar_class,
             progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
         )
 
     def _get_default_chunk_shape(self, chunk_mb: float = 10.0) -> tuple[int, int]:
@@ -93,6 +120,9 @@ class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
         return (chunk_frames, chunk_channels)
 
     def _get_data(self, selection: tuple[slice]) -> Iterable:
+        if self._flat_binary_layout is not None:
+            return self._get_data_from_flat_binary_file(selection=selection)
+
         return self.recording.get_traces(
             segment_index=self.segment_index,
             channel_ids=self.channel_ids[selection[1]],
@@ -101,8 +131,224 @@ class SpikeInterfaceRecordingDataChunkIterator(GenericDataChunkIterator):
             return_scaled=self.return_scaled,
         )
 
+    def _get_data_from_flat_binary_file(self, selection: tuple[slice]) -> np.ndarray:
+        file_path, file_dtype, file_offset, file_number_of_channels, frame_offset, file_channel_indices = (
+            self._flat_binary_layout
+        )
+        start_frame = frame_offset + selection[0].start
+        end_frame = frame_offset + selection[0].stop
+
+        # Only the frames of the buffer are mapped; `np.memmap` aligns the offset to the allocation granularity
+        traces = np.memmap(
+            filename=file_path,
+            dtype=file_dtype,
+            mode="r",
+            offset=file_offset + start_frame * file_number_of_channels * file_dtype.itemsize,
+            shape=(end_frame - start_frame, file_number_of_channels),
+        )
+
+        channel_indices = file_channel_indices[selection[1]]
+        channel_steps = np.unique(np.diff(channel_indices))
+        if len(channel_steps) == 0 or (len(channel_steps) == 1 and channel_steps[0] > 0):
+            step = int(channel_steps[0]) if len(channel_steps) == 1 else 1
+            data = traces[:, channel_indices[0] : channel_indices[-1] + 1 : step]
+        else:
+            # Much faster than fancy indexing of the columns, which gathers the samples one at a time
+            data = np.take(traces, channel_indices, axis=1)
+
+        # Views defer the reads to the write, so buffers read ahead of the writer are loaded into memory instead
+        if self._prefetcher is not None:
+            data = np.array(data)
+
+        return data
+
     def _get_dtype(self):
         return self.recording.get_dtype()
 
     def _get_maxshape(self):
         return (self.recording.get_num_samples(segment_index=self.segment_index), self.recording.get_num_channels())
+
+
+def _get_flat_binary_layout(recording_segment, dtype: np.dtype) -> Optional[tuple]:
+    """
+    Find the flat binary file of samples by channels, in the native data type of the recording, that a segment reads.
+
+    Channel and frame slices of the segment are followed down to the file.
+    Returns the path, data type, byte offset and number of channels of the file, followed by the frame of the file at
+    which the segment starts and the channel of the file of each channel of the segment; or None if the traces of the
+    segment are not read unchanged from such a file, or cannot be located with the installed version of SpikeInterface.
+    """
+    if get_package_version(name="spikeinterface") not in _FLAT_BINARY_LAYOUT_SPIKEINTERFACE_VERSIONS:
+        return None
+
+    try:
+        return _find_flat_binary_layout(recording_segment=recording_segment, dtype=dtype)
+    except (AttributeError, KeyError):  # The private attributes of the segment or its Neo reader have changed
+        return None
+
+
+def _find_flat_binary_layout(recording_segment, dtype: np.dtype) -> Optional[tuple]:
+    """Follow the slices of a recording segment down to its flat binary file; see `_get_flat_binary_layout`."""
+    frame_offset = 0
+    channel_indices = None
+    while isinstance(recording_segment, (ChannelSliceRecordingSegment, FrameSliceRecordingSegment)):
+        if isinstance(recording_segment, FrameSliceRecordingSegment):
+            frame_offset += recording_segment.start_frame
+        else:
+            parent_channel_indices = np.asarray(recording_segment._parent_channel_indices)
+            if channel_indices is not None:
+                parent_channel_indices = parent_channel_indices[channel_indices]
+            channel_indices = parent_channel_indices
+        recording_segment = recording_segment._parent_recording_segment
+
+    if isinstance(recording_segment, BinaryRecordingSegment):
+        if recording_segment.time_axis != 0:
+            return None
+        file_path = recording_segment.file_path
+        file_dtype = recording_segment.dtype
+        file_offset = recording_segment.file_offset
+        file_number_of_channels = recording_segment.num_channels
+        file_channel_indices = np.arange(file_number_of_channels)
+    elif isinstance(recording_segment, NeoRecordingSegment):
+        neo_reader = recording_segment.neo_reader
+        if not getattr(neo_reader, "_has_buffer_description_api", False) or recording_segment.inverted_gain:
+            return None
+        signal_stream = neo_reader.header["signal_streams"][recording_segment.stream_index]
+        buffer_description = neo_reader.get_analogsignal_buffer_description(
+            block_index=recording_segment.block_index,
+            seg_index=recording_segment.segment_index,
+            buffer_id=signal_stream["buffer_id"],
+        )
+        if buffer_description["type"] != "raw" or buffer_description.get("time_axis", 0) != 0:
+            return None
+        file_path = buffer_description["file_path"]
+        file_dtype = np.dtype(buffer_description["dtype"])
+        file_offset = buffer_description["file_offset"]
+        file_number_of_channels = buffer_description["shape"][1]
+
+        # Streams may hold only some of the channels of the file, such as all but the last (SYNC) channel of SpikeGLX
+        buffer_slice = neo_reader._stream_buffer_slice[signal_stream["id"]]
+        file_channel_indices = np.arange(file_number_of_channels)
+        if buffer_slice is not None:
+            file_channel_indices = file_channel_indices[buffer_slice]
+    else:
+        return None
+
+    if file_dtype != np.dtype(dtype):
+        return None
+    if channel_indices is not None:
+        file_channel_indices = file_channel_indices[channel_indices]
+
+    return file_path, file_dtype, file_offset, file_number_of_channels, frame_offset, file_channel_indices
+
+
+class SpikeInterfaceRecordingTimestampsDataChunkIterator(GenericDataChunkIterator):
+    """DataChunkIterator over the timestamps of a segment of a RecordingExtractor, computed one buffer at a time."""
+
+    def __init__(
+        self,
+        recording: BaseRecording,
+        segment_index: int = 0,
+        starting_time: float = 0.0,
+        buffer_gb: Optional[float] = None,
+        buffer_shape: Optional[tuple] = None,
+        chunk_mb: Optional[float] = None,
+        chunk_shape: Optional[tuple] = None,
+        display_progress: bool = False,
+        progress_bar_class: Optional[tqdm] = None,
+        progress_bar_options: Optional[dict] = None,
+        prefetch_buffers: int = 0,
+    ):
+        """
+        Initialize an Iterable object which returns DataChunks with timestamps and their selections on each iteration.
+
+        The timestamps are sliced from the time vector of the segment if it has one, and are otherwise computed from
+        the sampling frequency and start time of the segment, so that the full vector is never held in memory.
+
+        Parameters
+        ----------
+        recording : SpikeInterfaceRecording
+            The SpikeInterfaceRecording object (RecordingExtractor or BaseRecording) which handles the data access.
+        segment_index : int, optional
+            The recording segment to iterate on.
+            Defaults to 0.
+        starting_time : float, optional
+            The offset, in seconds, to add to the timestamps of the recording.
+            Defaults to 0.
+        buffer_gb : float, optional
+            The upper bound on size in gigabytes (GB) of each selection from the iteration.
+            The buffer_shape will be set implicitly by this argument.
+            Cannot be set if `buffer_shape` is also specified.
+            The default is 1GB.
+        buffer_shape : tuple, optional
+            Manual specification of buffer shape to return on each iteration.
+            Must be a multiple of chunk_shape along each axis.
+            Cannot be set if `buffer_gb` is also specified.
+            The default is None.
+        chunk_mb : float, optional
+            The upper bound on size in megabytes (MB) of the internal chunk for the HDF5 dataset.
+            The chunk_shape will be set implicitly by this argument.
+            Cannot be set if `chunk_shape` is also specified.
+            The default is 10MB, as recommended by the HDF5 group.
+            For more details, search the hdf5 documentation for "Improving IO Performance Compressed Datasets".
+        chunk_shape : tuple, optional
+            Manual specification of the internal chunk shape for the HDF5 dataset.
+            Cannot be set if `chunk_mb` is also specified.
+            The default is None.
+        display_progress : bool, optional
+            Display a progress bar with iteration rate and estimated completion time.
+        progress_bar_class : dict, optional
+            The progress bar class to use.
+            Defaults to tqdm.tqdm if the TQDM package is installed.
+        progress_bar_options : dict, optional
+            Dictionary of keyword arguments to be passed directly to tqdm.
+            See https://github.com/tqdm/tqdm#parameters for options.
+        prefetch_buffers : int, default: 0
+            The number of upcoming buffers to read on a background thread while the current one is being written.
+            Each prefetched buffer is held in memory, so this multiplies the RAM usage of the iterator.
+        """
+        self.recording = recording
+        self.segment_index = segment_index
+        self.starting_time = starting_time
+        self._recording_segment = recording._recording_segments[segment_index]
+        super().__init__(
+            buffer_gb=buffer_gb,
+            buffer_shape=buffer_shape,
+            chunk_mb=chunk_mb,
+            chunk_shape=chunk_shape,
+            display_progress=display_progress,
+            progress_bar_class=progress_bar_class,
+            progress_bar_options=progress_bar_options,
+            prefetch_buffers=prefetch_buffers,
+        )
+
+    def __getitem__(self, item) -> np.ndarray:
+        """Return the timestamps at the given indices, as if indexing the full array of timestamps."""
+        if isinstance(item, tuple):
+            (item,) = item
+
+        time_vector = self._recording_segment.time_vector
+        if time_vector is not None:
+            return self.starting_time + np.asarray(time_vector[item])
+
+        # As in `BaseRecordingSegment.get_times`, but only for the requested samples
+        number_of_samples = self._get_maxshape()[0]
+        if isinstance(item, slice):
+            sample_range = range(number_of_samples)[item]
+            sample_indices = np.arange(sample_range.start, sample_range.stop, sample_range.step, dtype="float64")
+        else:
+            sample_indices = np.asarray(item, dtype="float64")
+        times = sample_indices / self._recording_segment.sampling_frequency
+        if self._recording_segment.t_start is not None:
+            times += self._recording_segment.t_start
+        return self.starting_time + times
+
+    def _get_data(self, selection: tuple[slice]) -> np.ndarray:
+        return self[selection[0]]
+
+    def _get_dtype(self) -> np.dtype:
+        time_vector = self._recording_segment.time_vector
+        return np.dtype("float64") if time_vector is None else np.asarray(time_vector[:1]).dtype
+
+    def _get_maxshape(self) -> tuple[int]:
+        return (self.recording.get_num_samples(segment_index=self.segment_index),)
@@ -0,0 +1,256 @@
+"""A size-bounded on-disk cache for values that data interfaces derive from their source files."""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = "NEUROCONV_CACHE_DIRECTORY"
+_DEFAULT_MAX_SIZE_GB = 1.0
+_MISSING = object()
+
+
+class DiskCache:
+    """
+    A least-recently-used cache of pickled values, stored as one file per key in a local directory.
+
+    Reading an entry refreshes its modification time; writing an entry evicts the least recently used entries until
+    the total size of the cache is at most `max_size_gb`. Values larger than `max_size_gb` are never written.
+    The directory is created readable by its owner only, and entries owned by other users are ignored.
+    """
+
+    def __init__(self, cache_directory: Optional[Union[str, Path]] = None, max_size_gb: float = _DEFAULT_MAX_SIZE_GB):
+        """
+        Parameters
+        ----------
+        cache_directory : str or Path, optional
+            The directory in which to store the entries.
+            Defaults to the value of the 'NEUROCONV_CACHE_DIRECTORY' environment variable if set,
+            otherwise to a 'neuroconv' folder in the user cache directory.
+        max_size_gb : float, default: 1.0
+            The maximum total size of all entries, in gigabytes.
+        """
+        assert max_size_gb > 0, f"max_size_gb ({max_size_gb}) must be greater than 0!"
+
+        self.cache_directory = Path(cache_directory) if cache_directory is not None else get_cache_directory()
+        self.max_size_gb = max_size_gb
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.cache_directory / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored under `key`, or `default` if there is no (readable) entry for it."""
+        entry_path = self._get_entry_path(key=key)
+        try:
+            # Pickles are only loaded from entries this user wrote, since loading one can run arbitrary code
+            if hasattr(os, "getuid") and entry_path.stat().st_uid != os.getuid():
+                return default
+            with open(entry_path, mode="rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return default
+        except Exception:  # A truncated or stale entry is removed rather than surfaced
+            entry_path.unlink(missing_ok=True)
+            return default
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key`, then evict the least recently used entries beyond the size limit."""
+        # Such an entry would be evicted as soon as it is written
+        if _get_size_in_bytes(value=value) > self.max_size_gb * 1e9:
+            return
+
+        self.cache_directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+        # Write to a temporary file first so that concurrent readers never see a partially written entry
+        with tempfile.NamedTemporaryFile(dir=self.cache_directory, suffix=".tmp", delete=False) as file:
+            try:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self._get_entry_path(key=key))
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for entry_path in self.cache_directory.glob("*.pkl"):
+            entry_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = list()
+        for entry_path in self.cache_directory.glob("*.pkl"):
+            try:
+                entries.append((entry_path.stat(), entry_path))
+            except FileNotFoundError:  # Removed by another process in the meantime
+                continue
+
+        total_size = sum(stat.st_size for stat, _ in entries)
+        max_size = self.max_size_gb * 1e9
+        for stat, entry_path in sorted(entries, key=lambda entry: entry[0].st_mtime_ns):
+            if total_size <= max_size:
+                break
+            total_size -= stat.st_size
+            entry_path.unlink(missing_ok=True)
+
+
+def _get_size_in_bytes(value: Any) -> int:
+    """Estimate the size of a value without pickling it, counting the data of arrays and the contents of containers."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_get_size_in_bytes(value=element) for element in value)
+    if isinstance(value, dict):
+        return sum(_get_size_in_bytes(value=element) for element in value.values())
+
+    return sys.getsizeof(value)
+
+
+def get_cache_directory() -> Path:
+    """Return the directory used by the default cache."""
+    cache_directory = os.environ.get(_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if cache_directory is not None:
+        return Path(cache_directory)
+
+    user_cache_directory = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(user_cache_directory) / "neuroconv"
+
+
+def get_default_cache() -> Optional[DiskCache]:
+    """
+    Return the cache shared by all data interfaces, or None if caching has not been enabled.
+
+    Caching is opt-in: it is enabled by setting the 'NEUROCONV_CACHE_DIRECTORY' environment variable to the directory
+    in which to store the entries.
+    """
+    if not os.environ.get(_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE):
+        return None
+
+    return DiskCache()
+
+
+class _UncacheableError(Exception):
+    """Raised when a method call cannot be summarized into a cache key."""
+
+
+def _get_path_fingerprint(path: Union[str, Path]) -> list:
+    """Describe a file, or every file in a folder, by its size and modification time."""
+    path = Path(path)
+    if not path.exists():
+        raise _UncacheableError(f"The path '{path}' does not exist.")
+
+    if path.is_file():
+        stat = path.stat()
+        return [str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+
+    fingerprint = [str(path.resolve())]
+    for directory, _, file_names in sorted(os.walk(path)):
+        for file_name in sorted(file_names):
+            file_path = Path(directory) / file_name
+            stat = file_path.stat()
+            fingerprint.append([str(file_path.relative_to(path)), stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def _describe_value(name: str, value: Any) -> Any:
+    """Convert a source data or argument value into a JSON-serializable description."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if name.endswith("_path") and isinstance(value, (str, Path)):
+        return _get_path_fingerprint(path=value)
+    if name.endswith("_paths") and isinstance(value, (list, tuple)):
+        return [_get_path_fingerprint(path=path) for path in value]
+    if isinstance(value, (str, Path)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_describe_value(name=name, value=element) for element in value]
+    if isinstance(value, dict):
+        return {str(key): _describe_value(name=str(key), value=element) for key, element in value.items()}
+
+    raise _UncacheableError(f"Values of type '{type(value).__name__}' cannot be part of a cache key.")
+
+
+def _get_cache_key(interface, method_name: str, arguments: dict) -> Optional[str]:
+    """
+    Summarize a call of a data interface method into a key for the cache.
+
+    The key covers the interface class, the method and its arguments, the version of NeuroConv, and the source data of
+    the interface, where every '*_path' or '*_paths' entry is replaced by the size and modification time of the files.
+    Returns None if the call does not depend on any source file or has arguments that cannot be described.
+    """
+    source_data = {name: value for name, value in interface.source_data.items() if name != "verbose"}
+    if not any(name.endswith(("_path", "_paths")) and value is not None for name, value in source_data.items()):
+        return None
+
+    try:
+        description = dict(
+            interface=f"{type(interface).__module__}.{type(interface).__qualname__}",
+            method=method_name,
+            neuroconv_version=version("neuroconv"),
+            source_data=_describe_value(name="source_data", value=source_data),
+            arguments=_describe_value(name="arguments", value=arguments),
+        )
+    except (_UncacheableError, OSError):
+        return None
+
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+def cache_on_disk(method: Callable) -> Callable:
+    """
+    Decorate a data interface method so that its return value is cached on disk across sessions.
+
+    The cache is keyed on the paths, sizes and modification times of the source files together with the rest of the
+    source data and the arguments of the call, so any change to the source files invalidates the stored value.
+    Caching only happens once enabled through the 'NEUROCONV_CACHE_DIRECTORY' environment variable, and is skipped
+    for interfaces with `use_cache` set to False.
+
+    Only methods whose return value depends on nothing but the source data and the arguments can be decorated;
+    `get_metadata`, for instance, also depends on the probe and the aligned timestamps set on the interface, so it is
+    memoized in memory instead.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = get_default_cache() if getattr(self, "use_cache", True) else None
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound_arguments = signature.bind(self, *args, **kwargs)
+        bound_arguments.apply_defaults()
+        arguments = dict(list(bound_arguments.arguments.items())[1:])  # Skip 'self'
+        key = _get_cache_key(interface=self, method_name=method.__qualname__, arguments=arguments)
+        if key is None:
+            return method(self, *args, **kwargs)
+
+        value = cache.get(key=key, default=_MISSING)
+        if value is _MISSING:
+            value = method(self, *args, **kwargs)
+            try:
+                cache.set(key=key, value=value)
+            except (OSError, pickle.PicklingError, TypeError, AttributeError):  # Caching must never fail a conversion
+                pass
+
+        return value
+
+    return wrapper
@@ -4,12 +4,27 @@ from typing import Optional
 import numpy as np
 
 
-def calculate_regular_series_rate(series: np.ndarray, tolerance_decimals: int = 6) -> Optional[Real]:
+def calculate_regular_series_rate(
+    series: np.ndarray, tolerance_decimals: int = 6, chunk_size: int = 1_000_000
+) -> Optional[Real]:
     """Calculates the rate of a series as the difference between all consecutive points.
     If the difference between all time points are all the same value, then the value of
-    rate is a scalar otherwise it is None."""
-    diff_ts = np.diff(series)
-    rounded_diff_ts = diff_ts.round(decimals=tolerance_decimals)
-    uniq_diff_ts = np.unique(rounded_diff_ts)
-    rate = 1.0 / diff_ts[0] if len(uniq_diff_ts) == 1 else None
+    rate is a scalar otherwise it is None.
+
+    The series is traversed in blocks of `chunk_size` points, stopping at the first irregular difference, so that only
+    one block of differences is held in memory at a time; `series` can therefore also be a np.memmap or h5py.Dataset."""
+    series = series if hasattr(series, "shape") else np.asarray(series)
+    number_of_points = series.shape[0]
+    if number_of_points < 2:
+        return None
+
+    first_diff = series[1] - series[0]
+    rounded_first_diff = np.round(first_diff, decimals=tolerance_decimals)
+    for start in range(0, number_of_points - 1, chunk_size):
+        diff_ts = np.diff(series[start : start + chunk_size + 1])
+        rounded_diff_ts = diff_ts.round(decimals=tolerance_decimals)
+        if np.any(rounded_diff_ts != rounded_first_diff):
+            return None
+
+    rate = 1.0 / first_diff
     return rate
@@ -131,7 +131,8 @@ def dict_deep_update(
     remove_repeats: bool
         for updating list in d[key] with list in u[key]: if true then remove repeats: list(set(ls))
     copy: bool
-        whether to deepcopy the input dict d
+        whether to deepcopy the input dict d; if False, d (and the dictionaries nested in it) are updated in place,
+        which avoids copying an accumulating dictionary on every update
     compare_key: str
         the key that is used to compare dicts (and perform update op) and update d[key] when it is a list if dicts.
         example::
@@ -188,8 +189,13 @@ def dict_deep_update(
         if isinstance(update_values, collections.abc.Mapping):
             sub_dict_to_update = dict_to_update.get(key_to_update, dict())
             sub_dict_with_update_values = update_values
+            # The nested dictionaries are either part of the copy made above or meant to be updated in place
             dict_to_update[key_to_update] = dict_deep_update(
-                sub_dict_to_update, sub_dict_with_update_values, append_list=append_list, remove_repeats=remove_repeats
+                sub_dict_to_update,
+                sub_dict_with_update_values,
+                append_list=append_list,
+                remove_repeats=remove_repeats,
+                copy=False,
             )
         # Update with list calls the append_replace_dict_in_list function
         elif append_list and isinstance(update_values, list):
@@ -12,6 +12,8 @@ from pynwb.image import ImageSeries
 from neuroconv.datainterfaces.behavior.video.video_utils import (
     VideoCaptureContext,
     VideoDataChunkIterator,
+    get_container_timestamps,
+    get_video_timestamps,
 )
 from neuroconv.tools.nwb_helpers import make_nwbfile_from_metadata
 
@@ -22,6 +24,13 @@ try:
 except:
     CV2_INSTALLED = False
 
+try:
+    import av
+
+    AV_INSTALLED = True
+except ImportError:
+    AV_INSTALLED = False
+
 
 @unittest.skipIf(not CV2_INSTALLED, "cv2 not installed")
 class TestVideoContext(unittest.TestCase):
@@ -59,6 +68,19 @@ class TestVideoContext(unittest.TestCase):
             ts = vcc.get_video_timestamps()
         self.assertEqual(len(ts), self.number_of_frames)
 
+    @unittest.skipIf(not AV_INSTALLED, "av not installed")
+    def test_container_timestamps_match_decoded_timestamps(self):
+        with VideoCaptureContext(self.video_loc) as vcc:
+            decoded_timestamps = vcc.get_video_timestamps(display_progress=False)
+
+        assert_array_equal(get_container_timestamps(file_path=self.video_loc), decoded_timestamps)
+        assert_array_equal(get_video_timestamps(file_path=self.video_loc), decoded_timestamps)
+
+    @unittest.skipIf(not AV_INSTALLED, "av not installed")
+    def test_container_timestamps_max_frames(self):
+        timestamps = get_container_timestamps(file_path=self.video_loc, max_frames=10)
+        assert_array_equal(timestamps, np.arange(10) / self.fps)
+
     def test_fps(self):
         with VideoCaptureContext(self.video_loc) as vcc:
             fps = vcc.get_video_fps()
@@ -111,6 +133,46 @@ class TestVideoContext(unittest.TestCase):
             vcc.frame_count = 4
         self.assertEqual(vcc.get_video_frame_count(), 4)
 
+    def test_read_frame_into(self):
+        frame = np.empty(shape=self.frame_shape, dtype="uint8")
+        with VideoCaptureContext(self.video_loc) as vcc:
+            assert vcc.read_frame_into(frame=frame)
+            assert vcc.current_frame == 1
+        assert_array_equal(frame, self.video_frames[0, :, :, ::-1])
+
+    def test_iterator_data(self):
+        iterator = VideoDataChunkIterator(
+            self.video_loc, buffer_gb=math.prod(self.frame_shape) * 10 / 1e9, chunk_shape=(5, *self.frame_shape)
+        )
+        assert iterator.buffer_shape == (10, *self.frame_shape)
+
+        data_chunks = list(iterator)
+        assert all(data_chunk.data.dtype == np.dtype("uint8") for data_chunk in data_chunks)
+        # The same preallocated buffer is reused on every iteration
+        assert all(np.shares_memory(data_chunk.data, data_chunks[0].data) for data_chunk in data_chunks)
+
+        iterator = VideoDataChunkIterator(
+            self.video_loc, buffer_gb=math.prod(self.frame_shape) * 10 / 1e9, chunk_shape=(5, *self.frame_shape)
+        )
+        data = np.zeros(shape=iterator.maxshape, dtype=iterator.dtype)
+        for data_chunk in iterator:
+            data[data_chunk.selection] = data_chunk.data
+        assert_array_equal(data, self.video_frames[..., ::-1])
+
+    def test_prefetched_iterator_data(self):
+        iterator = VideoDataChunkIterator(
+            self.video_loc,
+            buffer_gb=math.prod(self.frame_shape) * 10 / 1e9,
+            chunk_shape=(5, *self.frame_shape),
+            prefetch_buffers=2,
+        )
+
+        data_chunks = list(iterator)
+        assert not np.shares_memory(data_chunks[0].data, data_chunks[1].data)
+        assert_array_equal(
+            np.concatenate([data_chunk.data for data_chunk in data_chunks]), self.video_frames[..., ::-1]
+        )
+
     def test_isopened_assertions(self):
         vcc = VideoCaptureContext(file_path=self.video_loc)
         vcc.release()
@@ -51,6 +51,13 @@ class TestRecordingInterface(TestCase):
         with self.assertRaises(jsonschema.exceptions.ValidationError):
             interface.validate_metadata(metadata)
 
+    def test_metadata_follows_extractor_properties(self):
+        interface = MockRecordingInterface(num_channels=4, durations=[0.100])
+        assert [group["name"] for group in interface.get_metadata()["Ecephys"]["ElectrodeGroup"]] == ["0"]
+
+        interface.recording_extractor.set_channel_groups([7] * 4)
+        assert [group["name"] for group in interface.get_metadata()["Ecephys"]["ElectrodeGroup"]] == ["7"]
+
 
 class TestAlwaysWriteTimestamps:
 
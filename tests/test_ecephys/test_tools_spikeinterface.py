@@ -3,14 +3,17 @@ from datetime import datetime
 from pathlib import Path
 from shutil import rmtree
 from tempfile import mkdtemp
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock, patch
 
 import numpy as np
 import psutil
 import pynwb.ecephys
 from hdmf.data_utils import DataChunkIterator
 from hdmf.testing import TestCase
-from pynwb import NWBFile
+from packaging.version import Version
+from pynwb import NWBHDF5IO, NWBFile
+from spikeinterface.core import BinaryRecordingExtractor
+from spikeinterface.core.binaryrecordingextractor import BinaryRecordingSegment
 from spikeinterface.core.generate import (
     generate_ground_truth_recording,
     generate_recording,
@@ -29,8 +32,12 @@ from neuroconv.tools.spikeinterface import (
     write_recording_to_nwbfile,
     write_sorting_analyzer_to_nwbfile,
 )
+from neuroconv.tools.spikeinterface.spikeinterface import (
+    _get_electrode_table_indices_for_recording,
+)
 from neuroconv.tools.spikeinterface.spikeinterfacerecordingdatachunkiterator import (
     SpikeInterfaceRecordingDataChunkIterator,
+    SpikeInterfaceRecordingTimestampsDataChunkIterator,
 )
 
 testing_session_time = datetime.now().astimezone()
@@ -237,6 +244,22 @@ class TestAddElectricalSeriesSavingTimestampsVsRates(unittest.TestCase):
         extracted_timestamps = electrical_series.timestamps.data
         np.testing.assert_array_almost_equal(extracted_timestamps, expected_timestamps)
 
+    def test_non_uniform_timestamps_written_chunked(self):
+        expected_timestamps = np.array([0.0, 2.0, 10.0])
+        self.test_recording_extractor.set_times(times=expected_timestamps, with_warning=False)
+        add_electrical_series_to_nwbfile(recording=self.test_recording_extractor, nwbfile=self.nwbfile, starting_time=1.0)
+
+        electrical_series = self.nwbfile.acquisition["ElectricalSeriesRaw"]
+        assert isinstance(electrical_series.timestamps, SpikeInterfaceRecordingTimestampsDataChunkIterator)
+
+        nwbfile_path = Path(mkdtemp()) / "test_non_uniform_timestamps_written_chunked.nwb"
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+            written_timestamps = io.read().acquisition["ElectricalSeriesRaw"].timestamps[:]
+            np.testing.assert_array_equal(written_timestamps, expected_timestamps + 1.0)
+
 
 class TestAddElectricalSeriesVoltsScaling(unittest.TestCase):
     @classmethod
@@ -447,6 +470,19 @@ class TestAddElectricalSeriesChunking(unittest.TestCase):
 
         assert electrical_series_data_iterator.chunk_shape == iterator_opts["chunk_shape"]
 
+    def test_prefetching_iterative_writer(self):
+        iterator_opts = dict(buffer_shape=(5, 3), chunk_shape=(5, 3), prefetch_buffers=2)
+        add_electrical_series_to_nwbfile(
+            recording=self.test_recording_extractor, nwbfile=self.nwbfile, iterator_opts=iterator_opts
+        )
+
+        electrical_series_data_iterator = self.nwbfile.acquisition["ElectricalSeriesRaw"].data
+        assert electrical_series_data_iterator.prefetch_buffers == 2
+
+        extracted_data = np.concatenate([data_chunk.data for data_chunk in electrical_series_data_iterator])
+        expected_data = self.test_recording_extractor.get_traces(segment_index=0)
+        np.testing.assert_array_almost_equal(expected_data, extracted_data)
+
     def test_hdmf_iterator(self):
         add_electrical_series_to_nwbfile(
             recording=self.test_recording_extractor, nwbfile=self.nwbfile, iterator_type="v1"
@@ -503,6 +539,93 @@ class TestAddElectricalSeriesChunking(unittest.TestCase):
             )
 
 
+class TestSpikeInterfaceRecordingDataChunkIteratorFromFlatBinaryFile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = Path(mkdtemp())
+        cls.file_path = cls.tmpdir / "traces.bin"
+        cls.num_channels = 5
+        cls.traces = np.arange(100 * cls.num_channels, dtype="int16").reshape(100, cls.num_channels)
+        cls.traces.tofile(cls.file_path)
+
+        cls.recording = BinaryRecordingExtractor(
+            file_paths=[cls.file_path], sampling_frequency=1.0, num_channels=cls.num_channels, dtype="int16"
+        )
+        cls.recording.set_channel_gains(gains=2.0)
+        cls.recording.set_channel_offsets(offsets=0.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        rmtree(cls.tmpdir, ignore_errors=True)
+
+    def _get_iterated_data(self, iterator):
+        data = np.zeros(shape=iterator.maxshape, dtype=iterator.dtype)
+        for data_chunk in iterator:
+            data[data_chunk.selection] = data_chunk.data
+
+        return data
+
+    def test_buffers_are_views_of_the_file(self):
+        iterator = SpikeInterfaceRecordingDataChunkIterator(
+            recording=self.recording, buffer_shape=(20, 5), chunk_shape=(10, 5)
+        )
+
+        data_chunk = next(iterator)
+        assert isinstance(data_chunk.data, np.memmap)
+        np.testing.assert_array_equal(data_chunk.data, self.traces[:20])
+
+    def test_sliced_recordings(self):
+        channel_ids = self.recording.get_channel_ids()
+        sliced_recordings = [
+            self.recording.select_channels(channel_ids=channel_ids[[4, 0, 2]]),
+            self.recording.frame_slice(start_frame=13, end_frame=91).select_channels(channel_ids=channel_ids[1:4]),
+            self.recording.select_channels(channel_ids=channel_ids[::2]).frame_slice(start_frame=7, end_frame=50),
+        ]
+        for recording in sliced_recordings:
+            iterator = SpikeInterfaceRecordingDataChunkIterator(
+                recording=recording, buffer_shape=(20, 1), chunk_shape=(10, 1)
+            )
+            assert iterator._flat_binary_layout is not None
+            np.testing.assert_array_equal(self._get_iterated_data(iterator=iterator), recording.get_traces())
+
+    def test_prefetched_buffers_are_loaded_into_memory(self):
+        iterator = SpikeInterfaceRecordingDataChunkIterator(
+            recording=self.recording, buffer_shape=(20, 5), chunk_shape=(10, 5), prefetch_buffers=2
+        )
+
+        data_chunk = next(iterator)
+        assert not isinstance(data_chunk.data, np.memmap)
+        np.testing.assert_array_equal(data_chunk.data, self.traces[:20])
+        for _ in iterator:
+            pass
+
+    def test_scaled_traces_are_read_from_the_recording(self):
+        iterator = SpikeInterfaceRecordingDataChunkIterator(recording=self.recording, return_scaled=True)
+
+        assert iterator._flat_binary_layout is None
+        np.testing.assert_array_equal(self._get_iterated_data(iterator=iterator), self.traces * 2.0)
+
+    def test_unsupported_spikeinterface_version_reads_from_the_recording(self):
+        with patch(
+            "neuroconv.tools.spikeinterface.spikeinterfacerecordingdatachunkiterator.get_package_version",
+            return_value=Version("0.102.0"),
+        ):
+            iterator = SpikeInterfaceRecordingDataChunkIterator(recording=self.recording)
+
+        assert iterator._flat_binary_layout is None
+        np.testing.assert_array_equal(self._get_iterated_data(iterator=iterator), self.traces)
+
+    def test_changed_segment_attributes_read_from_the_recording(self):
+        recording = self.recording.frame_slice(start_frame=10, end_frame=60)
+        with patch.object(
+            BinaryRecordingSegment, "time_axis", new_callable=PropertyMock, side_effect=AttributeError, create=True
+        ):
+            iterator = SpikeInterfaceRecordingDataChunkIterator(recording=recording)
+
+        assert iterator._flat_binary_layout is None
+        np.testing.assert_array_equal(self._get_iterated_data(iterator=iterator), self.traces[10:60])
+
+
 class TestWriteRecording(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -637,6 +760,41 @@ class TestAddElectrodes(TestCase):
         actual_channel_names_in_electrodes_table = list(self.nwbfile.electrodes["channel_name"].data)
         self.assertListEqual(actual_channel_names_in_electrodes_table, expected_channel_names_in_electrodes_table)
 
+    def test_appended_electrodes_are_added_by_columns(self):
+        """Ensure the electrodes of a later recording are appended to each column at once, not row by row."""
+        add_electrodes_to_nwbfile(recording=self.recording_1, nwbfile=self.nwbfile)
+        with patch.object(self.nwbfile, "add_electrode", side_effect=AssertionError("Electrode added by row")):
+            add_electrodes_to_nwbfile(recording=self.recording_2, nwbfile=self.nwbfile)
+
+        electrodes_table = self.nwbfile.electrodes
+        self.assertListEqual(list(electrodes_table.id[:]), [0, 1, 2, 3, 4, 5])
+        self.assertListEqual(list(electrodes_table["channel_name"][:]), ["a", "b", "c", "d", "e", "f"])
+        self.assertListEqual(list(electrodes_table["group_name"][:]), ["0"] * 6)
+        self.assertListEqual(list(electrodes_table["location"][:]), ["unknown"] * 6)
+        rel_x = self.base_recording.get_channel_locations()[:, 0]
+        self.assertListEqual(list(electrodes_table["rel_x"][:]), list(rel_x) + list(rel_x[2:]))
+
+    def test_electrode_table_indices_for_recordings(self):
+        """Ensure the channels of each recording map to their rows as the electrodes table grows."""
+        add_electrodes_to_nwbfile(recording=self.recording_1, nwbfile=self.nwbfile)
+        self.assertListEqual(
+            _get_electrode_table_indices_for_recording(recording=self.recording_1, nwbfile=self.nwbfile), [0, 1, 2, 3]
+        )
+
+        add_electrodes_to_nwbfile(recording=self.recording_2, nwbfile=self.nwbfile)
+        self.assertListEqual(
+            _get_electrode_table_indices_for_recording(recording=self.recording_2, nwbfile=self.nwbfile), [2, 3, 4, 5]
+        )
+
+        nwbfile_path = Path(mkdtemp()) / "test_electrode_table_indices_for_recordings.nwb"
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+            electrodes_table = io.read().electrodes
+            self.assertListEqual(list(electrodes_table["channel_name"][:]), ["a", "b", "c", "d", "e", "f"])
+            self.assertListEqual(list(electrodes_table["location"][:]), ["unknown"] * 6)
+
     def test_non_overwriting_channel_names_property(self):
         "add_electrodes_to_nwbfile function should not overwrite the recording object channel name property"
         channel_names = ["name a", "name b", "name c", "name d"]
@@ -1067,6 +1225,33 @@ class TestAddUnitsTable(TestCase):
         unit_names_in_units_table = list(self.nwbfile.units["unit_name"].data)
         self.assertListEqual(unit_names_in_units_table, expected_unit_names_in_units_table)
 
+    def test_spike_times_across_segments(self):
+        """Ensure the spike times of each unit are concatenated across segments in the units table."""
+        sorting = self.multiple_segment_sorting
+        add_units_table_to_nwbfile(sorting=sorting, nwbfile=self.nwbfile)
+
+        for unit_index, unit_id in enumerate(sorting.unit_ids):
+            expected_spike_times = np.concatenate(
+                [
+                    sorting.get_unit_spike_train(unit_id=unit_id, segment_index=segment_index, return_times=True)
+                    for segment_index in range(sorting.get_num_segments())
+                ]
+            )
+            np.testing.assert_array_equal(self.nwbfile.units["spike_times"][unit_index], expected_spike_times)
+
+    def test_append_to_units_table_with_spike_times_array(self):
+        """Ensure units can be appended to an existing units table that holds its spike times in an array."""
+        spike_times = pynwb.core.VectorData(name="spike_times", description="spike times", data=np.array([0.5, 1.5]))
+        spike_times_index = pynwb.core.VectorIndex(name="spike_times_index", data=np.array([2]), target=spike_times)
+        self.nwbfile.units = pynwb.misc.Units(name="units", columns=[spike_times, spike_times_index], id=[10])
+
+        add_units_table_to_nwbfile(sorting=self.sorting_1, nwbfile=self.nwbfile)
+
+        np.testing.assert_array_equal(self.nwbfile.units["spike_times"][0], [0.5, 1.5])
+        for unit_index, unit_id in enumerate(self.sorting_1.unit_ids):
+            expected_spike_times = self.sorting_1.get_unit_spike_train(unit_id=unit_id, return_times=True)
+            np.testing.assert_array_equal(self.nwbfile.units["spike_times"][unit_index + 1], expected_spike_times)
+
     def test_string_unit_names(self):
         """Ensure add_units_table_to_nwbfile gets the right units name for string units ids"""
         add_units_table_to_nwbfile(sorting=self.sorting_1, nwbfile=self.nwbfile)
@@ -1154,6 +1339,8 @@ class TestAddUnitsTable(TestCase):
 
         add_units_table_to_nwbfile(sorting=self.sorting_1, nwbfile=self.nwbfile)
 
+        # The spike times are written in an array, which `hdmf` can only extend once they are moved to a list
+        self.nwbfile.units["spike_times"].target.transform(func=lambda data: data.tolist())
         values_dic = self.defaults
 
         # Previous properties
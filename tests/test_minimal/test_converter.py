@@ -1,3 +1,4 @@
+import json
 import unittest
 from datetime import datetime
 from pathlib import Path
@@ -5,7 +6,10 @@ from shutil import rmtree
 from tempfile import mkdtemp
 
 import numpy as np
-from pynwb import NWBFile
+import psutil
+import pytest
+from hdmf_zarr import NWBZarrIO
+from pynwb import NWBHDF5IO, NWBFile, TimeSeries
 
 from neuroconv import (
     BaseDataInterface,
@@ -13,6 +17,10 @@ from neuroconv import (
     ConverterPipe,
     NWBConverter,
 )
+from neuroconv.basedatainterface import _memoize_metadata
+from neuroconv.tools.hdmf import SliceableDataChunkIterator
+from neuroconv.tools.nwb_helpers._chunk_planner import _check_memory_budget
+from neuroconv.tools.profiling import ConversionProfiler
 
 try:
     from ndx_events import LabeledEvents
@@ -160,3 +168,198 @@ class TestNWBConverterAndPipeInitialization(unittest.TestCase):
         data_interface_names = list(converter.data_interface_objects.keys())
         expected_interface_names = ["InterfaceA001", "InterfaceB", "InterfaceA002"]
         self.assertListEqual(data_interface_names, expected_interface_names)
+
+
+class _TimeSeriesInterface(BaseDataInterface):
+    """Write random data of a number of channels through a SliceableDataChunkIterator."""
+
+    def __init__(self, name: str, number_of_channels: int, buffer_shape: tuple = None, chunk_shape: tuple = None):
+        self.name = name
+        self.data = np.random.default_rng(seed=0).random(size=(1000, number_of_channels))
+        self.buffer_shape = buffer_shape or self.data.shape
+        self.chunk_shape = chunk_shape or (100, number_of_channels)
+        self.iterator = None
+
+    def add_to_nwbfile(self, nwbfile: NWBFile, metadata: dict):
+        self.iterator = SliceableDataChunkIterator(
+            data=self.data, buffer_shape=self.buffer_shape, chunk_shape=self.chunk_shape
+        )
+        nwbfile.add_acquisition(TimeSeries(name=self.name, data=self.iterator, unit="a.u.", rate=10.0))
+
+
+def _get_time_series_converter(buffer_shape: tuple = None, chunk_shape: tuple = None) -> tuple[ConverterPipe, dict]:
+    """Return a converter of two time series interfaces of 4 and 8 channels, and its metadata."""
+    interfaces = dict(
+        InterfaceA=_TimeSeriesInterface(
+            name="TimeSeriesA", number_of_channels=4, buffer_shape=buffer_shape, chunk_shape=chunk_shape
+        ),
+        InterfaceB=_TimeSeriesInterface(
+            name="TimeSeriesB", number_of_channels=8, buffer_shape=buffer_shape, chunk_shape=chunk_shape
+        ),
+    )
+    converter = ConverterPipe(data_interfaces=interfaces, verbose=False)
+    metadata = converter.get_metadata()
+    metadata["NWBFile"]["session_start_time"] = datetime.now().astimezone()
+
+    return converter, metadata
+
+
+def _assert_time_series_written(nwbfile: NWBFile, converter: ConverterPipe):
+    for interface in converter.data_interface_objects.values():
+        np.testing.assert_array_equal(nwbfile.acquisition[interface.name].data[:], interface.data)
+
+
+@pytest.mark.parametrize("buffer_shape, chunk_shape", [((100, 4), (100, 4)), ((300, 4), (100, 2))])
+def test_run_conversion_with_prefetching(tmp_path, buffer_shape, chunk_shape):
+    converter, metadata = _get_time_series_converter(buffer_shape=buffer_shape, chunk_shape=chunk_shape)
+
+    nwbfile_path = tmp_path / "test_run_conversion_with_prefetching.nwb"
+    converter.run_conversion(
+        nwbfile_path=nwbfile_path, metadata=metadata, number_of_prefetch_jobs=2, max_prefetch_gb=1e-4
+    )
+
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        _assert_time_series_written(nwbfile=io.read(), converter=converter)
+
+
+def test_run_conversion_with_memory_budget(tmp_path):
+    converter, metadata = _get_time_series_converter()
+
+    # Each of the two iterators gets 6400 bytes, i.e., two chunks of the first and one chunk of the second
+    nwbfile_path = tmp_path / "test_run_conversion_with_memory_budget.nwb"
+    converter.run_conversion(
+        nwbfile_path=nwbfile_path, metadata=metadata, number_of_prefetch_jobs=2, memory_budget_gb=12_800 / 1e9
+    )
+
+    assert converter.data_interface_objects["InterfaceA"].iterator.buffer_shape == (200, 4)
+    assert converter.data_interface_objects["InterfaceB"].iterator.buffer_shape == (100, 8)
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        _assert_time_series_written(nwbfile=io.read(), converter=converter)
+
+
+def test_memory_budget_exceeding_available_memory():
+    available_memory_gb = psutil.virtual_memory().available / 1e9
+    with pytest.warns(UserWarning, match="exceeds the memory available on this machine"):
+        memory_budget_gb = _check_memory_budget(memory_budget_gb=10 * available_memory_gb)
+
+    assert memory_budget_gb <= available_memory_gb * 1.1
+
+
+def test_run_conversion_with_zarr_backend(tmp_path):
+    converter, metadata = _get_time_series_converter(buffer_shape=(200, 4), chunk_shape=(100, 4))
+
+    nwbfile = converter.create_nwbfile(metadata=metadata)
+    backend_configuration = converter.get_default_backend_configuration(nwbfile=nwbfile, backend="zarr")
+    backend_configuration.number_of_jobs = -1
+
+    nwbfile_path = tmp_path / "test_run_conversion_with_zarr_backend.nwb.zarr"
+    converter.run_conversion(
+        nwbfile_path=nwbfile_path, nwbfile=nwbfile, metadata=metadata, backend_configuration=backend_configuration
+    )
+
+    with NWBZarrIO(path=str(nwbfile_path), mode="r") as io:
+        _assert_time_series_written(nwbfile=io.read(), converter=converter)
+
+
+@pytest.mark.parametrize("number_of_prefetch_jobs", [None, 2])
+def test_run_conversion_with_profiler(tmp_path, number_of_prefetch_jobs):
+    converter, metadata = _get_time_series_converter(buffer_shape=(100, 4), chunk_shape=(100, 4))
+
+    sink_reports = []
+    report_file_path = tmp_path / "report.json"
+    profiler = ConversionProfiler(report_file_path=report_file_path, sinks=[sink_reports.append])
+
+    nwbfile_path = tmp_path / "test_run_conversion_with_profiler.nwb"
+    converter.run_conversion(
+        nwbfile_path=nwbfile_path, metadata=metadata, number_of_prefetch_jobs=number_of_prefetch_jobs, profiler=profiler
+    )
+
+    assert len(sink_reports) == 1
+    report = sink_reports[0]
+    with open(file=report_file_path, mode="r") as file:
+        assert json.load(fp=file) == json.loads(json.dumps(report))
+
+    stage_names = [stage["name"] for stage in report["stages"]]
+    assert stage_names == [
+        "validate_metadata",
+        "temporally_align_data_interfaces",
+        "add_to_nwbfile",
+        "add_to_nwbfile",
+        "get_default_backend_configuration",
+        "configure_backend",
+        "write",
+    ]
+    assert all(stage["time"] >= 0 and stage["peak_memory_mb"] > 0 for stage in report["stages"])
+
+    assert report["interfaces"]["InterfaceA"]["datasets"] == ["acquisition/TimeSeriesA/data"]
+    assert report["interfaces"]["InterfaceB"]["datasets"] == ["acquisition/TimeSeriesB/data"]
+
+    datasets = {dataset["location_in_file"]: dataset for dataset in report["datasets"]}
+    dataset = datasets["acquisition/TimeSeriesB/data"]
+    assert dataset["interface_name"] == "InterfaceB"
+    assert dataset["bytes_in"] == converter.data_interface_objects["InterfaceB"].data.nbytes
+    assert dataset["bytes_out"] > 0
+    assert dataset["number_of_buffers"] == 20
+    assert dataset["read_time"] > 0 and dataset["write_time"] > 0
+
+    with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+        _assert_time_series_written(nwbfile=io.read(), converter=converter)
+
+
+def test_metadata_memoized_per_interface():
+    class CountingInterface(BaseTemporalAlignmentInterface):
+        def __init__(self, session_description: str):
+            super().__init__(session_description=session_description)
+            self.number_of_metadata_calls = 0
+            self._timestamps = np.arange(3.0)
+
+        @_memoize_metadata
+        def get_metadata(self):
+            self.number_of_metadata_calls += 1
+            metadata = super().get_metadata()
+            metadata["NWBFile"]["session_description"] = self.source_data["session_description"]
+            metadata["NWBFile"]["session_start_time"] = datetime(2020, 1, 1).astimezone()
+            return metadata
+
+        def get_original_timestamps(self) -> np.ndarray:
+            return np.arange(3.0)
+
+        def get_timestamps(self) -> np.ndarray:
+            return self._timestamps
+
+        def set_aligned_timestamps(self, aligned_timestamps: np.ndarray):
+            self._timestamps = aligned_timestamps
+
+        def add_to_nwbfile(self, nwbfile: NWBFile, metadata: dict):
+            pass
+
+    interface = CountingInterface(session_description="first")
+    converter = ConverterPipe(data_interfaces=dict(Interface=interface), verbose=False)
+    metadata = converter.get_metadata()
+    converter.validate_metadata(metadata=metadata)
+    converter.get_metadata_schema()
+    assert interface.number_of_metadata_calls == 1
+
+    # Each call returns an independent copy
+    metadata["NWBFile"]["session_description"] = "modified"
+    assert interface.get_metadata()["NWBFile"]["session_description"] == "first"
+
+    interface.set_aligned_starting_time(aligned_starting_time=1.0)
+    interface.get_metadata()
+    assert interface.number_of_metadata_calls == 2
+
+    # Other changes to the interface are only reflected once the cache is cleared
+    interface.source_data["session_description"] = "second"
+    assert interface.get_metadata()["NWBFile"]["session_description"] == "first"
+    interface._clear_metadata_cache()
+    assert interface.get_metadata()["NWBFile"]["session_description"] == "second"
+    assert interface.number_of_metadata_calls == 3
+
+
+def test_memoized_metadata_has_a_new_identifier_on_each_call():
+    class TimeSeriesInterface(BaseDataInterface):
+        def add_to_nwbfile(self, nwbfile: NWBFile, metadata: dict):
+            pass
+
+    interface = TimeSeriesInterface()
+    assert interface.get_metadata()["NWBFile"]["identifier"] != interface.get_metadata()["NWBFile"]["identifier"]
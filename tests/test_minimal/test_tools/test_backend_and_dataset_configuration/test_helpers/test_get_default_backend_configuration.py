@@ -8,12 +8,16 @@ import numpy as np
 import pytest
 from hdmf_zarr import NWBZarrIO
 from pynwb import NWBHDF5IO, NWBFile
+from pynwb.image import ImageSeries
 from pynwb.testing.mock.base import mock_TimeSeries
 from pynwb.testing.mock.file import mock_NWBFile
 
+from neuroconv.tools.hdmf import SliceableDataChunkIterator
 from neuroconv.tools.nwb_helpers import (
+    BACKEND_NWB_IO,
     HDF5BackendConfiguration,
     ZarrBackendConfiguration,
+    configure_backend,
     get_default_backend_configuration,
     get_module,
 )
@@ -262,3 +266,84 @@ processing/ecephys/NewProcessedTimeSeries/data
 
 """
     assert stdout.getvalue() == expected_print
+
+
+def generate_nwbfile_for_planning() -> NWBFile:
+    nwbfile = mock_NWBFile()
+    nwbfile.add_acquisition(mock_TimeSeries(name="Recording", data=np.zeros(shape=(30_000, 384), dtype="int16")))
+    images = ImageSeries(name="Images", data=np.zeros(shape=(100, 512, 512), dtype="uint16"), unit="n.a.", rate=30.0)
+    nwbfile.add_acquisition(images)
+
+    return nwbfile
+
+
+@pytest.mark.parametrize("backend", ["hdf5", "zarr"])
+@pytest.mark.parametrize(
+    "access_pattern,storage_profile,expected_recording_chunk_shape,expected_images_chunk_shape",
+    [
+        (None, "network_filesystem", (13_020, 384), (2, 512, 512)),
+        (None, "object_store", (20_833, 384), (16, 512, 512)),
+        ("time", "local_ssd", (1_302, 384), (1, 512, 512)),
+        ("channel", "local_ssd", (30_000, 1), (100, 1, 1)),
+        ({"acquisition/Images/data": "time"}, "object_store", (20_833, 384), (30, 512, 512)),
+    ],
+)
+def test_planned_chunk_shapes(
+    backend, access_pattern, storage_profile, expected_recording_chunk_shape, expected_images_chunk_shape
+):
+    nwbfile = generate_nwbfile_for_planning()
+
+    backend_configuration = get_default_backend_configuration(
+        nwbfile=nwbfile, backend=backend, access_pattern=access_pattern, storage_profile=storage_profile
+    )
+
+    recording_configuration = backend_configuration.dataset_configurations["acquisition/Recording/data"]
+    images_configuration = backend_configuration.dataset_configurations["acquisition/Images/data"]
+    assert recording_configuration.chunk_shape == expected_recording_chunk_shape
+    assert recording_configuration.buffer_shape == (30_000, 384)
+    assert images_configuration.chunk_shape == expected_images_chunk_shape
+    assert images_configuration.buffer_shape == (100, 512, 512)
+
+
+def test_planned_buffer_shapes_fit_in_available_memory():
+    nwbfile = generate_nwbfile_for_planning()
+
+    backend_configuration = get_default_backend_configuration(
+        nwbfile=nwbfile, backend="hdf5", storage_profile="local_ssd", available_memory_gb=0.02
+    )
+
+    # A quarter of the available memory is 5 MB, so five chunks of 1 MB along time
+    recording_configuration = backend_configuration.dataset_configurations["acquisition/Recording/data"]
+    assert recording_configuration.chunk_shape == (1_302, 384)
+    assert recording_configuration.buffer_shape == (6_510, 384)
+
+    # A single frame is 0.5 MB, so the buffers of images grow along time
+    images_configuration = backend_configuration.dataset_configurations["acquisition/Images/data"]
+    assert images_configuration.chunk_shape == (1, 512, 512)
+    assert images_configuration.buffer_shape == (9, 512, 512)
+
+
+@pytest.mark.parametrize("backend", ["hdf5", "zarr"])
+def test_planned_shapes_are_applied_to_iterators(tmpdir, backend):
+    array = np.arange(30_000 * 384, dtype="int16").reshape(30_000, 384)
+    iterator = SliceableDataChunkIterator(data=array)
+    nwbfile = mock_NWBFile()
+    nwbfile.add_acquisition(mock_TimeSeries(name="Recording", data=iterator))
+
+    backend_configuration = get_default_backend_configuration(
+        nwbfile=nwbfile, backend=backend, access_pattern="channel", storage_profile="local_ssd"
+    )
+    configure_backend(nwbfile=nwbfile, backend_configuration=backend_configuration)
+
+    assert iterator.chunk_shape == (30_000, 1)
+    assert iterator.buffer_shape == (30_000, 384)
+    assert iterator.num_buffers == 1
+
+    nwbfile_path = str(tmpdir / f"test_planned_shapes_are_applied_to_iterators.nwb.{backend}")
+    with BACKEND_NWB_IO[backend](path=nwbfile_path, mode="w") as io:
+        io.write(nwbfile)
+
+    with BACKEND_NWB_IO[backend](path=nwbfile_path, mode="r") as io:
+        written_data = io.read().acquisition["Recording"].data
+        assert written_data.chunks == (30_000, 1)
+        np.testing.assert_array_equal(written_data[:], array)
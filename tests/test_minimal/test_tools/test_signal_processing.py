@@ -164,3 +164,53 @@ class TestGetRisingAndFallingTimesFromTTL(TestCase):
 
         expected_falling_frames = np.array([77_500, 205_000])
         assert_array_equal(x=falling_frames, y=expected_falling_frames)
+
+    def test_chunk_size_does_not_change_frames(self):
+        ttl_signal = generate_mock_ttl_signal(
+            signal_duration=10.0, ttl_times=[1.1, 6.2], ttl_duration=2.0, dtype="float32", channel_noise=2.0
+        )
+
+        sign = np.sign(ttl_signal - np.mean(ttl_signal))
+        expected_rising_frames = np.where(np.diff(sign) > 0)[0] + 1
+        expected_falling_frames = np.where(np.diff(sign) < 0)[0] + 1
+
+        for chunk_size in (27_500, 77_500, 100_001):
+            rising_frames = get_rising_frames_from_ttl(trace=ttl_signal, chunk_size=chunk_size)
+            falling_frames = get_falling_frames_from_ttl(trace=ttl_signal, chunk_size=chunk_size)
+
+            assert_array_equal(x=rising_frames, y=expected_rising_frames)
+            assert_array_equal(x=falling_frames, y=expected_falling_frames)
+
+    def test_hysteresis_floats(self):
+        ttl_signal = generate_mock_ttl_signal(
+            signal_duration=10.0, ttl_times=[1.1, 6.2], ttl_duration=2.0, dtype="float32"
+        )
+        # Bounce around the threshold at the start of each pulse
+        ttl_signal[27_500:27_510:2] = 1.0
+        ttl_signal[155_000:155_010:2] = 1.0
+
+        assert len(get_rising_frames_from_ttl(trace=ttl_signal, threshold=1.5)) == 10
+
+        for chunk_size in (1_000_000, 27_505):
+            rising_frames = get_rising_frames_from_ttl(
+                trace=ttl_signal, threshold=1.5, hysteresis=2.0, chunk_size=chunk_size
+            )
+            falling_frames = get_falling_frames_from_ttl(
+                trace=ttl_signal, threshold=1.5, hysteresis=2.0, chunk_size=chunk_size
+            )
+
+            assert_array_equal(x=rising_frames, y=[27_501, 155_001])
+            assert_array_equal(x=falling_frames, y=[77_500, 205_000])
+
+    def test_sliceable_trace(self):
+        ttl_signal = generate_mock_ttl_signal()
+
+        class SliceOnlyTrace:
+            shape = (1, ttl_signal.shape[0])
+
+            def __getitem__(self, selection):
+                assert selection[0] == 0 and selection[1].stop - selection[1].start <= 10_000
+                return ttl_signal[selection[1]][np.newaxis, :]
+
+        rising_frames = get_rising_frames_from_ttl(trace=SliceOnlyTrace(), chunk_size=10_000)
+        assert_array_equal(x=rising_frames, y=[25_000, 75_000, 125_000])
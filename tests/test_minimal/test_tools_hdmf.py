@@ -1,8 +1,28 @@
+import threading
+import time
+
+import h5py
 import numpy as np
+import psutil
+import pytest
+import zarr
 from hdmf.testing import TestCase
+from hdmf_zarr import NWBZarrIO
 from numpy.testing import assert_array_equal
+from pynwb.testing.mock.base import mock_TimeSeries
+from pynwb.testing.mock.file import mock_NWBFile
 
-from neuroconv.tools.hdmf import SliceableDataChunkIterator
+from neuroconv.tools.hdmf import (
+    DataChunkPrefetcher,
+    SliceableDataChunkIterator,
+    _ParallelCompressionH5DataIO,
+)
+from neuroconv.tools.nwb_helpers import (
+    BACKEND_NWB_IO,
+    configure_and_write_nwbfile,
+    get_default_backend_configuration,
+)
+from neuroconv.tools.nwb_helpers._metadata_and_file_helpers import _write_nwbfile
 
 
 class TestIteratorAssertions(TestCase):
@@ -68,3 +88,264 @@ def test_sliceable_data_chunk_iterator_edge_case_1():
 
     assert iterator.buffer_shape == (2013, 183, 366)
     assert iterator.chunk_shape == (671, 61, 122)
+
+
+class _RecordingSliceableDataChunkIterator(SliceableDataChunkIterator):
+    """Keeps track of the order of the reads and how many of them overlap in time."""
+
+    def __init__(self, data, **kwargs):
+        self.read_selections = list()
+        self._number_of_active_reads = 0
+        self.maximum_number_of_active_reads = 0
+        super().__init__(data=data, **kwargs)
+
+    def _get_data(self, selection):
+        self._number_of_active_reads += 1
+        self.maximum_number_of_active_reads = max(self.maximum_number_of_active_reads, self._number_of_active_reads)
+        self.read_selections.append(selection)
+        time.sleep(0.001)
+        self._number_of_active_reads -= 1
+        return super()._get_data(selection=selection)
+
+
+def test_data_chunk_prefetcher_matches_serial_iteration():
+    data_1 = np.arange(1000).reshape(100, 10)
+    data_2 = np.arange(2000, 2600).reshape(60, 10)
+    iterator_1 = _RecordingSliceableDataChunkIterator(data=data_1, buffer_shape=(20, 10), chunk_shape=(10, 10))
+    iterator_2 = _RecordingSliceableDataChunkIterator(data=data_2, buffer_shape=(10, 5), chunk_shape=(10, 5))
+
+    with DataChunkPrefetcher(number_of_jobs=4) as prefetcher:
+        prefetcher.register(iterators=[iterator_1, iterator_2])
+        data_chunks_1 = list(iterator_1)
+        data_chunks_2 = list(iterator_2)
+
+    assert len(data_chunks_1) == iterator_1.num_buffers
+    assert len(data_chunks_2) == iterator_2.num_buffers
+    for data_chunk in data_chunks_1:
+        assert_array_equal(data_chunk.data, data_1[data_chunk.selection])
+    for data_chunk in data_chunks_2:
+        assert_array_equal(data_chunk.data, data_2[data_chunk.selection])
+
+    # Reads from a single iterator are serialized and performed in the order the writer consumes them
+    assert iterator_1.maximum_number_of_active_reads == 1
+    assert iterator_1.read_selections == [data_chunk.selection for data_chunk in data_chunks_1]
+    assert iterator_2.read_selections == [data_chunk.selection for data_chunk in data_chunks_2]
+
+    # The prefetcher releases the iterators when closed
+    assert iterator_1._prefetcher is None
+
+
+def test_data_chunk_prefetcher_memory_bound():
+    data = np.arange(1000, dtype="float64").reshape(100, 10)
+    buffer_bytes = 10 * 10 * 8
+    iterator = _RecordingSliceableDataChunkIterator(data=data, buffer_shape=(10, 10), chunk_shape=(10, 10))
+
+    with DataChunkPrefetcher(number_of_jobs=2, max_prefetch_gb=3 * buffer_bytes / 1e9) as prefetcher:
+        prefetcher.register(iterators=[iterator])
+        time.sleep(0.1)
+        assert len(iterator.read_selections) == 3
+
+        next(iterator)
+        time.sleep(0.1)
+        assert len(iterator.read_selections) == 4
+
+
+def test_data_chunk_prefetcher_always_reads_requested_buffer():
+    data = np.arange(1000, dtype="float64").reshape(100, 10)
+    iterator = SliceableDataChunkIterator(data=data, buffer_shape=(10, 10), chunk_shape=(10, 10))
+
+    with DataChunkPrefetcher(number_of_jobs=1, max_prefetch_gb=1e-9) as prefetcher:
+        prefetcher.register(iterators=[iterator])
+        data_chunks = list(iterator)
+
+    assert_array_equal(np.concatenate([data_chunk.data for data_chunk in data_chunks]), data)
+
+
+def test_data_chunk_prefetcher_propagates_read_errors():
+    class FaultySliceableDataChunkIterator(SliceableDataChunkIterator):
+        def _get_data(self, selection):
+            raise ValueError("Unable to read from source!")
+
+    iterator = FaultySliceableDataChunkIterator(data=np.empty(shape=(10, 10)))
+
+    with DataChunkPrefetcher(number_of_jobs=1) as prefetcher:
+        prefetcher.register(iterators=[iterator])
+        with pytest.raises(ValueError, match="Unable to read from source!"):
+            next(iterator)
+
+
+def test_prefetch_buffers():
+    data = np.arange(1000, dtype="float64").reshape(100, 10)
+    buffer_bytes = 10 * 10 * 8
+    iterator = _RecordingSliceableDataChunkIterator(
+        data=data, buffer_shape=(10, 10), chunk_shape=(10, 10), prefetch_buffers=2
+    )
+
+    data_chunk = next(iterator)
+    time.sleep(0.1)
+
+    # The first buffer has been handed over to the writer, the next two are held by the background thread
+    assert len(iterator.read_selections) == 3
+    assert iterator._prefetcher.max_prefetch_bytes == 2 * buffer_bytes
+
+    data_chunks = [data_chunk] + list(iterator)
+    assert_array_equal(np.concatenate([data_chunk.data for data_chunk in data_chunks]), data)
+    assert iterator._prefetcher is None
+
+
+def test_prefetch_buffers_of_memory_map(tmp_path):
+    data = np.memmap(filename=tmp_path / "data.bin", dtype="int16", mode="w+", shape=(100, 10))
+    data[:] = np.arange(1000).reshape(100, 10)
+    data.flush()
+
+    iterator = SliceableDataChunkIterator(data=data, buffer_shape=(10, 10), chunk_shape=(10, 10), prefetch_buffers=2)
+    data_chunks = list(iterator)
+
+    assert not any(isinstance(data_chunk.data, np.memmap) for data_chunk in data_chunks)
+    assert_array_equal(np.concatenate([data_chunk.data for data_chunk in data_chunks]), data)
+
+
+def _write_time_series(
+    nwbfile_path, data: np.ndarray, number_of_jobs: int, chunk_shape=None, compression_options=None, backend="hdf5"
+):
+    nwbfile = mock_NWBFile()
+    iterator = SliceableDataChunkIterator(data=data, buffer_shape=(300, 7), chunk_shape=(100, 7))
+    nwbfile.add_acquisition(mock_TimeSeries(name="TimeSeries", data=iterator))
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend=backend)
+    backend_configuration.number_of_jobs = number_of_jobs
+    dataset_configuration = backend_configuration.dataset_configurations["acquisition/TimeSeries/data"]
+    if chunk_shape is not None:
+        dataset_configuration.buffer_shape = (3 * chunk_shape[0], chunk_shape[1])
+        dataset_configuration.chunk_shape = chunk_shape
+    if compression_options is not None:
+        dataset_configuration.compression_options = compression_options
+
+    configure_and_write_nwbfile(
+        nwbfile=nwbfile, output_filepath=str(nwbfile_path), backend_configuration=backend_configuration
+    )
+
+
+@pytest.mark.parametrize("compression_options", [None, dict(level=9, shuffle=True)])
+def test_parallel_chunk_compression_is_byte_identical(tmp_path, compression_options):
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+
+    _write_time_series(tmp_path / "serial.nwb", data=data, number_of_jobs=1, compression_options=compression_options)
+    _write_time_series(tmp_path / "parallel.nwb", data=data, number_of_jobs=-1, compression_options=compression_options)
+
+    with h5py.File(tmp_path / "serial.nwb", mode="r") as serial_file:
+        with h5py.File(tmp_path / "parallel.nwb", mode="r") as parallel_file:
+            serial_dataset = serial_file["acquisition/TimeSeries/data"]
+            parallel_dataset = parallel_file["acquisition/TimeSeries/data"]
+
+            assert_array_equal(parallel_dataset[:], data)
+            assert parallel_dataset.compression == "gzip"
+            assert parallel_dataset.chunks == serial_dataset.chunks == (100, 7)
+            for chunk_offset in [(row, 0) for row in range(0, 1_050, 100)]:
+                assert serial_dataset.id.read_direct_chunk(chunk_offset) == parallel_dataset.id.read_direct_chunk(
+                    chunk_offset
+                )
+
+
+def test_parallel_write_of_unaligned_buffers(tmp_path):
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+
+    # The buffers of 300 rows do not cover whole chunks of 200 rows, so they are written through h5py instead
+    iterator = SliceableDataChunkIterator(data=data, buffer_shape=(300, 7), chunk_shape=(100, 7))
+    data_io = _ParallelCompressionH5DataIO(data=iterator, number_of_jobs=-1, chunks=(200, 7), compression="gzip")
+    nwbfile = mock_NWBFile()
+    nwbfile.add_acquisition(mock_TimeSeries(name="TimeSeries", data=data_io))
+
+    nwbfile_path = str(tmp_path / "parallel.nwb")
+    with BACKEND_NWB_IO["hdf5"](path=nwbfile_path, mode="w") as io:
+        _write_nwbfile(io=io, nwbfile=nwbfile)
+
+    with BACKEND_NWB_IO["hdf5"](path=nwbfile_path, mode="r") as io:
+        written_data = io.read().acquisition["TimeSeries"].data
+        assert written_data.chunks == (200, 7)
+        assert_array_equal(written_data[:], data)
+
+
+@pytest.mark.parametrize("chunk_shape", [None, (200, 7)])
+def test_parallel_zarr_write(tmp_path, chunk_shape):
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+
+    serial_path = tmp_path / "serial.nwb.zarr"
+    parallel_path = tmp_path / "parallel.nwb.zarr"
+    _write_time_series(serial_path, data=data, number_of_jobs=1, chunk_shape=chunk_shape, backend="zarr")
+    _write_time_series(parallel_path, data=data, number_of_jobs=-1, chunk_shape=chunk_shape, backend="zarr")
+
+    serial_dataset = zarr.open(store=str(serial_path), mode="r")["acquisition/TimeSeries/data"]
+    parallel_dataset = zarr.open(store=str(parallel_path), mode="r")["acquisition/TimeSeries/data"]
+    assert_array_equal(parallel_dataset[:], data)
+    assert parallel_dataset.chunks == serial_dataset.chunks == (chunk_shape or (100, 7))
+    assert parallel_dataset.compressor == serial_dataset.compressor
+    assert parallel_dataset.nchunks_initialized == parallel_dataset.nchunks
+
+
+def test_zarr_write_is_given_number_of_jobs(tmp_path, monkeypatch):
+    write_kwargs = dict()
+    zarr_write = NWBZarrIO.write
+
+    def write(self, *args, **kwargs):
+        write_kwargs.update(kwargs)
+        return zarr_write(self, *args, **kwargs)
+
+    monkeypatch.setattr(NWBZarrIO, "write", write)
+
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+    _write_time_series(tmp_path / "parallel.nwb.zarr", data=data, number_of_jobs=-1, backend="zarr")
+
+    assert write_kwargs["number_of_jobs"] == psutil.cpu_count()
+
+
+class _FailingSliceableDataChunkIterator(SliceableDataChunkIterator):
+    """Fails to read any buffer after the first one."""
+
+    def _get_data(self, selection):
+        if selection[0].start > 0:
+            raise OSError("The data is no longer available.")
+        return super()._get_data(selection=selection)
+
+
+def test_parallel_chunk_compression_shuts_down_threads_of_failed_write(tmp_path):
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+    iterator = _FailingSliceableDataChunkIterator(data=data, buffer_shape=(300, 7), chunk_shape=(100, 7))
+    nwbfile = mock_NWBFile()
+    nwbfile.add_acquisition(mock_TimeSeries(name="TimeSeries", data=iterator))
+
+    backend_configuration = get_default_backend_configuration(nwbfile=nwbfile, backend="hdf5")
+    backend_configuration.number_of_jobs = -1
+    with pytest.raises(OSError, match="The data is no longer available."):
+        configure_and_write_nwbfile(
+            nwbfile=nwbfile,
+            output_filepath=str(tmp_path / "failed.nwb"),
+            backend_configuration=backend_configuration,
+        )
+
+    assert isinstance(nwbfile.acquisition["TimeSeries"].data, _ParallelCompressionH5DataIO)
+    assert not any(thread.name.startswith("neuroconv_compression") for thread in threading.enumerate())
+
+
+def test_prefetch_buffers_stopped_by_failed_read():
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+    iterator = _FailingSliceableDataChunkIterator(
+        data=data, buffer_shape=(300, 7), chunk_shape=(100, 7), prefetch_buffers=2
+    )
+
+    with pytest.raises(OSError, match="The data is no longer available."):
+        list(iterator)
+
+    assert iterator._prefetcher is None
+    assert not iterator._owns_prefetcher
+
+
+def test_close_stops_prefetch_buffers():
+    data = np.random.default_rng(seed=0).integers(low=0, high=100, size=(1_050, 7), dtype="int16")
+    iterator = SliceableDataChunkIterator(data=data, buffer_shape=(300, 7), chunk_shape=(100, 7), prefetch_buffers=2)
+
+    next(iterator)
+    iterator.close()
+
+    assert iterator._prefetcher is None
+    assert not iterator._owns_prefetcher
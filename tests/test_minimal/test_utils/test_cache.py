@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+from pydantic import FilePath
+from pynwb import NWBFile
+
+from neuroconv.basetemporalalignmentinterface import BaseTemporalAlignmentInterface
+from neuroconv.utils.cache import DiskCache, cache_on_disk
+
+
+class _TimestampsFileInterface(BaseTemporalAlignmentInterface):
+    def __init__(self, file_path: FilePath, scale: float = 1.0):
+        super().__init__(file_path=file_path, scale=scale)
+        self.number_of_reads = 0
+
+    @cache_on_disk
+    def get_original_timestamps(self, stub_test: bool = False) -> np.ndarray:
+        self.number_of_reads += 1
+        timestamps = np.loadtxt(self.source_data["file_path"]) * self.source_data["scale"]
+        return timestamps[:2] if stub_test else timestamps
+
+    def get_timestamps(self) -> np.ndarray:
+        return self.get_original_timestamps()
+
+    def set_aligned_timestamps(self, aligned_timestamps: np.ndarray) -> None:
+        pass
+
+    def add_to_nwbfile(self, nwbfile: NWBFile, metadata: dict) -> None:
+        pass
+
+
+@pytest.fixture
+def cache_directory(tmp_path, monkeypatch):
+    cache_directory = tmp_path / "cache"
+    monkeypatch.setenv("NEUROCONV_CACHE_DIRECTORY", str(cache_directory))
+    return cache_directory
+
+
+@pytest.fixture
+def timestamps_file_path(tmp_path):
+    file_path = tmp_path / "timestamps.txt"
+    np.savetxt(file_path, np.arange(5) * 0.1)
+    return file_path
+
+
+def test_disk_cache_round_trip(tmp_path):
+    cache = DiskCache(cache_directory=tmp_path)
+    value = dict(stream=np.arange(10.0))
+    cache.set(key="abc", value=value)
+
+    np.testing.assert_array_equal(cache.get(key="abc")["stream"], value["stream"])
+    assert cache.get(key="missing", default="default") == "default"
+
+
+def test_disk_cache_removes_corrupted_entry(tmp_path):
+    cache = DiskCache(cache_directory=tmp_path)
+    (tmp_path / "abc.pkl").write_bytes(b"not a pickle")
+
+    assert cache.get(key="abc") is None
+    assert not (tmp_path / "abc.pkl").exists()
+
+
+def test_disk_cache_skips_values_larger_than_its_size(tmp_path):
+    cache = DiskCache(cache_directory=tmp_path / "cache", max_size_gb=1e-6)
+    cache.set(key="large", value=[np.zeros(shape=1_000, dtype="float64")])
+
+    assert cache.get(key="large") is None
+    assert not (tmp_path / "cache").exists()
+
+
+def test_disk_cache_directory_readable_by_owner_only(tmp_path):
+    cache = DiskCache(cache_directory=tmp_path / "cache")
+    cache.set(key="abc", value=1)
+
+    assert (tmp_path / "cache").stat().st_mode & 0o777 == 0o700
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(cache_directory=tmp_path, max_size_gb=2.5e-6)  # Room for two of the entries below
+    array = np.zeros(shape=100, dtype="uint64")  # About 1 KB once pickled
+    cache.set(key="first", value=array)
+    cache.set(key="second", value=array)
+    cache.get(key="first")  # Refresh 'first' so that 'second' is now the least recently used
+    cache.set(key="third", value=array)
+
+    assert cache.get(key="first") is not None
+    assert cache.get(key="second") is None
+    assert cache.get(key="third") is not None
+
+
+def test_cache_on_disk_across_instances(cache_directory, timestamps_file_path):
+    interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    first_timestamps = interface.get_original_timestamps()
+    assert interface.number_of_reads == 1
+
+    new_interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    np.testing.assert_array_equal(new_interface.get_original_timestamps(), first_timestamps)
+    assert new_interface.number_of_reads == 0
+    assert len(list(cache_directory.glob("*.pkl"))) == 1
+
+
+def test_cache_on_disk_keyed_on_arguments_and_source_data(cache_directory, timestamps_file_path):
+    interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    interface.get_original_timestamps()
+
+    assert len(interface.get_original_timestamps(stub_test=True)) == 2
+    assert interface.number_of_reads == 2
+
+    scaled_interface = _TimestampsFileInterface(file_path=timestamps_file_path, scale=2.0)
+    np.testing.assert_array_almost_equal(scaled_interface.get_original_timestamps(), np.arange(5) * 0.2)
+    assert scaled_interface.number_of_reads == 1
+
+
+def test_cache_on_disk_invalidated_by_file_change(cache_directory, timestamps_file_path):
+    interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    interface.get_original_timestamps()
+
+    np.savetxt(timestamps_file_path, np.arange(7) * 0.1)
+    assert len(interface.get_original_timestamps()) == 7
+    assert interface.number_of_reads == 2
+
+
+def test_cache_on_disk_opt_out(cache_directory, timestamps_file_path, monkeypatch):
+    interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    interface.use_cache = False
+    interface.get_original_timestamps()
+    interface.get_original_timestamps()
+    assert interface.number_of_reads == 2
+
+    assert not cache_directory.exists()
+
+
+def test_cache_on_disk_is_opt_in(timestamps_file_path, monkeypatch):
+    monkeypatch.delenv("NEUROCONV_CACHE_DIRECTORY", raising=False)
+    interface = _TimestampsFileInterface(file_path=timestamps_file_path)
+    interface.get_original_timestamps()
+    interface.get_original_timestamps()
+    assert interface.number_of_reads == 2
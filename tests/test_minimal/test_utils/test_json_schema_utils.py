@@ -106,6 +106,20 @@ def test_dict_deep_update_4():
     compare_dicts(result4, correct_result)
 
 
+def test_dict_deep_update_copy():
+    a5 = dict(a=1, nested=dict(b=2, deeper=dict(c=3)))
+    b5 = dict(nested=dict(deeper=dict(d=4)))
+
+    result5 = dict_deep_update(a5, b5)
+    assert result5["nested"]["deeper"] == dict(c=3, d=4)
+    assert a5["nested"]["deeper"] == dict(c=3)
+
+    # Without copying, the nested dictionaries of the input are updated in place
+    result5 = dict_deep_update(a5, b5, copy=False)
+    assert result5 is a5
+    assert a5["nested"]["deeper"] == dict(c=3, d=4)
+
+
 def test_fill_defaults():
     schema = dict(
         additionalProperties=False,
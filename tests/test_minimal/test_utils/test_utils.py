@@ -1,6 +1,16 @@
+import numpy as np
+
 from neuroconv.utils import calculate_regular_series_rate
 
 
 def test_check_regular_series():
     assert calculate_regular_series_rate(series=[1, 2, 3])
     assert not calculate_regular_series_rate(series=[1, 2, 4])
+
+
+def test_check_regular_series_in_chunks():
+    series = np.arange(10) * 0.5
+    assert calculate_regular_series_rate(series=series, chunk_size=3) == 2.0
+
+    series[8] += 0.1
+    assert calculate_regular_series_rate(series=series, chunk_size=3) is None
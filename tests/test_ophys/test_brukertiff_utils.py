@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from lxml import etree
+
+from neuroconv.datainterfaces.ophys.brukertiff.brukertiff_utils import BrukerXML
+
+
+def _get_position_xml(z_values: list[float], x_value: float = -10.0, y_value: float = 20.0) -> str:
+    z_sub_indexed_values = "".join(
+        f'<SubindexedValue subindex="{index}" value="{value}" />' for index, value in enumerate(z_values)
+    )
+    return (
+        '<PVStateValue key="positionCurrent">'
+        f'<SubindexedValues index="XAxis"><SubindexedValue subindex="0" value="{x_value}" /></SubindexedValues>'
+        f'<SubindexedValues index="YAxis"><SubindexedValue subindex="0" value="{y_value}" /></SubindexedValues>'
+        f'<SubindexedValues index="ZAxis">{z_sub_indexed_values}</SubindexedValues>'
+        "</PVStateValue>"
+    )
+
+
+@pytest.fixture
+def bruker_folder_path(tmp_path):
+    folder_path = tmp_path / "TSeries-001"
+    folder_path.mkdir()
+
+    frames = []
+    for plane_index, z_value in enumerate([5.0, 10.0, 15.0]):
+        frame_files = "".join(
+            f'<File channel="{channel}" channelName="Ch{channel}" '
+            f'filename="TSeries-001_Cycle00001_Ch{channel}_{plane_index + 1:06d}.ome.tif" />'
+            for channel in (1, 2)
+        )
+        frames.append(
+            f'<Frame index="{plane_index + 1}">{frame_files}<PVStateShard>{_get_position_xml([0.0, z_value])}'
+            "</PVStateShard></Frame>"
+        )
+    xml = (
+        '<PVScan version="5.6" date="1/1/2020 12:00:00 PM">'
+        f"<PVStateShard>{_get_position_xml([0.0, 0.0])}</PVStateShard>"
+        f'<Sequence type="TSeries ZSeries Element" cycle="1">{"".join(frames)}</Sequence>'
+        "</PVScan>"
+    )
+    (folder_path / "TSeries-001.xml").write_text(xml)
+
+    return folder_path
+
+
+def test_bruker_xml_frame_index(bruker_folder_path):
+    bruker_xml = BrukerXML(xml_root=etree.parse(str(bruker_folder_path / "TSeries-001.xml")).getroot())
+
+    assert bruker_xml.default_position == dict(XAxis=[-10.0], YAxis=[20.0], ZAxis=[0.0, 0.0])
+    assert bruker_xml.is_volumetric
+    assert bruker_xml.channel_names == ["Ch1", "Ch2"]
+    assert len(bruker_xml.file_names) == 6
+    np.testing.assert_array_equal(bruker_xml.file_frame_indices, [0, 0, 1, 1, 2, 2])
+
+    assert bruker_xml.get_first_frame_index(stream_name="Ch2_000002") == 1
+    assert bruker_xml.get_frame_z_positions(frame_index=2) == [0.0, 15.0]
+    with pytest.raises(ValueError, match="No frame of the stream 'Ch3'"):
+        bruker_xml.get_first_frame_index(stream_name="Ch3")
@@ -194,3 +194,60 @@ def test_volumetric_default_chunking():
     iterator = ImagingExtractorDataChunkIterator(imaging_extractor=volumetric_imaging_extractor)
 
     assert iterator.chunk_shape == (4, width, height, 1)
+
+
+def test_prefetched_data_validity():
+    imaging_extractor = generate_dummy_imaging_extractor(num_frames=100, num_rows=20, num_columns=30)
+    iterator = ImagingExtractorDataChunkIterator(
+        imaging_extractor=imaging_extractor, buffer_shape=(10, 30, 20), chunk_shape=(5, 30, 20), prefetch_buffers=3
+    )
+
+    data_chunks = np.zeros(iterator.maxshape)
+    for data_chunk in iterator:
+        data_chunks[data_chunk.selection] = data_chunk.data
+
+    expected_frames = imaging_extractor.get_video().transpose((0, 2, 1))
+    assert_array_equal(data_chunks, expected_frames)
+    assert iterator._prefetcher is None
+
+
+def test_spatially_tiled_data_validity_reads_window_of_sliceable_video():
+    imaging_extractor = generate_dummy_imaging_extractor(num_frames=30, num_rows=20, num_columns=30)
+    iterator = ImagingExtractorDataChunkIterator(
+        imaging_extractor=imaging_extractor, buffer_shape=(10, 10, 10), chunk_shape=(5, 5, 5)
+    )
+    assert iterator._video is not None
+
+    data_chunks = np.zeros(iterator.maxshape)
+    for data_chunk in iterator:
+        assert data_chunk.data.shape == (10, 10, 10)
+        data_chunks[data_chunk.selection] = data_chunk.data
+
+    expected_frames = imaging_extractor.get_video().transpose((0, 2, 1))
+    assert_array_equal(data_chunks, expected_frames)
+
+
+def test_spatially_tiled_data_validity_reads_each_frame_block_once():
+    imaging_extractor = generate_dummy_imaging_extractor(num_frames=30, num_rows=20, num_columns=30)
+    sliced_imaging_extractor = imaging_extractor.frame_slice(start_frame=0, end_frame=25)
+    iterator = ImagingExtractorDataChunkIterator(
+        imaging_extractor=sliced_imaging_extractor, buffer_shape=(10, 10, 10), chunk_shape=(5, 5, 5)
+    )
+    assert iterator._video is None
+
+    requested_frames = []
+    get_video = sliced_imaging_extractor.get_video
+
+    def tracked_get_video(start_frame=None, end_frame=None, **kwargs):
+        requested_frames.append((start_frame, end_frame))
+        return get_video(start_frame=start_frame, end_frame=end_frame, **kwargs)
+
+    sliced_imaging_extractor.get_video = tracked_get_video
+
+    data_chunks = np.zeros(iterator.maxshape)
+    for data_chunk in iterator:
+        data_chunks[data_chunk.selection] = data_chunk.data
+
+    expected_frames = get_video(start_frame=0, end_frame=25).transpose((0, 2, 1))
+    assert_array_equal(data_chunks, expected_frames)
+    assert requested_frames == [(0, 10), (10, 20), (20, 25)]
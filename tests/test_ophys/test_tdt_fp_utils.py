@@ -0,0 +1,177 @@
+import contextlib
+import io
+import struct
+import warnings
+
+import numpy as np
+import pytest
+import tdt
+
+from neuroconv.datainterfaces import TDTFiberPhotometryInterface
+from neuroconv.datainterfaces.ophys.tdt_fp.tdt_fp_utils import (
+    TDTStreamDataChunkIterator,
+    get_stream_info,
+)
+
+# The windows (t1, t2) to read, in seconds, including windows that start before the first event of the streams
+WINDOWS = [(0.0, 0.0), (0.5, 0.0), (0.0, 3.3), (1.234, 7.77), (0.0001, 0.2)]
+
+
+def _get_tsq_record(
+    size: int,
+    event_type: int,
+    code: int,
+    channel: int,
+    timestamp: float,
+    offset_or_value,
+    data_format: int,
+    rate: float,
+) -> bytes:
+    """Pack a 40-byte event header of a TSQ file; strobe events store their value in place of the offset."""
+    record = struct.pack("<iiIHHd", size, event_type, code, channel, 0, timestamp)
+    if isinstance(offset_or_value, float):
+        record += struct.pack("<d", offset_or_value)
+    else:
+        record += struct.pack("<Q", offset_or_value)
+    return record + struct.pack("<if", data_format, rate)
+
+
+def _write_tdt_block(folder_path, streams: dict, epocs: dict, start_time: float = 1_600_000_000.0):
+    """
+    Write a minimal TDT block (TSQ and TEV files) of float32 streams and strobe epocs.
+
+    `streams` maps each stream name to (rate, data with shape (channels, samples), time of the first event, number of
+    samples per event); `epocs` maps each epoc name to (onsets, values).
+    """
+    folder_path.mkdir(parents=True)
+    records = []
+    tev = bytearray()
+    for stream_name, (rate, data, first_event_time, samples_per_event) in streams.items():
+        code = int.from_bytes(stream_name.encode("cp437"), "little")
+        for event_index in range(data.shape[1] // samples_per_event):
+            timestamp = start_time + first_event_time + event_index * samples_per_event / rate
+            for channel_index, channel_data in enumerate(data):
+                samples = channel_data[event_index * samples_per_event : (event_index + 1) * samples_per_event]
+                record = _get_tsq_record(
+                    10 + samples_per_event, tdt.EVTYPE_STREAM, code, channel_index + 1, timestamp, len(tev), 0, rate
+                )
+                records.append((timestamp, record))
+                tev += samples.astype("float32").tobytes()
+    for epoc_name, (onsets, values) in epocs.items():
+        code = int.from_bytes(epoc_name.encode("cp437"), "little")
+        for onset, value in zip(onsets, values):
+            timestamp = start_time + onset
+            records.append((timestamp, _get_tsq_record(10, tdt.EVTYPE_STRON, code, 0, timestamp, float(value), 4, 0)))
+    records.sort(key=lambda record: record[0])
+
+    stop_time = records[-1][0] + 1.0
+    tsq = _get_tsq_record(0, 0, 0, 0, 0.0, 0, 0, 0)
+    tsq += _get_tsq_record(10, tdt.EVTYPE_MARK, tdt.EVMARK_STARTBLOCK, 0, start_time, 0, 0, 0)
+    tsq += b"".join(record for _, record in records)
+    tsq += _get_tsq_record(10, tdt.EVTYPE_MARK, tdt.EVMARK_STOPBLOCK, 0, stop_time, 0, 0, 0)
+    (folder_path / f"{folder_path.name}.tsq").write_bytes(tsq)
+    (folder_path / f"{folder_path.name}.tev").write_bytes(bytes(tev))
+
+
+def _read_block(folder_path, **kwargs):
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        return tdt.read_block(str(folder_path), **kwargs)
+
+
+def _get_iterated_data(iterator) -> np.ndarray:
+    data = np.zeros(shape=iterator.maxshape, dtype=iterator.dtype)
+    for data_chunk in iterator:
+        data[data_chunk.selection] = data_chunk.data
+
+    return data
+
+
+@pytest.fixture(scope="module")
+def folder_path(tmp_path_factory):
+    folder_path = tmp_path_factory.mktemp("tdt") / "Block-1"
+    rng = np.random.default_rng(seed=0)
+    streams = dict(
+        x465=(1017.2526, rng.standard_normal(size=(3, 256 * 40)).astype("float32"), 0.00123, 256),
+        Fi1r=(381.47, rng.standard_normal(size=(1, 64 * 50)).astype("float32"), 0.002, 64),
+    )
+    _write_tdt_block(folder_path=folder_path, streams=streams, epocs=dict(PtC1=([1.0, 2.0, 3.5], [1, 2, 3])))
+    return folder_path
+
+
+@pytest.fixture(scope="module")
+def headers(folder_path):
+    return _read_block(folder_path=folder_path, headers=1)
+
+
+@pytest.mark.parametrize("t1, t2", WINDOWS)
+@pytest.mark.parametrize("stream_name", ["x465", "Fi1r"])
+def test_get_stream_info(folder_path, headers, stream_name, t1, t2):
+    stream = _read_block(folder_path=folder_path, t1=t1, t2=t2).streams[stream_name]
+    stream_info = get_stream_info(headers=headers, stream_name=stream_name, t1=t1, t2=t2)
+
+    assert stream_info["rate"] == stream.fs
+    assert stream_info["starting_time"] == stream.start_time
+    assert stream_info["number_of_samples"] == np.atleast_2d(stream.data).shape[1]
+    assert stream_info["dtype"] == stream.data.dtype
+
+
+@pytest.mark.parametrize("t1, t2", WINDOWS)
+@pytest.mark.parametrize(
+    "stream_name, stream_indices, transpose",
+    [
+        ("x465", None, True),
+        ("x465", 1, True),
+        ("x465", [0, 2], True),
+        ("x465", [1], True),
+        ("x465", [0, 2], False),
+        ("Fi1r", None, True),
+    ],
+)
+def test_stream_data_chunk_iterator(folder_path, headers, stream_name, stream_indices, transpose, t1, t2):
+    expected_data = _read_block(folder_path=folder_path, t1=t1, t2=t2).streams[stream_name].data
+    if stream_indices is not None:
+        expected_data = expected_data[stream_indices, :]
+        if transpose and expected_data.ndim == 2 and expected_data.shape[0] < expected_data.shape[1]:
+            expected_data = expected_data.T
+
+    # Buffers of a few hundred samples, so that every window is read in several parts
+    iterator = TDTStreamDataChunkIterator(
+        folder_path=folder_path,
+        headers=headers,
+        stream_name=stream_name,
+        t1=t1,
+        t2=t2,
+        stream_indices=stream_indices,
+        transpose=transpose,
+        buffer_gb=1e-5,
+        chunk_mb=1e-3,
+    )
+    np.testing.assert_array_equal(_get_iterated_data(iterator=iterator), expected_data)
+
+
+@pytest.mark.parametrize("t1, t2", WINDOWS)
+def test_original_timing(folder_path, t1, t2):
+    interface = TDTFiberPhotometryInterface(folder_path=folder_path, verbose=False)
+    interface.use_cache = False
+    stream_name_to_timestamps = interface.get_original_timestamps(t1=t1, t2=t2)
+    stream_name_to_starting_time_and_rate = interface.get_original_starting_time_and_rate(t1=t1, t2=t2)
+
+    for stream_name, stream in _read_block(folder_path=folder_path, t1=t1, t2=t2).streams.items():
+        expected_timestamps = np.arange(0.0, stream.data.shape[-1] / stream.fs, 1 / stream.fs)
+        np.testing.assert_array_equal(stream_name_to_timestamps[stream_name], expected_timestamps)
+        assert stream_name_to_starting_time_and_rate[stream_name] == (stream.start_time, stream.fs)
+
+
+@pytest.mark.parametrize("read_from_sev", [False, True])
+def test_commanded_voltage_stream_indices_keep_the_shape_of_the_stream(folder_path, read_from_sev):
+    interface = TDTFiberPhotometryInterface(folder_path=folder_path, verbose=False)
+    interface._get_headers()
+    if read_from_sev:  # The same stream, loaded in full as for streams stored in SEV files
+        interface._sev_stream_names = ["x465"]
+
+    expected_data = _read_block(folder_path=folder_path).streams["x465"].data[[0, 2], :]
+    data = interface._get_stream_data(stream_name="x465", stream_indices=[0, 2], transpose=False)
+    if not read_from_sev:
+        data = _get_iterated_data(iterator=data)
+    np.testing.assert_array_equal(data, expected_data)
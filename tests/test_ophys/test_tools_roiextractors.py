@@ -36,15 +36,31 @@ from neuroconv.tools.roiextractors import (
     add_plane_segmentation_to_nwbfile,
     add_summary_images_to_nwbfile,
 )
+from neuroconv.tools.roiextractors.imagemaskdatachunkiterator import (
+    ImageMaskDataChunkIterator,
+)
 from neuroconv.tools.roiextractors.imagingextractordatachunkiterator import (
     ImagingExtractorDataChunkIterator,
 )
 from neuroconv.tools.roiextractors.roiextractors import (
     _get_default_segmentation_metadata,
+    _get_roi_id_to_row_index,
+    _imaging_frames_to_hdmf_iterator,
+)
+from neuroconv.tools.roiextractors.segmentationextractordatachunkiterator import (
+    SegmentationExtractorDataChunkIterator,
 )
 from neuroconv.utils import dict_deep_update
 
 
+def _get_iterated_data(iterator) -> np.ndarray:
+    data = np.empty(shape=iterator.maxshape, dtype=iterator.dtype)
+    for data_chunk in iterator:
+        data[data_chunk.selection] = data_chunk.data
+
+    return data
+
+
 class TestAddDevices(unittest.TestCase):
     def setUp(self):
         self.session_start_time = datetime.now().astimezone()
@@ -350,10 +366,12 @@ def _generate_casted_test_masks(num_rois: int, mask_type: Literal["pixel", "voxe
 def assert_masks_equal(mask: List[List[Tuple[int, int, int]]], expected_mask: List[List[Tuple[int, int, int]]]):
     """
     Asserts that two lists of pixel masks of inhomogeneous shape are equal.
+
+    The masks of each ROI may be structured arrays with one field per coordinate and weight.
     """
     assert len(mask) == len(expected_mask)
     for mask_ind in range(len(mask)):
-        assert_array_equal(mask[mask_ind], expected_mask[mask_ind])
+        assert_array_equal(np.asarray(mask[mask_ind]).tolist(), expected_mask[mask_ind])
 
 
 class TestAddPlaneSegmentation(TestCase):
@@ -429,7 +447,104 @@ class TestAddPlaneSegmentation(TestCase):
 
         # transpose to num_rois x image_width x image_height
         expected_image_masks = self.segmentation_extractor.get_roi_image_masks().T
-        assert_array_equal(plane_segmentation["image_mask"], expected_image_masks)
+        image_mask_iterator = plane_segmentation["image_mask"].data
+        assert isinstance(image_mask_iterator, ImageMaskDataChunkIterator)
+        assert_array_equal(_get_iterated_data(iterator=image_mask_iterator), expected_image_masks)
+
+    def test_image_masks_split_across_buffers(self):
+        """Test that image masks are filled in from the pixel masks of each ROI, also for buffers of partial images."""
+        iterator = ImageMaskDataChunkIterator(
+            segmentation_extractor=self.segmentation_extractor, buffer_shape=(4, 10, 5), chunk_shape=(2, 5, 5)
+        )
+
+        assert iterator.maxshape == (self.num_rois, self.num_columns, self.num_rows)
+        assert iterator.dtype == self.segmentation_extractor.get_roi_image_masks().dtype
+        assert_array_equal(_get_iterated_data(iterator=iterator), self.segmentation_extractor.get_roi_image_masks().T)
+
+    def test_image_masks_round_trip(self):
+        add_plane_segmentation_to_nwbfile(
+            segmentation_extractor=self.segmentation_extractor,
+            nwbfile=self.nwbfile,
+            metadata=self.metadata,
+            plane_segmentation_name=self.plane_segmentation_name,
+            iterator_options=dict(buffer_shape=(4, 20, 25), chunk_shape=(2, 20, 25)),
+        )
+
+        nwbfile_path = Path(mkdtemp()) / "image_masks_round_trip.nwb"
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+            nwbfile = io.read()
+            image_segmentation = nwbfile.processing["ophys"].get(self.image_segmentation_name)
+            plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+
+            assert plane_segmentation["image_mask"].data.chunks == (2, 20, 25)
+            assert_array_equal(
+                plane_segmentation["image_mask"].data[:], self.segmentation_extractor.get_roi_image_masks().T
+            )
+
+    def test_image_masks_larger_than_available_memory(self):
+        """Test that pixel masks are written instead of image masks that would not fit into memory."""
+        available_memory = Mock(available=1_000)
+        with unittest.mock.patch("psutil.virtual_memory", return_value=available_memory):
+            with self.assertWarnsWith(
+                warn_type=UserWarning,
+                exc_msg=(
+                    "Specified mask_type='image', but the image masks are 39.06 KiB while only 1000 B are "
+                    "available. Using mask_type='pixel' instead."
+                ),
+            ):
+                add_plane_segmentation_to_nwbfile(
+                    segmentation_extractor=self.segmentation_extractor,
+                    nwbfile=self.nwbfile,
+                    metadata=self.metadata,
+                    plane_segmentation_name=self.plane_segmentation_name,
+                )
+
+        image_segmentation = self.nwbfile.processing["ophys"].get(self.image_segmentation_name)
+        plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+        assert "image_mask" not in plane_segmentation
+        assert len(plane_segmentation["pixel_mask"]) == self.num_rois
+
+    def test_image_masks_larger_than_max_image_mask_gb(self):
+        """Test that pixel masks are written instead of image masks larger than `max_image_mask_gb`."""
+        with self.assertWarnsWith(
+            warn_type=UserWarning,
+            exc_msg=(
+                "Specified mask_type='image', but the image masks are 39.06 KiB, more than max_image_mask_gb=1e-05. "
+                "Using mask_type='pixel' instead."
+            ),
+        ):
+            add_plane_segmentation_to_nwbfile(
+                segmentation_extractor=self.segmentation_extractor,
+                nwbfile=self.nwbfile,
+                metadata=self.metadata,
+                plane_segmentation_name=self.plane_segmentation_name,
+                max_image_mask_gb=1e-5,
+            )
+
+        image_segmentation = self.nwbfile.processing["ophys"].get(self.image_segmentation_name)
+        plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+        assert "image_mask" not in plane_segmentation
+        assert len(plane_segmentation["pixel_mask"]) == self.num_rois
+
+    def test_image_masks_within_max_image_mask_gb(self):
+        """Test that image masks within `max_image_mask_gb` are written even if they exceed the available memory."""
+        available_memory = Mock(available=1_000)
+        with unittest.mock.patch("psutil.virtual_memory", return_value=available_memory):
+            add_plane_segmentation_to_nwbfile(
+                segmentation_extractor=self.segmentation_extractor,
+                nwbfile=self.nwbfile,
+                metadata=self.metadata,
+                plane_segmentation_name=self.plane_segmentation_name,
+                max_image_mask_gb=1.0,
+            )
+
+        image_segmentation = self.nwbfile.processing["ophys"].get(self.image_segmentation_name)
+        plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+        assert "pixel_mask" not in plane_segmentation
+        assert plane_segmentation["image_mask"].data.maxshape[0] == self.num_rois
 
     def test_do_not_include_roi_centroids(self):
         """Test that setting `include_roi_centroids=False` prevents the centroids from being calculated and added."""
@@ -525,6 +640,27 @@ class TestAddPlaneSegmentation(TestCase):
         plane_segmentation_accepted_roi_ids = plane_segmentation["Accepted"].data
         assert_array_equal(plane_segmentation_accepted_roi_ids, accepted_roi_ids)
 
+    def test_roi_id_to_row_index(self):
+        """Test that the index of the ROI IDs is cached on the plane segmentation and extended with new rows."""
+        add_plane_segmentation_to_nwbfile(
+            segmentation_extractor=self.segmentation_extractor,
+            nwbfile=self.nwbfile,
+            metadata=self.metadata,
+            plane_segmentation_name=self.plane_segmentation_name,
+            include_roi_centroids=False,
+            include_roi_acceptance=False,
+            mask_type=None,
+        )
+        image_segmentation = self.nwbfile.processing["ophys"].get(self.image_segmentation_name)
+        plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+
+        roi_id_to_row_index = _get_roi_id_to_row_index(plane_segmentation=plane_segmentation)
+        assert roi_id_to_row_index == {roi_id: row_index for row_index, roi_id in enumerate(range(self.num_rois))}
+
+        plane_segmentation.add_row(id=100)
+        assert _get_roi_id_to_row_index(plane_segmentation=plane_segmentation) is roi_id_to_row_index
+        assert roi_id_to_row_index[100] == self.num_rois
+
     def test_pixel_masks(self):
         """Test the voxel mask option for writing a plane segmentation table."""
         segmentation_extractor = generate_dummy_segmentation_extractor(
@@ -589,6 +725,43 @@ class TestAddPlaneSegmentation(TestCase):
         true_voxel_masks = _generate_casted_test_masks(num_rois=self.num_rois, mask_type="voxel")
         assert_masks_equal(plane_segmentation["voxel_mask"][:], true_voxel_masks)
 
+    def test_pixel_masks_round_trip(self):
+        """Test that the pixel masks of all ROIs are written as a single compound dataset with its index."""
+        segmentation_extractor = generate_dummy_segmentation_extractor(
+            num_rois=self.num_rois,
+            num_frames=self.num_frames,
+            num_rows=self.num_rows,
+            num_columns=self.num_columns,
+        )
+
+        def get_roi_pixel_masks(self, roi_ids: Optional[ArrayLike] = None) -> List[np.ndarray]:
+            roi_ids = roi_ids or range(self.get_num_rois())
+            pixel_masks = _generate_test_masks(num_rois=len(roi_ids), mask_type="pixel")
+            return pixel_masks
+
+        segmentation_extractor.get_roi_pixel_masks = MethodType(get_roi_pixel_masks, segmentation_extractor)
+
+        add_plane_segmentation_to_nwbfile(
+            segmentation_extractor=segmentation_extractor,
+            nwbfile=self.nwbfile,
+            metadata=self.metadata,
+            mask_type="pixel",
+            plane_segmentation_name=self.plane_segmentation_name,
+        )
+
+        nwbfile_path = Path(mkdtemp()) / "test_pixel_masks_round_trip.nwb"
+        with NWBHDF5IO(path=nwbfile_path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(path=nwbfile_path, mode="r") as io:
+            nwbfile = io.read()
+            image_segmentation = nwbfile.processing["ophys"].get(self.image_segmentation_name)
+            plane_segmentation = image_segmentation.plane_segmentations[self.plane_segmentation_name]
+
+            assert plane_segmentation["pixel_mask"][0].dtype.names == ("x", "y", "weight")
+            true_pixel_masks = _generate_casted_test_masks(num_rois=self.num_rois, mask_type="pixel")
+            assert_masks_equal(plane_segmentation["pixel_mask"][:], true_pixel_masks)
+
     def test_none_masks(self):
         """Test the None mask_type option for writing a plane segmentation table."""
         segmentation_extractor = generate_dummy_segmentation_extractor(
@@ -918,7 +1091,7 @@ class TestAddFluorescenceTraces(unittest.TestCase):
             ["RoiResponseSeries", "Deconvolved", "Neuropil"], ["raw", "deconvolved", "neuropil"]
         ):
             series_outer_data = fluorescence[nwb_series_name].data
-            assert_array_equal(series_outer_data.data.data, traces[roiextractors_name])
+            assert_array_equal(_get_iterated_data(iterator=series_outer_data), traces[roiextractors_name])
 
         # Check that df/F trace data is not being written to the Fluorescence container
         df_over_f = ophys.get(self.df_over_f_name)
@@ -976,7 +1149,24 @@ class TestAddFluorescenceTraces(unittest.TestCase):
         traces = segmentation_extractor.get_traces_dict()
 
         series_outer_data = df_over_f[trace_name].data
-        assert_array_equal(series_outer_data.data.data, traces["dff"])
+        assert_array_equal(_get_iterated_data(iterator=series_outer_data), traces["dff"])
+
+    def test_traces_split_across_buffers(self):
+        """Test that buffers split along the ROIs return the traces of their ROIs from a block of frames read once."""
+        iterator = SegmentationExtractorDataChunkIterator(
+            segmentation_extractor=self.segmentation_extractor,
+            trace_name="deconvolved",
+            buffer_shape=(10, 5),
+            chunk_shape=(5, 5),
+        )
+        get_traces = Mock(wraps=self.segmentation_extractor.get_traces)
+        self.segmentation_extractor.get_traces = get_traces
+
+        expected_traces = self.segmentation_extractor.get_traces_dict()["deconvolved"]
+        assert iterator.maxshape == expected_traces.shape
+        assert iterator.dtype == expected_traces.dtype
+        assert_array_equal(_get_iterated_data(iterator=iterator), expected_traces)
+        assert get_traces.call_count == math.ceil(self.num_frames / 10)
 
     def test_add_fluorescence_one_of_the_traces_is_none(self):
         """Test that roi response series with None values are not added to the
@@ -1584,6 +1774,40 @@ class TestAddPhotonSeries(TestCase):
         expected_two_photon_series_data = self.imaging_extractor.get_video().transpose((0, 2, 1))
         assert_array_equal(two_photon_series_extracted, expected_two_photon_series_data)
 
+    def test_v1_iterator_reads_blocks_of_frames(self):
+        """Test that the DataChunkIterator reads each block of `buffer_size` frames with a single call."""
+        expected_two_photon_series_data = self.imaging_extractor.get_video().transpose((0, 2, 1))
+        get_video = Mock(wraps=self.imaging_extractor.get_video)
+        self.imaging_extractor.get_video = get_video
+
+        add_photon_series_to_nwbfile(
+            imaging=self.imaging_extractor,
+            nwbfile=self.nwbfile,
+            metadata=self.two_photon_series_metadata,
+            iterator_type="v1",
+            iterator_options=dict(buffer_size=7),
+        )
+
+        data_chunk_iterator = self.nwbfile.acquisition[self.two_photon_series_name].data
+        two_photon_series_extracted = np.concatenate([data_chunk.data for data_chunk in data_chunk_iterator])
+        assert_array_equal(two_photon_series_extracted, expected_two_photon_series_data)
+        assert get_video.call_count == math.ceil(self.num_frames / 7)
+
+    def test_v1_iterator_reads_large_frames_in_smaller_blocks(self):
+        """Test that blocks of frames larger than about 1 MB are read with fewer frames per call."""
+        imaging_extractor = generate_dummy_imaging_extractor(num_frames=5, num_rows=512, num_columns=600)
+        expected_two_photon_series_data = imaging_extractor.get_video().transpose((0, 2, 1))
+        get_video = Mock(wraps=imaging_extractor.get_video)
+        imaging_extractor.get_video = get_video
+
+        data_chunk_iterator = _imaging_frames_to_hdmf_iterator(
+            imaging=imaging_extractor, iterator_type="v1", iterator_options=dict(buffer_size=4)
+        )
+
+        two_photon_series_extracted = np.concatenate([data_chunk.data for data_chunk in data_chunk_iterator])
+        assert_array_equal(two_photon_series_extracted, expected_two_photon_series_data)
+        assert get_video.call_count == 5
+
     def test_iterator_options_propagation(self):
         """Test that iterator options are propagated to the data chunk iterator."""
         buffer_shape = (20, 5, 5)